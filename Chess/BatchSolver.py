@@ -0,0 +1,182 @@
+import argparse # Importa argparse para las opciones de la línea de comandos
+import json # Importa json para escribir un resultado por línea (JSON Lines)
+import os # Importa os para conocer el número de núcleos
+import sys # Importa sys para leer de la entrada estándar y escribir en la salida estándar
+import time # Importa time para medir el tiempo de cada posición
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait # Importa el grupo de procesos
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from Minimax import find_best_move, SearchContext # Importa la búsqueda
+from SearchStats import SearchStats # Importa las estadísticas (profundidad, puntuación y variante principal)
+from Tablebase import get_tablebase # Importa la tabla de finales (si está generada)
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición de cada proceso
+
+# --- Resolución de Posiciones en Lote ---
+# Lee FEN (uno por línea) de un archivo o de la entrada estándar, los resuelve en paralelo
+# en un grupo de procesos y escribe cada resultado como una línea JSON en cuanto termina.
+# Nunca hay más de 'in_flight' posiciones pendientes, así que la memoria no depende del
+# tamaño de la entrada.
+
+DEFAULT_DEPTH = 4 # Profundidad de búsqueda por defecto
+WORKER_TT_SIZE_MB = 16 # Tabla de transposición de cada proceso
+IN_FLIGHT_PER_WORKER = 4 # Posiciones pendientes por proceso (limita la memoria y mantiene ocupados los procesos)
+
+# --- Estado de Cada Proceso Trabajador ---
+_tt = None # Tabla de transposición del proceso (se vacía antes de cada posición)
+
+
+def _init_worker():
+    """
+    Inicializa un proceso trabajador (se ejecuta una vez al crear el proceso).
+    """
+    global _tt
+    _tt = TranspositionTable(WORKER_TT_SIZE_MB)
+
+
+def solve_position(index, fen, depth, time_limit=None, use_tablebase=True, compact=False):
+    """
+    Resuelve una posición (en un proceso trabajador).
+
+    Args:
+        index (int): Número de línea de la posición en la entrada (para ordenar la salida después).
+        fen (str): La posición.
+        depth (int): Profundidad de búsqueda (con tiempo límite, solo actúa como tope).
+        time_limit (float, opcional): Tiempo máximo por posición, en segundos.
+        use_tablebase (bool): Si es True, se consulta la tabla de finales.
+        compact (bool): Si es True, se busca sobre el tablero compacto KRRKBoard.
+
+    Returns:
+        dict: Resultado: mejor movimiento, puntuación, profundidad, nodos, tiempo y variante
+              principal (o 'error' si el FEN no es válido, la posición es ilegal o la
+              búsqueda falla).
+    """
+    result = {"index": index, "fen": fen}
+    try:
+        board = chess.Board(fen)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    if not board.is_valid():
+        result["error"] = f"illegal position: {board.status()!r}"
+        return result
+    # Un error en una posición se anota en su línea, sin detener el resto del lote.
+    try:
+        result.update(_solve(board, depth, time_limit, use_tablebase, compact))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _solve(board, depth, time_limit, use_tablebase, compact):
+    # Resuelve una posición válida: devuelve los campos del resultado
+    start = time.perf_counter()
+    # --- Tabla de Finales ---
+    if use_tablebase:
+        tablebase = get_tablebase()
+        if tablebase is not None:
+            move = tablebase.best_move(board)
+            if move is not None:
+                return {"move": move.uci(), "score": None, "depth": None, "nodes": 0,
+                        "mate_in_plies": tablebase.probe(board), "source": "tablebase",
+                        "time": time.perf_counter() - start}
+
+    # --- Búsqueda ---
+    # La tabla se vacía en cada posición para que el resultado no dependa del orden en que
+    # cada proceso recibe las posiciones.
+    tt = _tt if _tt is not None else TranspositionTable(WORKER_TT_SIZE_MB)
+    tt.clear()
+    stats = SearchStats()
+    context = SearchContext(tt, stats=stats)
+    move = find_best_move(board, depth, time_limit=time_limit, context=context,
+                          use_tablebase=False, compact=compact)
+    last = stats.iterations[-1] if stats.iterations else {}
+    return {"move": move.uci() if move else None, "score": last.get("score"),
+            "depth": last.get("depth"), "nodes": context.nodes, "pv": stats.pv,
+            "source": "search", "time": time.perf_counter() - start}
+
+
+def read_fens(stream):
+    """
+    Devuelve (número de línea, FEN) de cada línea no vacía del flujo, sin leerlo entero.
+    Las líneas que empiezan por '#' se ignoran.
+    """
+    for index, line in enumerate(stream):
+        fen = line.strip()
+        if fen and not fen.startswith("#"):
+            yield index, fen
+
+
+def solve_stream(fens, output, depth=DEFAULT_DEPTH, time_limit=None, workers=None, in_flight=None,
+                 use_tablebase=True, compact=False):
+    """
+    Resuelve en paralelo una secuencia de posiciones y escribe cada resultado en cuanto termina.
+
+    Args:
+        fens (iterable): Pares (número de línea, FEN); puede ser un generador sin fin.
+        output (archivo): Destino de las líneas JSON.
+        depth (int): Profundidad de búsqueda.
+        time_limit (float, opcional): Tiempo máximo por posición, en segundos.
+        workers (int, opcional): Número de procesos. Por defecto, uno por núcleo.
+        in_flight (int, opcional): Máximo de posiciones pendientes a la vez.
+        use_tablebase (bool): Si es True, se consulta la tabla de finales.
+        compact (bool): Si es True, se busca sobre el tablero compacto KRRKBoard.
+
+    Returns:
+        int: Número de posiciones resueltas.
+    """
+    workers = workers or os.cpu_count() or 1
+    in_flight = in_flight or workers * IN_FLIGHT_PER_WORKER
+    solved = 0
+    pending = {} # Posiciones enviadas a los procesos y aún sin resultado: futuro -> (número de línea, FEN)
+    fens = iter(fens)
+    exhausted = False
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        while pending or not exhausted:
+            # Rellena hasta el límite de posiciones pendientes (lee la entrada solo lo necesario).
+            while not exhausted and len(pending) < in_flight:
+                item = next(fens, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, fen = item
+                pending[pool.submit(solve_position, index, fen, depth, time_limit, use_tablebase, compact)] = (index, fen)
+            if not pending:
+                break
+
+            # Escribe los resultados en cuanto terminan (no en el orden de la entrada).
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, fen = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e: # El proceso murió o el resultado no llegó: se anota y se sigue
+                    result = {"index": index, "fen": fen, "error": f"{type(e).__name__}: {e}"}
+                output.write(json.dumps(result) + "\n")
+                solved += 1
+            output.flush()
+    return solved
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve FEN positions in parallel and write JSON lines.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one FEN per line ('-' = stdin)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="search depth")
+    parser.add_argument("--time", type=float, help="time limit per position, in seconds")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--in-flight", type=int, help="maximum number of positions queued at once")
+    parser.add_argument("--no-tablebase", action="store_true", help="always search, even if the tablebase covers the position")
+    parser.add_argument("--compact", action="store_true", help="search on the compact KRRK board")
+    parser.add_argument("--output", help="write the JSON lines to this file instead of stdout")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        start = time.perf_counter()
+        solved = solve_stream(read_fens(source), output, args.depth, args.time, args.workers, args.in_flight,
+                              not args.no_tablebase, args.compact)
+        print(f"Solved {solved} positions in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
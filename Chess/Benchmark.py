@@ -0,0 +1,208 @@
+import argparse # Importa argparse para las opciones de la línea de comandos
+import json # Importa json para emitir los resultados en un formato legible por máquinas
+import platform # Importa platform para anotar la versión de Python en el informe
+import random # Importa random para generar el corpus de posiciones (con semilla fija)
+import sys # Importa sys para escribir el informe en la salida estándar
+import time # Importa time para medir el tiempo de cada movimiento
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from LadderMate import ladder_move # Importa la regla del mate de la escalera (alternativa rápida a la búsqueda)
+from Minimax import find_best_move, SearchContext # Importa la búsqueda que se mide
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición de cada partida
+
+# --- Banco de Pruebas sin Interfaz Gráfica ---
+# Juega partidas completas (IA contra IA) desde un corpus fijo de posiciones KRRK, como las
+# que se colocan en la fase de preparación de la interfaz (Rey Blanco, dos Torres Blancas y
+# Rey Negro, con Blancas al turno), y mide el rendimiento de find_best_move para Blancas.
+
+DEFAULT_SEED = 2024 # Semilla del corpus: el mismo número produce siempre las mismas posiciones
+DEFAULT_POSITIONS = 10 # Número de posiciones del corpus
+DEFAULT_DEPTHS = (2, 3, 4) # Profundidades que se miden
+DEFAULT_MAX_PLIES = 200 # Medias jugadas tras las que una partida se da por no terminada
+DEFAULT_TT_SIZE_MB = 16 # Tabla de transposición de cada partida (se conserva entre movimientos)
+
+
+def krrk_corpus(count=DEFAULT_POSITIONS, seed=DEFAULT_SEED):
+    """
+    Genera un corpus reproducible de posiciones KRRK legales con Blancas al turno.
+
+    Args:
+        count (int): Número de posiciones.
+        seed (int): Semilla del generador aleatorio.
+
+    Returns:
+        list: Lista de FEN.
+    """
+    rng = random.Random(seed)
+    fens = []
+    while len(fens) < count:
+        white_king, black_king, rook_a, rook_b = rng.sample(chess.SQUARES, 4)
+        board = chess.Board(None)
+        board.set_piece_at(white_king, chess.Piece(chess.KING, chess.WHITE))
+        board.set_piece_at(black_king, chess.Piece(chess.KING, chess.BLACK))
+        board.set_piece_at(rook_a, chess.Piece(chess.ROOK, chess.WHITE))
+        board.set_piece_at(rook_b, chess.Piece(chess.ROOK, chess.WHITE))
+        board.turn = chess.WHITE
+        # Descarta posiciones ilegales (reyes juntos, Negras en jaque con Blancas al turno)
+        # y las que ya están terminadas.
+        if board.is_valid() and not board.is_game_over():
+            fens.append(board.fen())
+    return fens
+
+
+def play_game(fen, depth, max_plies=DEFAULT_MAX_PLIES, use_tablebase=False, compact=False, ladder=False):
+    """
+    Juega una partida desde 'fen' con find_best_move para ambos bandos y mide a Blancas.
+
+    Negras se defienden con la misma búsqueda y profundidad, para que la partida sea
+    determinista y la defensa razonable. Con 'ladder', Blancas prueban antes la regla del
+    mate de la escalera y solo buscan cuando no se puede aplicar; se cuenta cuántos
+    movimientos sirve cada camino y el tiempo de CPU de cada uno.
+
+    Args:
+        fen (str): Posición inicial (Blancas al turno).
+        depth (int): Profundidad de búsqueda de ambos bandos.
+        max_plies (int): Tope de medias jugadas de la partida.
+        use_tablebase (bool): Si es True, se consulta la tabla de finales (si está generada).
+        compact (bool): Si es True, se busca sobre el tablero compacto KRRKBoard.
+        ladder (bool): Si es True, Blancas usan la regla del mate de la escalera cuando se puede.
+
+    Returns:
+        dict: Resultado de la partida y métricas de los movimientos de Blancas.
+    """
+    board = chess.Board(fen)
+    white_tt = TranspositionTable(DEFAULT_TT_SIZE_MB) # Cada bando conserva su tabla durante la partida
+    black_tt = TranspositionTable(DEFAULT_TT_SIZE_MB)
+    move_times = [] # Tiempo de cada movimiento de Blancas
+    nodes = 0 # Nodos visitados por Blancas
+    cpu = {"ladder": 0.0, "search": 0.0} # Tiempo de CPU de Blancas en cada camino
+    moves_by_path = {"ladder": 0, "search": 0} # Movimientos de Blancas servidos por cada camino
+    while not board.is_game_over() and len(board.move_stack) < max_plies:
+        white_to_move = board.turn == chess.WHITE
+        context = SearchContext(white_tt if white_to_move else black_tt)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        move = ladder_move(board) if ladder and white_to_move else None
+        path = "ladder"
+        if move is None:
+            path = "search"
+            move = find_best_move(board, depth, context=context, use_tablebase=use_tablebase, compact=compact)
+        elapsed = time.perf_counter() - start
+        if white_to_move:
+            move_times.append(elapsed)
+            cpu[path] += time.process_time() - cpu_start
+            moves_by_path[path] += 1
+            nodes += context.nodes
+        board.push(move)
+
+    mated = board.is_checkmate()
+    total_time = sum(move_times)
+    return {
+        "fen": fen,
+        "result": board.result(claim_draw=True) if board.is_game_over() else "*",
+        "mated": mated,
+        "plies_to_mate": len(board.move_stack) if mated else None,
+        "time_to_mate": total_time if mated else None,
+        "white_moves": len(move_times),
+        "nodes": nodes,
+        "time": total_time,
+        "nodes_per_second": nodes / total_time if total_time else 0.0,
+        "time_per_move": total_time / len(move_times) if move_times else 0.0,
+        "ladder_moves": moves_by_path["ladder"],
+        "search_moves": moves_by_path["search"],
+        "ladder_cpu_time": cpu["ladder"],
+        "search_cpu_time": cpu["search"],
+        "cpu_time": cpu["ladder"] + cpu["search"],
+    }
+
+
+def _summary(games):
+    # Métricas agregadas de todas las partidas de una profundidad
+    nodes = sum(game["nodes"] for game in games)
+    total_time = sum(game["time"] for game in games)
+    moves = sum(game["white_moves"] for game in games)
+    mates = [game for game in games if game["mated"]]
+    return {
+        "games": len(games),
+        "mates": len(mates),
+        "nodes": nodes,
+        "time": total_time,
+        "nodes_per_second": nodes / total_time if total_time else 0.0,
+        "time_per_move": total_time / moves if moves else 0.0,
+        "mean_time_to_mate": sum(game["time_to_mate"] for game in mates) / len(mates) if mates else None,
+        "mean_plies_to_mate": sum(game["plies_to_mate"] for game in mates) / len(mates) if mates else None,
+        "ladder_moves": sum(game["ladder_moves"] for game in games),
+        "search_moves": sum(game["search_moves"] for game in games),
+        "cpu_time": sum(game["cpu_time"] for game in games),
+        "cpu_time_per_game": sum(game["cpu_time"] for game in games) / len(games) if games else 0.0,
+    }
+
+
+def run_benchmark(depths=DEFAULT_DEPTHS, positions=DEFAULT_POSITIONS, seed=DEFAULT_SEED,
+                  max_plies=DEFAULT_MAX_PLIES, use_tablebase=False, compact=False, ladder=False, log=None):
+    """
+    Ejecuta el banco de pruebas completo.
+
+    Args:
+        depths (iterable): Profundidades a medir.
+        positions (int): Tamaño del corpus.
+        seed (int): Semilla del corpus.
+        max_plies (int): Tope de medias jugadas de cada partida.
+        use_tablebase (bool): Si es True, se consulta la tabla de finales.
+        compact (bool): Si es True, se busca sobre el tablero compacto KRRKBoard.
+        ladder (bool): Si es True, Blancas usan la regla del mate de la escalera cuando se puede.
+        log (callable, opcional): Función para informar del progreso.
+
+    Returns:
+        dict: Informe con la configuración, el entorno y los resultados por profundidad.
+    """
+    fens = krrk_corpus(positions, seed)
+    report = {
+        "config": {"depths": list(depths), "positions": positions, "seed": seed, "max_plies": max_plies,
+                   "use_tablebase": use_tablebase, "compact": compact, "ladder": ladder},
+        "environment": {"python": platform.python_version(), "python_chess": chess.__version__,
+                        "platform": platform.platform()},
+        "corpus": fens,
+        "depths": {},
+    }
+    for depth in depths:
+        games = []
+        for fen in fens:
+            game = play_game(fen, depth, max_plies, use_tablebase, compact, ladder)
+            games.append(game)
+            if log is not None:
+                log(f"depth {depth} {fen}: {game['result']} after {game['white_moves']} moves "
+                    f"({game['ladder_moves']} ladder, {game['search_moves']} search), "
+                    f"{game['cpu_time'] * 1000:.1f} ms CPU, {game['nodes_per_second']:.0f} nodes/s")
+        report["depths"][str(depth)] = {"summary": _summary(games), "games": games}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless benchmark for the chess search engine.")
+    parser.add_argument("--depths", type=int, nargs="+", default=list(DEFAULT_DEPTHS), help="search depths to measure")
+    parser.add_argument("--positions", type=int, default=DEFAULT_POSITIONS, help="number of corpus positions")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="corpus seed")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="ply limit per game")
+    parser.add_argument("--tablebase", action="store_true", help="probe the KRRK tablebase if it is generated")
+    parser.add_argument("--compact", action="store_true", help="search on the compact KRRK board")
+    parser.add_argument("--ladder", action="store_true", help="play White with the ladder-mate rule when it applies")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="do not print progress to stderr")
+    args = parser.parse_args()
+
+    log = None if args.quiet else (lambda message: print(message, file=sys.stderr))
+    report = run_benchmark(args.depths, args.positions, args.seed, args.max_plies, args.tablebase, args.compact, args.ladder, log)
+    for depth, results in report["depths"].items():
+        summary = results["summary"]
+        print(f"Depth {depth}: {summary['mates']}/{summary['games']} mates, "
+              f"{summary['nodes_per_second']:.0f} nodes/s, {summary['time_per_move'] * 1000:.1f} ms/move, "
+              f"mean plies to mate {summary['mean_plies_to_mate']}, "
+              f"{summary['ladder_moves']} ladder / {summary['search_moves']} search moves, "
+              f"{summary['cpu_time_per_game'] * 1000:.1f} ms CPU per game", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -1,15 +1,14 @@
+import time # Importa time para medir el tiempo de arranque
+START_TIME = time.perf_counter() # Instante de arranque (para medir el tiempo hasta el primer fotograma)
 import chess
-import chess.engine
 import pygame
-from Minimax import find_best_move # Importa la función principal del algoritmo Minimax
-from Heuristic import CHECKMATE_SCORE # Importa la constante de puntuación de jaque mate
 from ChessGUI import ChessGUI # Importa la clase de la interfaz gráfica de usuario
 
 # --- Bucle Principal del Juego (Main Game Loop) ---
 def main():
     # Inicializa la interfaz gráfica de usuario
     # Esto también configura la ventana de Pygame.
-    gui = ChessGUI() 
+    gui = ChessGUI(start_time=START_TIME) 
 
     print("Starting setup phase...") # Mensaje para la consola indicando el inicio de la fase de configuración
 
@@ -20,7 +19,37 @@ def main():
 
     # Define la profundidad máxima para el algoritmo Minimax.
     # Un valor más alto hace que la IA sea más 'inteligente' pero también más lenta.
-    MAX_DEPTH = 4 # Ajusta este valor para controlar la fuerza de la IA
+    MAX_DEPTH = 6 # Ajusta este valor para controlar la fuerza de la IA
+    # Tiempo máximo (en segundos) que la IA puede pensar cada movimiento. La búsqueda
+    # profundiza de uno en uno hasta agotar este tiempo, con MAX_DEPTH como tope.
+    # Con None se busca siempre a MAX_DEPTH, sin importar cuánto tarde.
+    MOVE_TIME_LIMIT = 2.0
+
+    # Tabla de transposición compartida por todas las búsquedas de esta partida,
+    # para que las posiciones analizadas en un turno se reutilicen en los siguientes.
+    TT_SIZE_MB = 64 # Presupuesto de memoria de la tabla (en megabytes)
+    # Busca sobre el tablero compacto especializado en KRRK (mismo resultado, más nodos por segundo).
+    COMPACT_BOARD = True
+    # Guarda en disco (search_cache.sqlite3) el resultado de cada búsqueda, para que las
+    # posiciones ya vistas en partidas anteriores se respondan sin buscar.
+    USE_SEARCH_CACHE = True
+    # Juega los finales de dos Torres contra Rey con la técnica del mate de la escalera (sin
+    # buscar) y solo recurre a la búsqueda cuando la regla no se puede aplicar. La regla se
+    # prueba antes que la caché, que entonces solo sirve las posiciones que la regla no cubre.
+    USE_LADDER_MATE = True
+    FPS = 60 # Fotogramas por segundo del bucle principal mientras la IA piensa
+
+    # El motor (búsqueda, tablas precalculadas, caché) se importa aquí, al necesitarlo por
+    # primera vez, para que no retrase la aparición de la ventana.
+    from EngineWorker import EngineWorker # Importa el trabajador que ejecuta la búsqueda Minimax en segundo plano
+    from SearchCache import SearchCache # Importa la caché de búsquedas que se conserva entre partidas
+
+    # La IA busca en un hilo aparte: el bucle principal sigue procesando eventos y
+    # redibujando la ventana, así que esta no se congela durante las búsquedas largas.
+    cache = SearchCache() if USE_SEARCH_CACHE else None
+    engine = EngineWorker(MAX_DEPTH, MOVE_TIME_LIMIT, TT_SIZE_MB, COMPACT_BOARD, cache, USE_LADDER_MATE)
+    search = None # Búsqueda en curso (SearchHandle) o None
+    clock = pygame.time.Clock() # Reloj para limitar la velocidad de fotogramas
 
     running = True # Variable de control para mantener el bucle del juego activo
     while running:
@@ -51,28 +80,43 @@ def main():
         # --- Turno de Blancas (IA) ---
         # Si es el turno de las piezas blancas
         if board.turn == chess.WHITE:
-            print("White's turn (AI thinking)...") # Mensaje en consola indicando que la IA está pensando
+            if search is None:
+                print("White's turn (AI thinking)...") # Mensaje en consola indicando que la IA está pensando
 
-            # Encuentra el mejor movimiento para BLANCAS usando el algoritmo Minimax.
-            # El MAX_DEPTH determina qué tan 'profundo' busca la IA.
-            best_move = find_best_move(board, MAX_DEPTH)
-            
-            # Si la IA encuentra un movimiento legal
-            if best_move:
-                board.push(best_move) # Realiza el movimiento en el tablero
-                print(f"White (AI) plays: {best_move.uci()}") # Muestra el movimiento de la IA en formato UCI
-            # Si la IA no tiene movimientos legales (debería ser un ahogado o jaque mate ya manejado)
-            else:
-                print("White (AI) has no legal moves. Game over (stalemate/no moves).")
-                running = False # Detiene el juego
+                # Lanza la búsqueda del mejor movimiento para BLANCAS en segundo plano.
+                # El MAX_DEPTH determina qué tan 'profundo' busca la IA y MOVE_TIME_LIMIT cuánto tiempo.
+                search = engine.search(board)
+                gui.thinking = True # Muestra el indicador de "pensando" en la ventana
+            elif search.done():
+                # La búsqueda terminó: se aplica el movimiento encontrado.
+                best_move = search.result()
+                search = None
+                gui.thinking = False
+                print(engine.tt) # Muestra las estadísticas de aciertos y cortes de la tabla de transposición
+                print(engine.ponder_stats()) # Muestra cuántas respuestas salieron del análisis por adelantado
+                if cache is not None:
+                    print(cache) # Muestra cuántas respuestas salieron de la caché en disco
+
+                # Si la IA encuentra un movimiento legal
+                if best_move:
+                    board.push(best_move) # Realiza el movimiento en el tablero
+                    print(f"White (AI) plays: {best_move.uci()}") # Muestra el movimiento de la IA en formato UCI
+                # Si la IA no tiene movimientos legales (debería ser un ahogado o jaque mate ya manejado)
+                else:
+                    print("White (AI) has no legal moves. Game over (stalemate/no moves).")
+                    running = False # Detiene el juego
         # --- Turno de Negras (Usuario) ---
         # Si es el turno de las piezas negras (el usuario)
         else: 
             print("Black's turn (Your turn). Click and drag pieces on the board.") # Instrucciones para el usuario
             
+            # Mientras el usuario piensa, la IA analiza por adelantado sus posibles jugadas.
+            engine.ponder(board)
+
             # Obtiene el movimiento del usuario a través de la interfaz gráfica.
             # Este método espera hasta que el usuario realice un movimiento válido.
             user_move = gui.get_user_move()
+            engine.stop_pondering() # El usuario ya movió: se detiene el análisis por adelantado
             
             # Si el usuario realizó un movimiento válido
             if user_move:
@@ -90,6 +134,11 @@ def main():
                 running = False # Detiene el bucle principal del juego
                 break # Sale del bucle for, y el bucle while también terminará
 
+        clock.tick(FPS) # Limita la velocidad de fotogramas (el resto del tiempo es para la IA)
+
+    engine.shutdown() # Cancela la búsqueda en curso (si la hay) y detiene el hilo de la IA
+    if cache is not None:
+        cache.close() # Aplica el límite de tamaño y cierra el archivo de la caché
     pygame.quit() # Cierra y desinicializa Pygame
     print("\n--- Game Exited ---") # Mensaje final al salir del juego
 
@@ -1,10 +1,33 @@
+import os # Importa os para construir las rutas de las imágenes junto al módulo
+import time # Importa time para medir el tiempo hasta el primer fotograma
 import pygame # Importa la librería Pygame para la interfaz gráfica
 import chess # Importa la librería python-chess para la lógica del ajedrez
 
+# Las rutas se resuelven respecto al módulo, no al directorio de trabajo.
+PIECES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pieces") # Imágenes originales de las piezas
+ATLAS_CACHE_DIR = os.path.join(PIECES_DIR, "cache") # Atlas ya escalados (uno por tamaño de casilla)
+# Nombres de archivo de las imágenes de las piezas que necesitamos para este final de juego,
+# en el orden en que aparecen (de izquierda a derecha) en el atlas.
+PIECE_FILES = {
+    'K': 'white_king.png', # Rey Blanco
+    'R': 'white_rook.png', # Torre Blanca
+    'k': 'black_king.png'  # Rey Negro
+}
+
 class ChessGUI:
-    def __init__(self, square_size=80):
-        # Inicializa todos los módulos importados de Pygame
-        pygame.init() 
+    def __init__(self, square_size=80, start_time=None):
+        """
+        Args:
+            square_size (int): Tamaño de cada casilla en píxeles.
+            start_time (float, opcional): Instante de arranque del programa (time.perf_counter()).
+                                          Si se indica, se informa por consola del tiempo hasta
+                                          el primer fotograma.
+        """
+        # Inicializa solo los módulos de Pygame que se usan (ventana y eventos, y fuentes);
+        # pygame.init() arrancaría también el audio y los mandos, que tardan y no hacen falta.
+        pygame.display.init()
+        pygame.font.init()
+        self.start_time = start_time
         
         self.square_size = square_size # Define el tamaño de cada casilla del tablero en píxeles (ej. 80x80)
         # Calcula el ancho y alto de la ventana del juego (8 casillas x tamaño de casilla)
@@ -24,12 +47,33 @@ class ChessGUI:
             "highlight_move": (100, 200, 255, 150) # Azul semi-transparente para resaltar movimientos legales
         }
         
+        # --- Superficies y Fuentes en Caché ---
+        # Se crean una sola vez en lugar de en cada fotograma.
+        self.fonts = {} # Tamaño -> pygame.font.Font
+        self.text_cache = {} # (texto, color, tamaño) -> superficie con el texto ya renderizado
+        self.background = self.render_background() # Casillas del tablero, pre-renderizadas
+        self.highlight_surface = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+        self.highlight_surface.fill(self.colors["highlight_move"]) # Resaltado de movimientos legales
+        self.overlays = {} # Opacidad -> superficie negra semi-transparente del tamaño de la ventana
+
+        # --- Estado del Renderizado por Rectángulos Sucios ---
+        # 'frame' guarda la parte estática de la imagen (tablero, resaltados, piezas y textos de
+        # configuración); solo se vuelve a dibujar cuando cambia el estado que representa. Lo
+        # que se mueve cada fotograma (la pieza arrastrada y el indicador de "pensando") se
+        # dibuja encima y solo se envían a la pantalla los rectángulos que cambiaron.
+        self.frame = pygame.Surface((self.width, self.height)).convert()
+        self.frame_state = None # Estado representado en 'frame' (None = hay que redibujarlo)
+        self.dynamic_items = [] # Elementos dinámicos dibujados en el último fotograma: (superficie, rectángulo)
+
         # Carga las imágenes de las piezas de ajedrez
         self.pieces = self.load_pieces()
         self.selected_square = None # Almacena la casilla de la pieza que el usuario ha seleccionado (para mover)
         self.dragging_piece = None # Almacena la pieza que se está arrastrando con el mouse
         self.drag_offset_x, self.drag_offset_y = 0, 0 # Desplazamiento para que la pieza se arrastre suavemente desde el clic
         self.board = None # El objeto 'chess.Board' se inicializará después de la fase de configuración
+        self.move_index = {} # Movimientos legales del turno: casilla de origen -> {casilla de destino: movimiento}
+        self.move_index_key = None # Posición para la que se construyó 'move_index' (ver legal_move_index)
+        self.thinking = False # True mientras la IA busca su movimiento (muestra el indicador de "pensando")
 
         # --- Variables del Modo de Configuración ---
         self.setup_mode = True # Indica si el juego está en la fase de configuración de piezas
@@ -41,43 +85,89 @@ class ChessGUI:
 
     def load_pieces(self):
         """
-        Carga las imágenes de las piezas de ajedrez desde la carpeta 'pieces'.
+        Carga las imágenes de las piezas de ajedrez desde el atlas en caché de este tamaño
+        de casilla; si no existe (o alguna imagen de 'pieces' es más reciente), lo crea.
+
+        Returns:
+            dict: Símbolo de la pieza -> superficie ya escalada (o None si no se pudo cargar).
+        """
+        atlas_path = os.path.join(ATLAS_CACHE_DIR, f"atlas_{self.square_size}.bmp")
+        sources = [os.path.join(PIECES_DIR, filename) for filename in PIECE_FILES.values()]
+        try:
+            # BMP sin comprimir: se carga mucho más rápido que decodificar y escalar cada PNG.
+            if os.path.getmtime(atlas_path) >= max(os.path.getmtime(source) for source in sources):
+                atlas = pygame.image.load(atlas_path).convert_alpha()
+                return {piece_symbol: atlas.subsurface((index * self.square_size, 0, self.square_size, self.square_size))
+                        for index, piece_symbol in enumerate(PIECE_FILES)}
+        except (OSError, pygame.error):
+            pass # No hay atlas (o no se puede leer): se crea a partir de las imágenes originales
+        return self.build_atlas(atlas_path)
+
+    def build_atlas(self, atlas_path):
+        """
+        Carga y escala las imágenes de las piezas, las reúne en una sola superficie (atlas)
+        y la guarda en disco para los próximos arranques.
+
+        Args:
+            atlas_path (str): Ruta donde se guarda el atlas.
+
+        Returns:
+            dict: Símbolo de la pieza -> superficie ya escalada (o None si no se pudo cargar).
         """
         pieces = {} # Diccionario para almacenar las superficies de las imágenes de las piezas
-        # Nombres de archivo de las imágenes de las piezas que necesitamos para este final de juego
-        piece_names = {
-            'K': 'white_king.png', # Rey Blanco
-            'R': 'white_rook.png', # Torre Blanca
-            'k': 'black_king.png'  # Rey Negro
-        }
+        atlas = pygame.Surface((len(PIECE_FILES) * self.square_size, self.square_size), pygame.SRCALPHA)
         
         # Itera sobre el diccionario para cargar cada imagen
-        for piece_symbol, filename in piece_names.items():
+        for index, (piece_symbol, filename) in enumerate(PIECE_FILES.items()):
             try:
-                # Construye la ruta completa a la imagen. Se espera una carpeta 'pieces'
-                # en el mismo directorio que el script.
-                img_path = f"pieces/{filename}"
                 # Carga la imagen y la convierte para un rendimiento óptimo con transparencia
-                image = pygame.image.load(img_path).convert_alpha()
-                # Escala la imagen al tamaño de la casilla y la guarda en el diccionario
-                pieces[piece_symbol] = pygame.transform.scale(image, (self.square_size, self.square_size))
-            except pygame.error as e:
+                image = pygame.image.load(os.path.join(PIECES_DIR, filename)).convert_alpha()
+                # Escala la imagen al tamaño de la casilla y la coloca en su hueco del atlas
+                atlas.blit(pygame.transform.scale(image, (self.square_size, self.square_size)), (index * self.square_size, 0))
+                pieces[piece_symbol] = atlas.subsurface((index * self.square_size, 0, self.square_size, self.square_size))
+            except (OSError, pygame.error) as e:
                 # Si hay un error al cargar la imagen, imprime un mensaje de error
                 print(f"Error loading piece image {filename}: {e}")
                 pieces[piece_symbol] = None # Marca la pieza como no cargada (para usar un fallback visual)
+
+        # Solo se guarda un atlas completo (si falta una imagen, se vuelve a intentar la próxima vez).
+        if all(image is not None for image in pieces.values()):
+            try:
+                os.makedirs(ATLAS_CACHE_DIR, exist_ok=True)
+                pygame.image.save(atlas, atlas_path)
+            except (OSError, pygame.error) as e:
+                print(f"Could not cache piece atlas {atlas_path}: {e}")
         return pieces
 
-    def draw_board(self):
+    def render_background(self):
         """
-        Dibuja las casillas del tablero de ajedrez.
+        Pre-renderiza las casillas del tablero de ajedrez en una superficie (una sola vez).
         Alterna los colores de las casillas.
         """
+        background = pygame.Surface((self.width, self.height)).convert()
         for row in range(8):
             for col in range(8):
                 # Determina el color de la casilla (claro u oscuro)
                 color = self.colors["light_square"] if (row + col) % 2 == 0 else self.colors["dark_square"]
                 # Dibuja un rectángulo para cada casilla
-                pygame.draw.rect(self.screen, color, (col * self.square_size, row * self.square_size, self.square_size, self.square_size))
+                pygame.draw.rect(background, color, (col * self.square_size, row * self.square_size, self.square_size, self.square_size))
+        return background
+
+    def get_overlay(self, alpha):
+        """
+        Devuelve (creándola la primera vez) una superficie negra semi-transparente que cubre la ventana.
+        """
+        if alpha not in self.overlays:
+            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))
+            self.overlays[alpha] = overlay
+        return self.overlays[alpha]
+
+    def draw_board(self):
+        """
+        Dibuja las casillas del tablero de ajedrez (copiando el fondo pre-renderizado).
+        """
+        self.frame.blit(self.background, (0, 0))
 
     def draw_pieces(self):
         """
@@ -102,13 +192,13 @@ class ChessGUI:
                     col = chess.square_file(square) # Columna de la casilla (0-7)
                     row = 7 - chess.square_rank(square) # Fila de la casilla (invertida para coordenadas de Pygame)
                     # Dibuja la imagen de la pieza en la posición correcta
-                    self.screen.blit(img, (col * self.square_size, row * self.square_size))
+                    self.frame.blit(img, (col * self.square_size, row * self.square_size))
                 else:
                     # Alternativa si la imagen de la pieza no se cargó: dibuja un círculo de color
                     center_x = chess.square_file(square) * self.square_size + self.square_size // 2
                     center_y = (7 - chess.square_rank(square)) * self.square_size + self.square_size // 2
                     color = (255, 0, 0) if piece.color == chess.WHITE else (0, 0, 0)
-                    pygame.draw.circle(self.screen, color, (center_x, center_y), self.square_size // 3)
+                    pygame.draw.circle(self.frame, color, (center_x, center_y), self.square_size // 3)
 
     def draw_selected_square(self):
         """
@@ -119,75 +209,187 @@ class ChessGUI:
             col = chess.square_file(self.selected_square) # Columna de la casilla seleccionada
             row = 7 - chess.square_rank(self.selected_square) # Fila (invertida)
             # Dibuja un rectángulo de borde alrededor de la casilla seleccionada
-            pygame.draw.rect(self.screen, self.colors["selected_square"],
+            pygame.draw.rect(self.frame, self.colors["selected_square"],
                              (col * self.square_size, row * self.square_size, self.square_size, self.square_size), 3) # El '3' es el grosor del borde
 
+    def legal_move_index(self):
+        """
+        Devuelve los movimientos legales de la posición actual agrupados por casilla de origen.
+        Se construye una sola vez por turno: se vuelve a generar cuando cambia el tablero o
+        se hace (o deshace) un movimiento en él.
+
+        Las coronaciones a una misma casilla se reducen a una sola entrada (la de Dama), que es
+        el movimiento que se realiza al soltar la pieza allí.
+
+        Returns:
+            dict: Casilla de origen -> {casilla de destino: chess.Move}. Solo contiene las
+                  casillas de las piezas que tienen algún movimiento legal.
+        """
+        move_stack = self.board.move_stack
+        key = (id(self.board), len(move_stack), move_stack[-1] if move_stack else None)
+        if key != self.move_index_key:
+            index = {}
+            for move in self.board.legal_moves:
+                targets = index.setdefault(move.from_square, {})
+                if move.to_square not in targets or move.promotion == chess.QUEEN:
+                    targets[move.to_square] = move
+            self.move_index, self.move_index_key = index, key
+        return self.move_index
+
     def draw_legal_moves(self):
         """
         Resalta las casillas a las que la pieza seleccionada puede moverse legalmente.
         Solo se usa en el modo de juego.
         """
         if self.selected_square is not None and not self.setup_mode: # Solo resalta en modo de juego
-            # Crea una superficie semi-transparente para el resaltado
-            s = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
-            s.fill(self.colors["highlight_move"]) # Rellena con el color azul semi-transparente
-
-            # Itera sobre todos los movimientos legales en el tablero
-            for move in self.board.legal_moves:
-                # Si el movimiento comienza desde la casilla seleccionada
-                if move.from_square == self.selected_square:
-                    to_col = chess.square_file(move.to_square) # Columna de la casilla de destino
-                    to_row = 7 - chess.square_rank(move.to_square) # Fila de la casilla de destino (invertida)
-                    # Dibuja la superficie semi-transparente en la casilla de destino
-                    self.screen.blit(s, (to_col * self.square_size, to_row * self.square_size))
+            # Destinos de la pieza seleccionada, ya agrupados en el índice del turno
+            for to_square in self.legal_move_index().get(self.selected_square, ()):
+                to_col = chess.square_file(to_square) # Columna de la casilla de destino
+                to_row = 7 - chess.square_rank(to_square) # Fila de la casilla de destino (invertida)
+                # Dibuja la superficie semi-transparente en la casilla de destino
+                self.frame.blit(self.highlight_surface, (to_col * self.square_size, to_row * self.square_size))
 
     def draw_dragging_piece(self):
         """
-        Dibuja la pieza que el usuario está arrastrando en la posición actual del mouse.
+        Devuelve la pieza que el usuario está arrastrando, en la posición actual del mouse.
         Solo se usa en el modo de juego.
+
+        Returns:
+            tuple o None: (superficie, rectángulo) a dibujar sobre el fotograma, o None.
         """
         # Si hay una pieza siendo arrastrada y su imagen está cargada, y NO estamos en modo de configuración
         if self.dragging_piece and self.pieces.get(self.dragging_piece.symbol()) and not self.setup_mode:
             mouse_x, mouse_y = pygame.mouse.get_pos() # Obtiene la posición actual del mouse
             img = self.pieces[self.dragging_piece.symbol()] # Obtiene la imagen de la pieza arrastrada
-            # Dibuja la imagen de la pieza ajustando con el offset para que siga el cursor
-            self.screen.blit(img, (mouse_x - self.drag_offset_x, mouse_y - self.drag_offset_y))
+            # Posición de la imagen ajustada con el offset para que siga el cursor
+            return img, img.get_rect(topleft=(mouse_x - self.drag_offset_x, mouse_y - self.drag_offset_y))
+        return None
+
+    def render_text(self, text, color=(255, 255, 255), size=30):
+        """
+        Devuelve la superficie con el texto renderizado (de la caché si ya se renderizó antes).
+        """
+        key = (text, color, size)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            font = self.fonts.get(size)
+            if font is None:
+                font = self.fonts[size] = pygame.font.Font(None, size) # Crea la fuente una sola vez por tamaño
+            surface = self.text_cache[key] = font.render(text, True, color) # Renderiza el texto
+        return surface
 
-    def draw_text(self, text, x, y, color=(255, 255, 255), size=30):
+    def draw_text(self, text, x, y, color=(255, 255, 255), size=30, surface=None):
         """
-        Dibuja texto en la pantalla en una posición específica.
+        Dibuja texto centrado en una posición específica.
+
+        Args:
+            surface (pygame.Surface, opcional): Dónde dibujarlo. Por defecto, la pantalla.
+
+        Returns:
+            pygame.Rect: El rectángulo ocupado por el texto.
         """
-        font = pygame.font.Font(None, size) # Crea una fuente de texto
-        text_surface = font.render(text, True, color) # Renderiza el texto
+        text_surface = self.render_text(text, color, size) # Texto renderizado (en caché)
         text_rect = text_surface.get_rect(center=(x, y)) # Obtiene el rectángulo del texto y lo centra
-        self.screen.blit(text_surface, text_rect) # Dibuja el texto en la pantalla
+        (surface or self.screen).blit(text_surface, text_rect) # Dibuja el texto
+        return text_rect
 
-    def update_display(self):
+    def draw_thinking_indicator(self):
+        """
+        Devuelve el indicador animado que se muestra mientras la IA está pensando su movimiento.
+
+        Returns:
+            tuple o None: (superficie, rectángulo) a dibujar sobre el fotograma, o None.
+        """
+        if self.thinking and not self.setup_mode:
+            dots = "." * (1 + (pygame.time.get_ticks() // 400) % 3) # De 1 a 3 puntos, cambia cada 0.4 s
+            text_surface = self.render_text(f"Thinking{dots}", color=(255, 255, 0), size=28)
+            return text_surface, text_surface.get_rect(center=(self.width // 2, self.square_size // 4))
+        return None
+
+    def get_frame_state(self):
+        """
+        Resumen de todo lo que se dibuja en la parte estática del fotograma: si no cambia,
+        no hace falta volver a dibujarla.
+        """
+        return (self.board.board_fen() if self.board else None, self.board.turn if self.board else None,
+                self.selected_square, self.dragging_piece is not None, self.setup_mode,
+                self.setup_message, self.current_piece_to_place, self.white_rooks_placed)
+
+    def draw_frame(self):
         """
-        Actualiza y refresca toda la pantalla del juego.
-        Se llama en cada iteración del bucle principal.
+        Dibuja la parte estática del fotograma (todo salvo la pieza arrastrada y el indicador
+        de "pensando") en la superficie 'frame'.
         """
         self.draw_board() # Dibuja el tablero
         self.draw_selected_square() # Dibuja el resaltado de la casilla seleccionada
         self.draw_legal_moves() # Dibuja los resaltados de movimientos legales
         self.draw_pieces() # Dibuja todas las piezas en el tablero
-        self.draw_dragging_piece() # Dibuja la pieza que se está arrastrando (si aplica)
 
         # Si estamos en modo de configuración, dibuja los mensajes de ayuda al usuario
         if self.setup_mode:
-            # Crea una superficie semi-transparente para oscurecer un poco el tablero
-            s = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            s.fill((0, 0, 0, 100)) # Color negro semi-transparente
-            self.screen.blit(s, (0,0)) # Dibuja esta superficie sobre el tablero
+            # Oscurece un poco el tablero con una superficie semi-transparente
+            self.frame.blit(self.get_overlay(100), (0, 0))
 
             # Dibuja los mensajes de instrucciones para la configuración
-            self.draw_text(self.setup_message, self.width // 2, self.height // 2 - 50, color=(255, 255, 0)) # Mensaje principal
-            self.draw_text("Click to place. Right-click to remove.", self.width // 2, self.height // 2, size=24) # Instrucciones de clic
+            self.draw_text(self.setup_message, self.width // 2, self.height // 2 - 50, color=(255, 255, 0), surface=self.frame) # Mensaje principal
+            self.draw_text("Click to place. Right-click to remove.", self.width // 2, self.height // 2, size=24, surface=self.frame) # Instrucciones de clic
             # Muestra un mensaje para iniciar el juego una vez que todas las piezas estén colocadas
             if self.white_rooks_placed == 2 and self.current_piece_to_place is None:
-                 self.draw_text("Press ENTER to start game.", self.width // 2, self.height // 2 + 50, color=(0, 255, 0))
+                 self.draw_text("Press ENTER to start game.", self.width // 2, self.height // 2 + 50, color=(0, 255, 0), surface=self.frame)
+
+    def update_display(self):
+        """
+        Actualiza la pantalla del juego. Se llama en cada iteración del bucle principal.
+
+        Si el estado del juego cambió, se redibuja el fotograma completo; si no, solo se
+        redibujan (y se envían a la pantalla) los rectángulos de los elementos que se mueven.
+        """
+        state = self.get_frame_state()
+        full_redraw = state != self.frame_state
+        if full_redraw:
+            self.draw_frame()
+            self.frame_state = state
+            self.screen.blit(self.frame, (0, 0))
+
+        # Elementos dinámicos de este fotograma: (superficie, rectángulo)
+        items = [item for item in (self.draw_dragging_piece(), self.draw_thinking_indicator()) if item is not None]
+        if not full_redraw and items == self.dynamic_items:
+            return # Nada cambió: no hay que dibujar ni enviar nada a la pantalla
+
+        dirty = [] # Rectángulos de la pantalla que cambiaron
+        if not full_redraw:
+            for _, rect in self.dynamic_items:
+                self.screen.blit(self.frame, rect, rect) # Restaura el fondo donde estaban
+                dirty.append(rect)
+        for surface, rect in items:
+            self.screen.blit(surface, rect)
+            dirty.append(rect)
+        self.dynamic_items = items
+
+        if full_redraw:
+            pygame.display.flip() # Actualiza la pantalla completa
+            if self.start_time is not None:
+                # Primer fotograma en pantalla: se informa del tiempo de arranque (una sola vez).
+                print(f"First frame after {(time.perf_counter() - self.start_time) * 1000:.0f} ms")
+                self.start_time = None
+        else:
+            pygame.display.update(dirty) # Solo las zonas que cambiaron
+
+    def wait_events(self, timeout=0):
+        """
+        Espera (bloqueando, sin gastar CPU) hasta que llegue un evento y después devuelve,
+        uno a uno, todos los que estén en la cola.
+
+        Si el llamador deja de iterar (por ejemplo, al devolver un movimiento), los eventos
+        restantes siguen en la cola de Pygame para la próxima vez.
 
-        pygame.display.flip() # Actualiza la pantalla completa para mostrar todo lo dibujado
+        Args:
+            timeout (int): Espera máxima en milisegundos (0 = sin límite).
+        """
+        event = pygame.event.wait(timeout) # Duerme hasta el próximo evento (libera la CPU y el GIL)
+        while event.type != pygame.NOEVENT:
+            yield event
+            event = pygame.event.poll() # Resto de eventos ya en la cola, sin esperar
 
     def get_square_from_coords(self, x, y):
         """
@@ -265,10 +467,11 @@ class ChessGUI:
         self.board = chess.Board("8/8/8/8/8/8/8/8 w - - 0 1") 
         self.setup_mode = True # Establece el modo de configuración a verdadero
         
-        # Bucle principal de la fase de configuración
+        # Bucle principal de la fase de configuración. Nada se anima durante la configuración,
+        # así que el bucle duerme hasta que el usuario haga algo.
         while self.setup_mode:
             self.update_display() # Actualiza la pantalla para mostrar el tablero y los mensajes de setup
-            for event in pygame.event.get(): # Procesa los eventos de Pygame
+            for event in self.wait_events(): # Espera y procesa los eventos de Pygame
                 if event.type == pygame.QUIT: # Si el usuario cierra la ventana
                     pygame.quit() # Cierra Pygame
                     exit() # Sale del programa
@@ -291,7 +494,6 @@ class ChessGUI:
                             self.update_display() # Actualiza la pantalla con el mensaje
                             pygame.time.wait(1500) # Espera 1.5 segundos para que el usuario lea el mensaje
                             self.update_setup_message() # Vuelve al mensaje de colocación de piezas
-            pygame.time.Clock().tick(60) # Limita la velocidad de fotogramas a 60 FPS
         
         return self.board # Devuelve el tablero configurado para el juego
 
@@ -301,7 +503,8 @@ class ChessGUI:
         Espera y devuelve un movimiento válido del usuario (Negras) durante el juego.
         """
         while True: # Bucle infinito hasta que se obtiene un movimiento válido o se sale
-            for event in pygame.event.get(): # Procesa los eventos de Pygame
+            self.update_display() # Muestra la selección y la pieza arrastrada (solo redibuja lo que cambió)
+            for event in self.wait_events(): # Duerme hasta que el usuario haga algo
                 if event.type == pygame.QUIT: # Si el usuario cierra la ventana
                     pygame.quit()
                     exit()
@@ -311,14 +514,11 @@ class ChessGUI:
                     move = self.handle_mouse_up(event) # Intenta hacer el movimiento
                     if move: # Si el movimiento es válido, lo devuelve
                         return move
-                elif event.type == pygame.MOUSEMOTION and self.dragging_piece: # Si el mouse se mueve y hay una pieza arrastrándose
-                    self.update_display() # Actualiza la pantalla para mostrar la pieza arrastrándose
-            pygame.time.Clock().tick(60) # Limita la velocidad de fotogramas
 
     def handle_mouse_down(self, event):
         """
         Maneja los eventos de clic del mouse hacia abajo durante el modo de juego.
-        Selecciona la pieza a arrastrar si es del color correcto.
+        Selecciona la pieza a arrastrar si es del color correcto y tiene algún movimiento legal.
         """
         if self.setup_mode: return # No hace nada si todavía está en modo de configuración
 
@@ -326,8 +526,8 @@ class ChessGUI:
         clicked_square = self.get_square_from_coords(mouse_x, mouse_y) # Casilla clicada
         piece_at_square = self.board.piece_at(clicked_square) # Pieza en la casilla clicada
 
-        # Si hay una pieza y es del color del turno actual (Negras para el usuario)
-        if piece_at_square and piece_at_square.color == self.board.turn: 
+        # Si hay una pieza del color del turno actual (Negras para el usuario) que puede moverse
+        if piece_at_square and clicked_square in self.legal_move_index(): 
             self.selected_square = clicked_square # Guarda la casilla seleccionada
             self.dragging_piece = piece_at_square # Guarda la pieza que se arrastrará
             # Calcula el offset para que la pieza se arrastre desde el punto exacto donde se hizo clic
@@ -352,13 +552,15 @@ class ChessGUI:
         mouse_x, mouse_y = event.pos # Posición X, Y del mouse al soltar
         target_square = self.get_square_from_coords(mouse_x, mouse_y) # Casilla de destino
 
-        move = chess.Move(self.selected_square, target_square) # Crea un objeto de movimiento
+        # Movimiento legal de la casilla seleccionada a la de destino (None si no lo hay);
+        # si es una coronación, el índice ya guarda la de Dama.
+        move = self.legal_move_index().get(self.selected_square, {}).get(target_square)
 
         self.selected_square = None # Deselecciona la casilla
         self.dragging_piece = None # Deja de arrastrar la pieza
         self.update_display() # Actualiza la pantalla para limpiar los resaltados
 
-        if move in self.board.legal_moves: # Si el movimiento es legal
+        if move is not None: # Si el movimiento es legal
             return move # Devuelve el movimiento
         else:
             print("Illegal move. Please try again.") # Mensaje si el movimiento es ilegal
@@ -368,10 +570,9 @@ class ChessGUI:
         """
         Muestra una pantalla de fin de juego con un mensaje.
         """
-        # Crea una superficie semi-transparente para oscurecer el tablero
-        s = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 128)) # Negro semi-transparente
-        self.screen.blit(s, (0,0)) # Dibuja la superficie sobre el tablero
+        # Oscurece el tablero con una superficie semi-transparente
+        self.screen.blit(self.get_overlay(128), (0, 0))
+        self.frame_state = None # La pantalla ya no coincide con el fotograma guardado
 
         # Dibuja el mensaje de fin de juego y las instrucciones para salir
         self.draw_text(message, self.width // 2, self.height // 2, color=(255, 0, 0))
@@ -380,7 +581,7 @@ class ChessGUI:
 
         waiting = True # Bucle para esperar una pulsación de tecla antes de salir
         while waiting:
-            for event in pygame.event.get():
+            for event in self.wait_events(): # Duerme hasta el próximo evento
                 if event.type == pygame.QUIT: # Si el usuario cierra la ventana
                     pygame.quit()
                     exit()
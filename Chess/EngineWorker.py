@@ -0,0 +1,223 @@
+import math # Importa el módulo math para usar 'inf' (infinito)
+import threading # Importa threading para poder cancelar la búsqueda desde el hilo principal
+from concurrent.futures import Future, ThreadPoolExecutor # Importa el ejecutor que corre la búsqueda en segundo plano
+from Heuristic import is_mate_score, mate_in_plies # Importa la detección de puntuaciones de mate
+from KRRKBoard import KRRKBoard # Importa el tablero compacto para pensar por adelantado sobre él
+from LadderMate import ladder_move # Importa la regla del mate de la escalera (responde sin buscar)
+from Minimax import find_best_move, negamax, aspiration_search, SearchContext, SearchTimeout # Importa la búsqueda y su estado
+from Tablebase import get_tablebase # Importa la tabla de finales (si la hay, no hace falta pensar por adelantado)
+from TranspositionTable import TranspositionTable, position_key # Importa la tabla de transposición que se conserva entre turnos
+
+
+class SearchHandle:
+    """
+    Búsqueda en curso en segundo plano: permite consultar si terminó, obtener el
+    movimiento y cancelarla.
+    """
+
+    def __init__(self, future, stop_event):
+        self.future = future # concurrent.futures.Future con el movimiento resultante
+        self.stop_event = stop_event # Evento que detiene la búsqueda al activarse
+
+    def done(self):
+        """
+        True si la búsqueda ya terminó (no bloquea).
+        """
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """
+        Devuelve el movimiento encontrado (espera si la búsqueda aún no terminó).
+
+        Returns:
+            chess.Move o None: El mejor movimiento, o None si la búsqueda se canceló
+                               antes de tener ninguno.
+        """
+        return self.future.result(timeout)
+
+    def cancel(self):
+        """
+        Pide a la búsqueda que se detenga lo antes posible.
+        """
+        self.stop_event.set()
+
+
+class EngineWorker:
+    """
+    Ejecuta find_best_move en un hilo aparte, para que el bucle de eventos de Pygame
+    siga respondiendo mientras la IA piensa.
+
+    La tabla de transposición vive en el trabajador y se conserva entre los turnos
+    de la misma partida.
+
+    Durante el turno del usuario, el trabajador puede pensar por adelantado ("ponder"):
+    busca la respuesta de Blancas a cada posible jugada de Negras, empezando por las más
+    probables. Si el usuario juega una de las jugadas ya analizadas a la profundidad
+    máxima, la respuesta sale directamente de ese trabajo; si no, la búsqueda normal
+    aprovecha la tabla de transposición ya llena.
+    """
+
+    def __init__(self, depth, time_limit=None, tt_size_mb=64, compact=False, cache=None, use_ladder=False):
+        """
+        Args:
+            depth (int): Profundidad máxima de búsqueda.
+            time_limit (float, opcional): Tiempo máximo de búsqueda por movimiento, en segundos.
+            tt_size_mb (float): Presupuesto de memoria de la tabla de transposición.
+            compact (bool): Si es True, las posiciones KRRK se buscan sobre un KRRKBoard.
+            cache (SearchCache, opcional): Caché persistente en disco que se consulta antes
+                                           de cada búsqueda (la cierra el llamador).
+            use_ladder (bool): Si es True, las posiciones de dos Torres contra Rey se juegan
+                               con la regla del mate de la escalera cuando se puede aplicar.
+        """
+        self.depth = depth
+        self.time_limit = time_limit
+        self.compact = compact
+        self.cache = cache
+        self.use_ladder = use_ladder
+        self.tt = TranspositionTable(tt_size_mb)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine")
+        self.current = None # Búsqueda en curso (SearchHandle) o None
+
+        # --- Estado del Pensamiento por Adelantado (Ponder) ---
+        self.pondering = None # Ponder en curso (SearchHandle) o None
+        self.ponder_results = {} # Clave de la posición tras la jugada de Negras -> (profundidad, movimiento)
+        self.pondered = False # True si se pensó por adelantado en el turno del usuario actual
+        self.ponder_hits = 0 # Turnos cuya respuesta salió directamente del ponder
+        self.ponder_misses = 0 # Turnos en los que el ponder no tenía la respuesta completa
+
+    def search(self, board):
+        """
+        Lanza la búsqueda del mejor movimiento en segundo plano.
+
+        Args:
+            board (chess.Board): Posición a analizar. Se copia, así que el llamador puede
+                                 seguir usando (y dibujando) el tablero original.
+
+        Returns:
+            SearchHandle: Manejador de la búsqueda lanzada.
+        """
+        self.stop_pondering()
+        stop_event = threading.Event()
+
+        # --- Respuesta Ya Calculada por el Ponder ---
+        if self.pondered:
+            self.pondered = False
+            result = self.ponder_results.get(position_key(board))
+            if result is not None and result[0] >= self.depth:
+                self.ponder_hits += 1
+                future = Future()
+                future.set_result(result[1]) # Búsqueda ya resuelta: no hay que esperar
+                self.current = SearchHandle(future, stop_event)
+                return self.current
+            self.ponder_misses += 1
+
+        future = self.executor.submit(self._run, board.copy(), stop_event)
+        self.current = SearchHandle(future, stop_event)
+        return self.current
+
+    def _run(self, board, stop_event):
+        # Cuerpo de la búsqueda, en el hilo del trabajador
+        context = SearchContext(self.tt, stop_event=stop_event)
+        try:
+            return find_best_move(board, self.depth, time_limit=self.time_limit, context=context,
+                                  compact=self.compact, cache=self.cache, use_ladder=self.use_ladder)
+        except SearchTimeout:
+            return None # Cancelada antes de completar ninguna profundidad
+
+    def ponder(self, board):
+        """
+        Empieza a pensar por adelantado durante el turno del usuario.
+
+        Args:
+            board (chess.Board): Posición con el usuario (Negras) al turno. Se copia.
+
+        Returns:
+            SearchHandle: Manejador del ponder lanzado.
+        """
+        self.stop_pondering()
+        stop_event = threading.Event()
+        self.ponder_results = {}
+        self.pondered = True
+        future = self.executor.submit(self._ponder, board.copy(), stop_event)
+        self.pondering = SearchHandle(future, stop_event)
+        return self.pondering
+
+    def _ponder(self, board, stop_event):
+        # Cuerpo del ponder, en el hilo del trabajador
+        tablebase = get_tablebase()
+        if tablebase is not None and tablebase.best_move(board) is not None:
+            return # La tabla de finales responde al instante: no hace falta pensar por adelantado
+        # Las respuestas que resuelve la regla de la escalera se anotan ya, sin buscarlas.
+        covered = set()
+        if self.use_ladder:
+            for reply in board.legal_moves:
+                board.push(reply)
+                move = ladder_move(board)
+                if move is not None:
+                    self.ponder_results[position_key(board)] = (self.depth, move)
+                    covered.add(reply)
+                board.pop()
+        if self.compact and KRRKBoard.supports(board):
+            board = KRRKBoard.from_board(board) # Misma clave Zobrist: los resultados siguen sirviendo
+
+        context = SearchContext(self.tt, stop_event=stop_event)
+        self.tt.new_search()
+        try:
+            # Jugadas más probables primero: las que dejan a Blancas la peor puntuación a profundidad 1.
+            replies = []
+            for reply in board.legal_moves:
+                if reply in covered:
+                    continue
+                board.push(reply)
+                score, _ = negamax(board, 1, -math.inf, math.inf, context)
+                board.pop()
+                replies.append((score, len(replies), reply))
+            replies = [reply for _, _, reply in sorted(replies)]
+
+            # Profundización iterativa repartida entre todas las respuestas: todas llegan a la
+            # profundidad d antes de que ninguna empiece la d + 1.
+            scores = {}
+            solved = set() # Respuestas con un mate demostrado: profundizar no las cambia
+            for depth in range(1, self.depth + 1):
+                for reply in replies:
+                    if reply in solved:
+                        continue
+                    board.push(reply)
+                    score, move = aspiration_search(board, depth, scores.get(reply), context)
+                    if move is not None:
+                        scores[reply] = score
+                        searched = depth
+                        if is_mate_score(score) and abs(mate_in_plies(score)) <= depth:
+                            solved.add(reply)
+                            searched = self.depth # Equivale a haberla buscado a la profundidad máxima
+                        self.ponder_results[position_key(board)] = (searched, move)
+                    board.pop()
+        except SearchTimeout:
+            pass # El usuario ya movió: el tablero es una copia, no hace falta restaurarlo
+
+    def stop_pondering(self):
+        """
+        Detiene el ponder en curso (si lo hay) y espera a que el hilo quede libre.
+        """
+        if self.pondering is not None:
+            self.pondering.cancel()
+            self.pondering.result()
+            self.pondering = None
+
+    def ponder_stats(self):
+        """
+        Resumen legible de la tasa de aciertos del ponder (para imprimir en consola).
+        """
+        total = self.ponder_hits + self.ponder_misses
+        rate = self.ponder_hits / total if total else 0.0
+        return f"Ponder: {self.ponder_hits}/{total} hits ({rate:.1%})"
+
+    def shutdown(self):
+        """
+        Cancela la búsqueda en curso (si la hay) y detiene el hilo del trabajador.
+        """
+        if self.current is not None:
+            self.current.cancel()
+        if self.pondering is not None:
+            self.pondering.cancel()
+        self.executor.shutdown(wait=True)
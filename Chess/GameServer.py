@@ -0,0 +1,469 @@
+import argparse # Importa argparse para las opciones de la línea de comandos
+import asyncio # Importa asyncio para atender muchas partidas y conexiones a la vez en un solo hilo
+import collections # Importa collections para guardar las últimas latencias
+import itertools # Importa itertools para numerar las partidas
+import json # Importa json para el protocolo (un objeto JSON por línea)
+import multiprocessing # Importa multiprocessing para elegir cómo se crean los procesos trabajadores
+import os # Importa os para conocer el número de núcleos
+import random # Importa random para las jugadas de Negras del generador de carga
+import sys # Importa sys para el modo por entrada/salida estándar
+import time # Importa time para medir latencias y partidas por segundo
+from concurrent.futures import ProcessPoolExecutor # Importa el grupo de procesos que ejecuta las búsquedas
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from Minimax import find_best_move, SearchContext # Importa la búsqueda
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición de cada proceso
+
+# --- Servidor de Partidas ---
+# Mantiene muchas partidas a la vez (la IA juega con Blancas, el cliente con Negras, como en
+# Chess.py) sin interfaz gráfica. El protocolo es un objeto JSON por línea, por un socket TCP
+# local o por la entrada/salida estándar:
+#     {"op": "new", "fen": "..."}                 -> crea una partida (si mueven Blancas, la IA responde)
+#     {"op": "move", "game": 1, "move": "d6e6"}   -> jugada de Negras y respuesta de la IA
+#     {"op": "go", "game": 1}                     -> vuelve a pedir la jugada de la IA (tras un timeout)
+#     {"op": "state", "game": 1} / {"op": "close", "game": 1} / {"op": "stats"}
+# Cada respuesta repite el campo "id" de la petición (si lo tiene), porque las respuestas de
+# una misma conexión pueden llegar en otro orden.
+#
+# Las búsquedas se ejecutan en un grupo de procesos acotado: nunca hay más de 'max_pending'
+# búsquedas pendientes; las demás esperan, y cada conexión deja de leer peticiones cuando
+# tiene demasiadas en curso (contrapresión hasta el cliente).
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DEPTH = 4 # Profundidad máxima de la IA
+DEFAULT_MOVE_TIME = 1.0 # Tiempo máximo de búsqueda por jugada de la IA, en segundos
+DEFAULT_REQUEST_TIMEOUT = 10.0 # Tiempo máximo (cola + búsqueda) de una jugada de la IA
+PENDING_PER_WORKER = 4 # Búsquedas pendientes por proceso antes de hacer esperar a las siguientes
+MAX_REQUESTS_PER_CONNECTION = 64 # Peticiones en curso por conexión antes de dejar de leerla
+LATENCY_SAMPLES = 10000 # Número de latencias recientes que se guardan para los percentiles
+WORKER_TT_SIZE_MB = 16 # Tabla de transposición de cada proceso
+
+# --- Estado de Cada Proceso Trabajador ---
+_tt = None # Tabla de transposición del proceso (compartida por las partidas que atiende)
+
+
+def _init_worker():
+    """
+    Inicializa un proceso trabajador (se ejecuta una vez al crear el proceso).
+    """
+    global _tt
+    _tt = TranspositionTable(WORKER_TT_SIZE_MB)
+
+
+def engine_move(board, depth, time_limit):
+    """
+    Calcula la jugada de la IA (en un proceso trabajador).
+
+    Args:
+        board (chess.Board): La partida, con su historial (para detectar repeticiones).
+        depth (int): Profundidad máxima.
+        time_limit (float): Tiempo máximo de búsqueda, en segundos.
+
+    Returns:
+        tuple: (movimiento en notación UCI o None, nodos visitados).
+    """
+    tt = _tt if _tt is not None else TranspositionTable(WORKER_TT_SIZE_MB)
+    context = SearchContext(tt)
+    move = find_best_move(board, depth, time_limit=time_limit, context=context, compact=True)
+    return (move.uci() if move else None), context.nodes
+
+
+def resolve_move(board, text):
+    """
+    Valida una jugada del cliente como ChessGUI.handle_mouse_up: basta con las casillas de
+    origen y destino; si es una coronación sin pieza indicada, se corona a Dama.
+
+    Args:
+        board (chess.Board): La partida.
+        text (str): La jugada en notación UCI (por ejemplo, "d6e6" o "a2a1q").
+
+    Returns:
+        chess.Move o None: La jugada legal, o None si no lo es (o no se entiende).
+    """
+    try:
+        move = chess.Move.from_uci(text)
+    except (ValueError, TypeError):
+        return None
+    if board.is_legal(move):
+        return move
+    if move.promotion is None:
+        promotion = chess.Move(move.from_square, move.to_square, chess.QUEEN)
+        if board.is_legal(promotion):
+            return promotion
+    return None
+
+
+def game_status(board):
+    """
+    Estado de la partida: "ongoing", o el motivo por el que terminó y el resultado.
+    """
+    outcome = board.outcome()
+    if outcome is None:
+        return {"status": "ongoing"}
+    return {"status": outcome.termination.name.lower(), "result": outcome.result()}
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """
+    Percentiles (por el método del rango más cercano) de una lista de latencias, en milisegundos.
+    """
+    if not samples:
+        return {f"p{point}": None for point in points}
+    ordered = sorted(samples)
+    return {f"p{point}": ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))] * 1000
+            for point in points}
+
+
+class Game:
+    """
+    Una partida en curso: el tablero y un cerrojo para no atender dos peticiones a la vez.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.lock = asyncio.Lock()
+        self.finished = False # Si ya se contó como terminada en las estadísticas
+
+
+class GameServer:
+    """
+    Servidor de partidas: guarda el estado de cada partida y reparte las búsquedas entre
+    los procesos del grupo.
+    """
+
+    def __init__(self, workers=None, depth=DEFAULT_DEPTH, move_time=DEFAULT_MOVE_TIME,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT, max_pending=None):
+        """
+        Args:
+            workers (int, opcional): Número de procesos. Por defecto, uno por núcleo.
+            depth (int): Profundidad máxima de la IA.
+            move_time (float): Tiempo máximo de búsqueda por jugada, en segundos.
+            request_timeout (float): Tiempo máximo de espera (cola + búsqueda) por jugada.
+            max_pending (int, opcional): Máximo de búsquedas enviadas al grupo a la vez.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.depth = depth
+        self.move_time = move_time
+        self.request_timeout = request_timeout
+        # Los procesos se crean con 'spawn': el grupo los arranca bajo demanda, ya con conexiones
+        # abiertas, y con 'fork' heredarían sus sockets (y un cierre nunca llegaría al cliente).
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_worker)
+        self.pending = asyncio.Semaphore(max_pending or self.workers * PENDING_PER_WORKER)
+        self.games = {} # Identificador -> Game
+        self.next_id = itertools.count(1)
+        # --- Estadísticas ---
+        self.started = time.perf_counter()
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES) # Latencia de cada jugada de la IA (segundos)
+        self.engine_moves = 0
+        self.timeouts = 0
+        self.games_finished = 0
+        self.connections = set() # Tareas de las conexiones abiertas
+
+    async def ai_move(self, game):
+        """
+        Pide la jugada de la IA al grupo de procesos y la aplica.
+
+        Returns:
+            dict: Campos de la respuesta ("ai_move", o "error" si se agotó el tiempo).
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        def finished(future):
+            # El turno en el grupo se libera cuando el proceso termina de verdad, no cuando se
+            # agota la espera: una búsqueda abandonada sigue ocupando su proceso hasta el final.
+            self.pending.release()
+            if not future.cancelled():
+                future.exception() # Un error de una búsqueda abandonada no queda sin leer
+
+        async def search():
+            await self.pending.acquire() # Espera turno si ya hay demasiadas búsquedas en el grupo
+            try:
+                future = loop.run_in_executor(self.pool, engine_move, game.board.copy(), self.depth, self.move_time)
+            except BaseException:
+                self.pending.release()
+                raise
+            future.add_done_callback(finished)
+            return await asyncio.shield(future) # El timeout deja de esperar, pero no cancela el proceso
+
+        try:
+            move, nodes = await asyncio.wait_for(search(), self.request_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return {"error": "engine timeout"} # La partida sigue esperando la jugada de la IA ("go")
+        self.latencies.append(time.perf_counter() - start)
+        self.engine_moves += 1
+        if move is None:
+            return {"ai_move": None}
+        game.board.push_uci(move)
+        return {"ai_move": move, "nodes": nodes}
+
+    async def handle_request(self, request):
+        """
+        Atiende una petición del protocolo.
+
+        Args:
+            request (dict): La petición ya decodificada.
+
+        Returns:
+            dict: La respuesta.
+        """
+        op = request.get("op")
+        if op == "stats":
+            return {"ok": True, **self.stats()}
+        if op not in ("new", "move", "go", "state", "close"):
+            return {"ok": False, "error": f"unknown op: {op}"}
+        if op == "new":
+            try:
+                board = chess.Board(request.get("fen", chess.STARTING_FEN))
+            except ValueError as e:
+                return {"ok": False, "error": f"invalid fen: {e}"}
+            if not board.is_valid():
+                return {"ok": False, "error": "illegal position"}
+            game_id = next(self.next_id)
+            game = self.games[game_id] = Game(board)
+        else:
+            game_id = request.get("game")
+            game = self.games.get(game_id)
+            if game is None:
+                return {"ok": False, "error": "unknown game"}
+
+        async with game.lock:
+            # Mientras se esperaba el turno, otra petición pudo cerrar la partida.
+            if self.games.get(game_id) is not game:
+                return {"ok": False, "error": "unknown game"}
+            board = game.board
+            response = {"ok": True, "game": game_id}
+            if op == "close":
+                del self.games[game_id]
+                return response
+            if op == "move":
+                if board.is_game_over() or board.turn != chess.BLACK:
+                    return {"ok": False, "game": game_id, "error": "not your turn"}
+                move = resolve_move(board, request.get("move"))
+                if move is None:
+                    return {"ok": False, "game": game_id, "error": "illegal move"}
+                board.push(move)
+                response["move"] = move.uci()
+
+            # La IA (Blancas) responde si le toca y la partida no terminó.
+            if op != "state" and board.turn == chess.WHITE and not board.is_game_over():
+                response.update(await self.ai_move(game))
+                if "error" in response:
+                    response["ok"] = False
+            response.update(game_status(board))
+            response["fen"] = board.fen()
+            if response["status"] != "ongoing" and not game.finished:
+                game.finished = True
+                self.games_finished += 1
+            return response
+
+    def stats(self):
+        """
+        Estadísticas del servidor: partidas, jugadas de la IA y percentiles de latencia.
+        """
+        elapsed = time.perf_counter() - self.started
+        return {"games_open": len(self.games), "games_finished": self.games_finished,
+                "games_per_second": self.games_finished / elapsed if elapsed else 0.0,
+                "engine_moves": self.engine_moves, "timeouts": self.timeouts,
+                "latency_ms": percentiles(list(self.latencies)), "workers": self.workers}
+
+    async def serve_connection(self, reader, writer):
+        """
+        Atiende una conexión: lee peticiones línea a línea y responde a cada una en cuanto
+        termina (varias peticiones de la misma conexión se atienden a la vez).
+        """
+        slots = asyncio.Semaphore(MAX_REQUESTS_PER_CONNECTION)
+        tasks = set()
+        connection = asyncio.current_task()
+        self.connections.add(connection)
+
+        async def respond(line):
+            try:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = {"ok": False, "error": f"invalid request: {e}"}
+                else:
+                    try:
+                        response = await self.handle_request(request)
+                    except Exception as e: # Error del motor o del grupo de procesos: se responde igualmente
+                        response = {"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+                    if "id" in request:
+                        response["id"] = request["id"]
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain() # Si el cliente no lee, se deja de escribir (y de leer)
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                await slots.acquire() # Contrapresión: con demasiadas peticiones en curso, no se lee más
+                line = await reader.readline()
+                if not line:
+                    slots.release()
+                    break
+                if not line.strip():
+                    slots.release()
+                    continue
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+            self.connections.discard(connection)
+
+    async def wait_idle(self):
+        """
+        Espera a que se cierren todas las conexiones abiertas.
+        """
+        while self.connections:
+            await asyncio.gather(*self.connections, return_exceptions=True)
+
+    def close(self):
+        """
+        Detiene los procesos trabajadores.
+        """
+        self.pool.shutdown(cancel_futures=True)
+
+
+class StdioStream:
+    """
+    Adapta la entrada y salida estándar a la interfaz de lectura y escritura de asyncio que usa
+    serve_connection (readline / write / drain / close). La entrada se lee en un hilo, así que
+    funciona igual con tuberías, terminales o archivos redirigidos.
+    """
+
+    def __init__(self, input=sys.stdin, output=sys.stdout):
+        self.input = input.buffer
+        self.output = output.buffer
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self.input.readline)
+
+    def write(self, data):
+        self.output.write(data)
+
+    async def drain(self):
+        self.output.flush()
+
+    def close(self):
+        self.output.flush()
+
+
+async def serve_stdio(server):
+    """
+    Atiende el protocolo por la entrada y salida estándar (una única conexión).
+    """
+    stream = StdioStream()
+    await server.serve_connection(stream, stream)
+
+
+# --- Generador de Carga Sintética ---
+
+async def _client_games(host, port, fens, latencies, max_plies, rng):
+    # Un cliente: juega sus partidas una tras otra por su propia conexión (Negras al azar)
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(message):
+        start = time.perf_counter()
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        return response
+
+    finished = 0
+    for fen in fens:
+        response = await request({"op": "new", "fen": fen})
+        game_id = response["game"]
+        board = chess.Board(response["fen"])
+        plies = 0
+        while response.get("status") == "ongoing" and plies < max_plies:
+            if board.turn == chess.WHITE: # Timeout de la IA: se vuelve a pedir su jugada
+                response = await request({"op": "go", "game": game_id})
+            else:
+                move = rng.choice(list(board.legal_moves))
+                response = await request({"op": "move", "game": game_id, "move": move.uci()})
+            if "fen" in response:
+                board = chess.Board(response["fen"])
+            plies += 1
+        finished += response.get("status") != "ongoing"
+        await request({"op": "close", "game": game_id})
+    writer.close()
+    await writer.wait_closed()
+    return finished
+
+
+async def run_load_test(games=20, concurrency=4, workers=None, depth=DEFAULT_DEPTH, move_time=DEFAULT_MOVE_TIME,
+                        max_plies=200, seed=2024):
+    """
+    Arranca un servidor local y lo somete a carga: 'concurrency' clientes juegan en total
+    'games' partidas KRRK (del corpus de Benchmark), con Negras moviendo al azar.
+
+    Returns:
+        dict: Partidas por segundo, percentiles de latencia vistos por los clientes y
+              estadísticas del servidor.
+    """
+    from Benchmark import krrk_corpus # Solo el generador de carga necesita el corpus
+
+    server = GameServer(workers, depth, move_time)
+    listener = await asyncio.start_server(server.serve_connection, DEFAULT_HOST, 0)
+    port = listener.sockets[0].getsockname()[1]
+    fens = krrk_corpus(games, seed)
+    latencies = []
+    start = time.perf_counter()
+    try:
+        finished = await asyncio.gather(*[
+            _client_games(DEFAULT_HOST, port, fens[client::concurrency], latencies, max_plies, random.Random(seed + client))
+            for client in range(concurrency)])
+        elapsed = time.perf_counter() - start
+        return {"games": games, "finished": sum(finished), "concurrency": concurrency, "time": elapsed,
+                "games_per_second": games / elapsed, "requests": len(latencies),
+                "client_latency_ms": percentiles(latencies), "server": server.stats()}
+    finally:
+        listener.close()
+        await server.wait_idle()
+        server.close()
+
+
+async def main(args):
+    if args.load_test:
+        report = await run_load_test(args.load_test, args.concurrency, args.workers, args.depth, args.move_time)
+        print(json.dumps(report, indent=2))
+        return
+
+    server = GameServer(args.workers, args.depth, args.move_time, args.timeout, args.max_pending)
+    try:
+        if args.stdio:
+            await serve_stdio(server)
+        else:
+            listener = await asyncio.start_server(server.serve_connection, args.host, args.port)
+            print(f"Serving on {args.host}:{args.port} with {server.workers} workers", file=sys.stderr)
+            async with listener:
+                await listener.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless multi-game server for the chess engine (JSON lines).")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--stdio", action="store_true", help="serve a single session over stdin/stdout instead of TCP")
+    parser.add_argument("--workers", type=int, help="number of engine processes")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="engine search depth")
+    parser.add_argument("--move-time", type=float, default=DEFAULT_MOVE_TIME, help="engine time per move, in seconds")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_REQUEST_TIMEOUT, help="timeout per engine move (queue + search)")
+    parser.add_argument("--max-pending", type=int, help="maximum engine searches queued in the pool")
+    parser.add_argument("--load-test", type=int, metavar="GAMES", help="run a synthetic load test with this many games and exit")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent clients in the load test")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
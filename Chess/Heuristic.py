@@ -1,5 +1,6 @@
 import chess # Importa la librería python-chess para la lógica del ajedrez
 import math # Importa el módulo math para usar 'inf' (infinito)
+import numbers # Importa numbers para distinguir valores numéricos de tableros en evaluate_batch
 
 # --- Constantes de Puntuación ---
 # Se utiliza un valor muy alto para el jaque mate para que la IA siempre lo priorice.
@@ -7,45 +8,99 @@ CHECKMATE_SCORE = 1000000
 # La puntuación para un ahogado (stalemate) o un empate por material insuficiente o repetición.
 # Un valor de 0 indica que es un resultado neutral, ni bueno ni malo (un empate).
 STALEMATE_SCORE = 0
+# En la búsqueda, el jaque mate se puntúa según su distancia a la raíz: CHECKMATE_SCORE - ply.
+# Así un mate más cercano vale más que uno lejano. Cualquier puntuación con valor absoluto
+# igual o mayor que MATE_THRESHOLD indica un mate forzado.
+MAX_MATE_PLY = 1000 # Distancia máxima (en medias jugadas) que puede representar una puntuación de mate
+MATE_THRESHOLD = CHECKMATE_SCORE - MAX_MATE_PLY
+# Términos de pares de piezas (ver king_pair_score y rook_safety_score).
+KING_OPPOSITION_BONUS = 5 # Reyes en oposición
+ROOK_SAFETY_PENALTY = 40 # Torre Blanca adyacente al Rey Negro (puede ser capturada)
 
-def evaluate_board(board):
+# --- Clasificación de Posiciones Terminales ---
+# Resultado de classify_terminal(): se calcula una sola vez por nodo y se pasa a evaluate_board.
+NOT_TERMINAL = 0 # La partida continúa
+CHECKMATE = 1 # El jugador al turno está en jaque mate
+STALEMATE = 2 # El jugador al turno no tiene movimientos legales y no está en jaque (ahogado)
+DRAW = 3 # Tablas por material insuficiente, repetición o regla de los 75 movimientos
+# Número de apariciones de una posición a partir del cual se considera tablas por repetición.
+REPETITION_LIMIT = 3
+# Medias jugadas sin capturas ni movimientos de peón que declaran tablas automáticamente (75 movimientos).
+SEVENTYFIVE_MOVES_PLIES = 150
+
+def classify_terminal(board, moves=None, repetitions=None):
     """
-    Evalúa la posición actual del tablero desde la perspectiva de las piezas Blancas.
-    
-    Valores positivos altos son buenos para Blancas (buscando ganar).
-    Valores negativos altos son buenos para Negras (buscando evitar la derrota, lo que es malo para Blancas).
-    
+    Clasifica la posición en una sola pasada: jaque mate, ahogado, tablas o partida en curso.
+
+    Sustituye a las llamadas sueltas a is_game_over(), is_checkmate(), is_stalemate(),
+    is_insufficient_material() e is_repetition(), cada una de las cuales vuelve a generar
+    los movimientos legales o a recorrer el historial de la partida.
+
     Args:
         board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
-        
+        moves (list, opcional): Movimientos legales ya generados por el llamador. Si no se
+                                indican, solo se comprueba si existe alguno (basta con generar
+                                el primero).
+        repetitions (int, opcional): Veces que ha aparecido la posición (contando la actual),
+                                     según el contador que mantiene la búsqueda. Si no se
+                                     indica, se recurre a board.is_repetition().
+
     Returns:
-        int: La puntuación de la posición.
+        int: NOT_TERMINAL, CHECKMATE, STALEMATE o DRAW.
     """
-    # --- Casos Base de Evaluación (Fin del Juego) ---
-    # Si el juego ha terminado en jaque mate
-    if board.is_checkmate():
-        # Si es el turno de NEGRAS y el tablero está en jaque mate, significa que BLANCAS
-        # acaba de hacer el jaque mate, lo cual es una victoria para BLANCAS.
-        return CHECKMATE_SCORE
-        # Si es el turno de BLANCAS y el tablero está en jaque mate, significa que NEGRAS
-        # acaba de hacer el jaque mate, lo cual es una victoria para NEGRAS (y una derrota para BLANCAS).
-        # Esto no debería ocurrir si la IA de Blancas juega correctamente.
-    elif board.is_stalemate() or board.is_insufficient_material() or board.is_repetition():
-        # Si el juego es un ahogado (stalemate), o hay material insuficiente para dar jaque mate,
-        # o hay una repetición de movimientos (tres veces la misma posición).
-        # En estos casos, el juego es un empate, por lo que se devuelve una puntuación neutral.
-        return STALEMATE_SCORE
+    # --- Sin Movimientos Legales: Jaque Mate o Ahogado ---
+    has_moves = bool(moves) if moves is not None else any(board.generate_legal_moves())
+    if not has_moves:
+        return CHECKMATE if board.is_check() else STALEMATE
+
+    # --- Tablas ---
+    if board.is_insufficient_material(): # Solo operaciones sobre bitboards, sin generar movimientos
+        return DRAW
+    if repetitions is None:
+        repeated = board.is_repetition(REPETITION_LIMIT)
+    else:
+        repeated = repetitions >= REPETITION_LIMIT
+    if repeated or board.halfmove_clock >= SEVENTYFIVE_MOVES_PLIES:
+        return DRAW
+    return NOT_TERMINAL
+
+def mate_score(ply):
+    """
+    Puntuación, para el jugador que da el mate, de un jaque mate a 'ply' medias jugadas de la raíz.
+    """
+    return CHECKMATE_SCORE - ply
+
+def is_mate_score(score):
+    """
+    True si la puntuación (de cualquier signo) corresponde a un mate forzado.
+    """
+    return abs(score) >= MATE_THRESHOLD
+
+def mate_in_plies(score):
+    """
+    Número de medias jugadas hasta el mate que indica una puntuación de mate
+    (positiva si gana el jugador al turno, negativa si pierde).
+    """
+    plies = CHECKMATE_SCORE - abs(score)
+    return plies if score > 0 else -plies
 
+def king_square_score(black_king_square):
+    """
+    Puntuación heurística del Rey Negro en una casilla, desde la perspectiva de Blancas.
+
+    Solo depende de la casilla, así que se precalcula para las 64 casillas en
+    KING_SQUARE_SCORES, la tabla pieza-casilla del Rey Negro (ver PIECE_SQUARE_TABLES).
+
+    Args:
+        black_king_square (int): Casilla del Rey Negro (0-63).
+
+    Returns:
+        float: La puntuación de la casilla.
+    """
     # --- Heurística para el Final de Juego de Dos Torres y Rey vs. Rey Solo ---
     # El objetivo principal de esta heurística es incentivar a las Blancas a empujar
     # al Rey Negro hacia los bordes del tablero, donde es más fácil dar jaque mate.
 
-    # Obtiene la casilla donde se encuentra el Rey Negro.
-    black_king_square = board.king(chess.BLACK)
-    # Esta comprobación es una salvaguarda; en un estado de juego válido, el rey siempre debería existir.
-    if black_king_square is None: 
-        return STALEMATE_SCORE # Si por alguna razón no se encuentra el rey negro, se considera un empate.
-
     # Obtiene la fila (rank) y columna (file) del Rey Negro.
     rank = chess.square_rank(black_king_square) # Fila (0-7)
     file = chess.square_file(black_king_square) # Columna (0-7)
@@ -67,9 +122,301 @@ def evaluate_board(board):
     if rank == 0 or rank == 7 or file == 0 or file == 7:
         king_position_score += 50 # Bonificación significativa por estar en el borde
 
+    return king_position_score
+
+def king_pair_score(white_king, black_king):
+    """
+    Puntuación de la posición relativa de los dos reyes, desde la perspectiva de Blancas.
+
+    Bonifica la oposición (reyes en la misma fila o columna con una casilla entre ellos):
+    con una sola Torre, es la forma de obligar al Rey Negro a retroceder hacia el borde.
+
+    Args:
+        white_king (int): Casilla del Rey Blanco (0-63).
+        black_king (int): Casilla del Rey Negro (0-63).
+
+    Returns:
+        float: La puntuación del par de casillas.
+    """
+    file_distance = abs(chess.square_file(white_king) - chess.square_file(black_king))
+    rank_distance = abs(chess.square_rank(white_king) - chess.square_rank(black_king))
+    if sorted((file_distance, rank_distance)) == [0, 2]:
+        return KING_OPPOSITION_BONUS
+    return 0
+
+def rook_safety_score(rook, black_king):
+    """
+    Puntuación de una Torre Blanca según su seguridad frente al Rey Negro, desde la
+    perspectiva de Blancas: una Torre en una casilla adyacente al Rey Negro puede ser
+    capturada (perderla deja, como mucho, un final KRK mucho más largo).
+
+    Args:
+        rook (int): Casilla de la Torre Blanca (0-63).
+        black_king (int): Casilla del Rey Negro (0-63).
+
+    Returns:
+        float: La puntuación del par de casillas.
+    """
+    return -ROOK_SAFETY_PENALTY if chess.square_distance(rook, black_king) == 1 else 0
+
+# --- Tablas Precalculadas ---
+# Puntuación de la heurística para cada casilla del Rey Negro (índice = casilla).
+KING_SQUARE_SCORES = [king_square_score(square) for square in chess.SQUARES]
+# Tablas pieza-casilla (perspectiva de Blancas) de todas las piezas, indexadas por (tipo, color).
+# En este final solo la del Rey Negro tiene valores; el resto queda a cero para ampliarlas.
+PIECE_SQUARE_TABLES = {(piece_type, color): [0] * 64 for piece_type in chess.PIECE_TYPES for color in chess.COLORS}
+PIECE_SQUARE_TABLES[(chess.KING, chess.BLACK)] = KING_SQUARE_SCORES
+# Términos que dependen de dos piezas, indexados por casilla_1 * 64 + casilla_2.
+KING_PAIR_SCORES = [king_pair_score(white_king, black_king) for white_king in chess.SQUARES for black_king in chess.SQUARES]
+ROOK_SAFETY_SCORES = [rook_safety_score(rook, black_king) for rook in chess.SQUARES for black_king in chess.SQUARES]
+# Las mismas tablas pieza-casilla como listas anidadas (_TABLES[tipo][color]): más rápidas de indexar.
+_TABLES = [None] + [[PIECE_SQUARE_TABLES[(piece_type, chess.BLACK)], PIECE_SQUARE_TABLES[(piece_type, chess.WHITE)]]
+                    for piece_type in chess.PIECE_TYPES]
+
+def _pair_terms(white_king, black_king, white_rooks):
+    # Suma de los términos de pares de piezas (white_rooks es una máscara de bits)
+    if white_king is None or black_king is None:
+        return 0
+    score = KING_PAIR_SCORES[white_king * 64 + black_king]
+    for rook in chess.scan_forward(white_rooks):
+        score += ROOK_SAFETY_SCORES[rook * 64 + black_king]
+    return score
+
+def static_evaluation(board):
+    """
+    Calcula desde cero la parte posicional de la evaluación (tablas pieza-casilla más los
+    términos de pares de piezas), desde la perspectiva de Blancas. La búsqueda no la llama
+    en cada hoja: mantiene el mismo valor de forma incremental con EvaluationState.
+
+    Args:
+        board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+
+    Returns:
+        float: La puntuación de la posición (sin tener en cuenta el fin de la partida).
+    """
+    black_king = board.king(chess.BLACK)
+    # Esta comprobación es una salvaguarda; en un estado de juego válido, el rey siempre debería existir.
+    if black_king is None:
+        return STALEMATE_SCORE # Si por alguna razón no se encuentra el rey negro, se considera un empate.
+    score = 0
+    for square, piece in board.piece_map().items():
+        score += PIECE_SQUARE_TABLES[(piece.piece_type, piece.color)][square]
+    return score + _pair_terms(board.king(chess.WHITE), black_king, board.rooks & board.occupied_co[chess.WHITE])
+
+class EvaluationState:
+    """
+    Acumulador incremental de static_evaluation() para la búsqueda.
+
+    Se actualiza en cada movimiento que se hace (push) y se deshace (pop), así que una hoja
+    solo tiene que leer 'score'. Añadir términos a las tablas no encarece las hojas: solo
+    cambia el trabajo por movimiento, que es constante.
+    """
+
+    def __init__(self, board):
+        """
+        Args:
+            board (chess.Board): Posición inicial (la raíz de la búsqueda).
+        """
+        self.score = static_evaluation(board) # Valor de static_evaluation() de la posición actual
+        self.stack = [] # Valores anteriores de 'score', para deshacer los movimientos
+        # Sin alguno de los reyes (posiciones de prueba), los términos de pares no se pueden
+        # actualizar por diferencias: se recalcula todo, como hace static_evaluation. Los reyes
+        # no se capturan, así que basta con comprobarlo una vez en la raíz.
+        self.missing_king = board.king(chess.WHITE) is None or board.king(chess.BLACK) is None
+
+    def push(self, board, move):
+        """
+        Actualiza el acumulador con un movimiento. Se llama ANTES de board.push(move).
+
+        Args:
+            board (chess.Board): El tablero antes del movimiento.
+            move (chess.Move): El movimiento que se va a realizar.
+        """
+        self.stack.append(self.score)
+        if self.missing_king or board.castling_rights or board.ep_square is not None or move.promotion:
+            # Enroques, capturas al paso y coronaciones mueven, quitan o cambian una segunda
+            # pieza: son raras, así que se recalcula desde cero (igual que si falta un rey).
+            board.push(move)
+            self.score = static_evaluation(board)
+            board.pop()
+            return
+
+        from_square, to_square = move.from_square, move.to_square
+        color = board.turn
+        piece_type = board.piece_type_at(from_square)
+        captured = board.piece_type_at(to_square)
+        # --- Tablas Pieza-Casilla ---
+        table = _TABLES[piece_type][color]
+        delta = table[to_square] - table[from_square]
+        if captured:
+            delta -= _TABLES[captured][not color][to_square]
+
+        # --- Términos de Pares de Piezas ---
+        # Solo cambian los pares en los que interviene la pieza movida (o la Torre capturada).
+        if piece_type == chess.KING:
+            if color == chess.WHITE:
+                black_king = board.king(chess.BLACK)
+                delta += KING_PAIR_SCORES[to_square * 64 + black_king] - KING_PAIR_SCORES[from_square * 64 + black_king]
+            else:
+                white_king = board.king(chess.WHITE)
+                delta += KING_PAIR_SCORES[white_king * 64 + to_square] - KING_PAIR_SCORES[white_king * 64 + from_square]
+                for rook in chess.scan_forward(board.rooks & board.occupied_co[chess.WHITE]):
+                    if rook == to_square:
+                        delta -= ROOK_SAFETY_SCORES[rook * 64 + from_square] # Torre capturada por el Rey Negro
+                    else:
+                        delta += ROOK_SAFETY_SCORES[rook * 64 + to_square] - ROOK_SAFETY_SCORES[rook * 64 + from_square]
+        elif piece_type == chess.ROOK and color == chess.WHITE:
+            black_king = board.king(chess.BLACK)
+            delta += ROOK_SAFETY_SCORES[to_square * 64 + black_king] - ROOK_SAFETY_SCORES[from_square * 64 + black_king]
+        elif captured == chess.ROOK and color == chess.BLACK:
+            delta -= ROOK_SAFETY_SCORES[to_square * 64 + board.king(chess.BLACK)] # Torre Blanca capturada
+        self.score += delta
+
+    def pop(self):
+        """
+        Deshace la última actualización. Se llama junto con board.pop().
+        """
+        self.score = self.stack.pop()
+
+def evaluate_board(board, terminal=None, static_score=None):
+    """
+    Evalúa la posición actual del tablero desde la perspectiva de las piezas Blancas.
+    
+    Valores positivos altos son buenos para Blancas (buscando ganar).
+    Valores negativos altos son buenos para Negras (buscando evitar la derrota, lo que es malo para Blancas).
+    
+    Args:
+        board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+        terminal (int, opcional): Clasificación de la posición ya calculada con
+                                  classify_terminal() (la búsqueda la calcula una sola vez
+                                  por nodo). Si no se indica, se calcula aquí.
+        static_score (float, opcional): Valor de static_evaluation() ya conocido (la búsqueda
+                                        lo lleva acumulado en EvaluationState). Si no se
+                                        indica, se calcula aquí.
+        
+    Returns:
+        int: La puntuación de la posición.
+    """
+    if terminal is None:
+        terminal = classify_terminal(board)
+
+    # --- Casos Base de Evaluación (Fin del Juego) ---
+    # Si el juego ha terminado en jaque mate
+    if terminal == CHECKMATE:
+        # Si es el turno de NEGRAS y el tablero está en jaque mate, significa que BLANCAS
+        # acaba de hacer el jaque mate, lo cual es una victoria para BLANCAS.
+        return CHECKMATE_SCORE
+        # Si es el turno de BLANCAS y el tablero está en jaque mate, significa que NEGRAS
+        # acaba de hacer el jaque mate, lo cual es una victoria para NEGRAS (y una derrota para BLANCAS).
+        # Esto no debería ocurrir si la IA de Blancas juega correctamente.
+    elif terminal != NOT_TERMINAL:
+        # Si el juego es un ahogado (stalemate), o hay material insuficiente para dar jaque mate,
+        # o hay una repetición de movimientos (tres veces la misma posición).
+        # En estos casos, el juego es un empate, por lo que se devuelve una puntuación neutral.
+        return STALEMATE_SCORE
+
+    # --- Heurística para el Final de Juego de Dos Torres y Rey vs. Rey Solo ---
+    # Tablas pieza-casilla (la principal: el Rey Negro, cuanto más cerca del borde mejor),
+    # oposición de los reyes y seguridad de las Torres.
+
     # --- Perspectiva de la Evaluación ---
     # La función de evaluación siempre devuelve un valor desde la perspectiva de Blancas.
     # Es decir, un valor positivo es bueno para Blancas, y un valor negativo es malo para Blancas.
     # El algoritmo Minimax se encarga de maximizar esta puntuación para el jugador maximizador (Blancas)
     # y minimizarla para el jugador minimizador (Negras).
-    return king_position_score
\ No newline at end of file
+    if static_score is None:
+        static_score = static_evaluation(board)
+    return static_score
+
+# --- Tablas para la Evaluación en Lote ---
+# Las mismas tablas, preparadas para consultarlas byte a byte sobre los bitboards: para cada
+# byte del bitboard (8 casillas) y cada uno de sus 256 valores, la suma de las casillas
+# marcadas. Se crean la primera vez que se evalúa un lote de tableros, para que NumPy solo
+# sea necesario en ese modo.
+_batch_tables = None
+
+def _byte_table(np, table):
+    # Tabla [..., casilla] -> tabla [..., byte del bitboard (0-7), valor del byte (0-255)]
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder="little") # bits[valor, bit]
+    return np.einsum("...jb,vb->...jv", table.reshape(table.shape[:-1] + (8, 8)), bits)
+
+def _numpy_tables(np):
+    # (tablas pieza-casilla [color * 6 + tipo - 1, byte, valor], KING_PAIR_SCORES,
+    #  ROOK_SAFETY_SCORES [casilla del Rey Negro, byte del bitboard de Torres, valor])
+    global _batch_tables
+    if _batch_tables is None:
+        piece_squares = np.zeros((2, len(chess.PIECE_TYPES), 64))
+        for (piece_type, color), table in PIECE_SQUARE_TABLES.items():
+            piece_squares[int(color), piece_type - 1] = table
+        rook_safety = np.asarray(ROOK_SAFETY_SCORES, dtype=np.float64).reshape(64, 64).T # [rey, torre]
+        _batch_tables = (_byte_table(np, piece_squares.reshape(-1, 64)), np.asarray(KING_PAIR_SCORES, dtype=np.float64),
+                         _byte_table(np, rook_safety))
+    return _batch_tables
+
+def _king_squares(np, kings):
+    # Casilla de cada rey a partir de su bitboard (un solo bit) y si existe (bitboard distinto de cero)
+    present = kings != 0
+    return np.log2(np.where(present, kings, 1).astype(np.float64)).astype(np.intp), present
+
+def _static_batch(np, boards):
+    """
+    Calcula static_evaluation() de muchos tableros a la vez. De cada tablero solo se leen sus
+    bitboards (uno por tipo de pieza y el de las piezas Blancas); el resto son operaciones de
+    NumPy sobre el lote entero: cada término se obtiene consultando su tabla con los 8 bytes
+    de cada bitboard.
+
+    Returns:
+        numpy.ndarray: La parte posicional de cada tablero, en el mismo orden.
+    """
+    piece_squares, king_pairs, rook_safety = _numpy_tables(np)
+    count = len(boards)
+    bitboards = np.array([(board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+                           board.occupied_co[chess.WHITE]) for board in boards], dtype="<u8").reshape(count, 7)
+    white = bitboards[:, 6:]
+    # pieces[tablero, color * 6 + tipo - 1]: bitboard de las piezas de ese tipo y color
+    pieces = np.concatenate((bitboards[:, :6] & ~white, bitboards[:, :6] & white), axis=1)
+    piece_bytes = pieces.view(np.uint8).reshape(count, 12, 8)
+    byte_index = np.arange(8)
+
+    # --- Tablas Pieza-Casilla ---
+    scores = piece_squares[np.arange(12)[:, None], byte_index, piece_bytes].sum(axis=(1, 2))
+
+    # --- Términos de Pares de Piezas ---
+    white_kings, has_white_king = _king_squares(np, pieces[:, 6 + chess.KING - 1])
+    black_kings, has_black_king = _king_squares(np, pieces[:, chess.KING - 1])
+    pairs = king_pairs[white_kings * 64 + black_kings]
+    pairs += rook_safety[black_kings[:, None], byte_index, piece_bytes[:, 6 + chess.ROOK - 1]].sum(axis=1)
+    scores += np.where(has_white_king & has_black_king, pairs, 0) # Sin alguno de los reyes, no hay pares
+    # Sin Rey Negro, static_evaluation devuelve tablas.
+    return np.where(has_black_king, scores, STALEMATE_SCORE)
+
+def evaluate_batch(positions, terminals=None):
+    """
+    Evalúa muchas posiciones a la vez con NumPy (por ejemplo, todos los hijos de un nodo
+    de la frontera de la búsqueda). Las puntuaciones son idénticas a las de evaluate_board.
+
+    Args:
+        positions (secuencia): Valores de static_evaluation() ya calculados (números, o un
+                               array de NumPy), o bien tableros completos (chess.Board o KRRKBoard).
+        terminals (secuencia, opcional): Clasificación de cada posición según classify_terminal().
+                                         Si se pasan tableros y no se indica, se calcula aquí; si
+                                         se pasan valores y no se indica, ninguna posición se
+                                         considera terminal.
+
+    Returns:
+        numpy.ndarray: Puntuación de cada posición (perspectiva de Blancas), en el mismo orden.
+    """
+    import numpy as np # NumPy solo es necesario para la evaluación en lote
+
+    # --- Tableros: se calcula la parte posicional de todos a la vez ---
+    if len(positions) and not isinstance(positions[0], numbers.Real):
+        if terminals is None:
+            terminals = [classify_terminal(board) for board in positions]
+        positions = _static_batch(np, positions)
+
+    scores = np.asarray(positions, dtype=np.float64)
+    if terminals is not None:
+        terminals = np.asarray(terminals)
+        scores = np.where(terminals == NOT_TERMINAL, scores, STALEMATE_SCORE) # Tablas y ahogado
+        scores = np.where(terminals == CHECKMATE, CHECKMATE_SCORE, scores) # Jaque mate
+    return scores
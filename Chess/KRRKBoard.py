@@ -0,0 +1,397 @@
+import chess # Importa la librería python-chess (tablas de ataques y movimientos)
+import chess.polyglot # Importa polyglot para que las claves coincidan con las de la tabla de transposición
+
+# --- Representación Compacta del Final KRRK ---
+# La posición se guarda como cuatro índices de casilla (Rey Blanco, Rey Negro y las dos
+# torres; None si una torre fue capturada) más el jugador al turno. Implementa la parte del
+# API de chess.Board que usan la búsqueda, la evaluación, la ordenación de movimientos y la
+# tabla de finales, así que puede sustituir al tablero completo dentro de find_best_move.
+# La comprobación diferencial contra chess.Board está en test_krrkboard.py.
+
+# --- Tablas Precalculadas ---
+SQUARE_BB = chess.BB_SQUARES # Bitboard de cada casilla
+KING_ATTACKS = chess.BB_KING_ATTACKS # Casillas atacadas por un rey desde cada casilla
+_RANK_ATTACKS = chess.BB_RANK_ATTACKS # Ataques en la fila según la ocupación de la fila
+_FILE_ATTACKS = chess.BB_FILE_ATTACKS # Ataques en la columna según la ocupación de la columna
+_RANK_MASKS = chess.BB_RANK_MASKS
+_FILE_MASKS = chess.BB_FILE_MASKS
+
+# Movimientos ya creados: MOVES[origen][destino]. La generación de movimientos no crea objetos nuevos.
+MOVES = [[chess.Move(from_square, to_square) for to_square in chess.SQUARES] for from_square in chess.SQUARES]
+
+# Claves Zobrist de Polyglot de cada pieza en cada casilla (índice de pieza = (tipo - 1) * 2 + color),
+# para que la clave coincida con position_key() sobre el chess.Board equivalente.
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+WHITE_ROOK_KEYS = [_RANDOM[64 * 7 + square] for square in chess.SQUARES]
+WHITE_KING_KEYS = [_RANDOM[64 * 11 + square] for square in chess.SQUARES]
+BLACK_KING_KEYS = [_RANDOM[64 * 10 + square] for square in chess.SQUARES]
+TURN_KEY = _RANDOM[780] # Se suma (XOR) cuando mueven Blancas
+
+# Información para deshacer un movimiento, empaquetada en un entero:
+# bits 0-1 = torre capturada (0 ninguna, 1 la torre A, 2 la torre B), resto = reloj de 50 movimientos anterior.
+_CAPTURED_A = 1
+_CAPTURED_B = 2
+
+
+def rook_attacks(square, occupied):
+    """
+    Casillas atacadas por una torre desde 'square' con la ocupación 'occupied'.
+    """
+    return (_RANK_ATTACKS[square][_RANK_MASKS[square] & occupied] |
+            _FILE_ATTACKS[square][_FILE_MASKS[square] & occupied])
+
+
+class KRRKBoard:
+    """
+    Tablero especializado para el final de Rey y dos Torres contra Rey.
+
+    Sin enroques, capturas al paso ni coronaciones: push() y pop() solo actualizan unos
+    pocos enteros (casillas, turno, reloj y clave Zobrist incremental), en lugar de copiar
+    el estado completo de un chess.Board.
+    """
+
+    __slots__ = ("white_king", "black_king", "rook_a", "rook_b", "turn",
+                 "halfmove_clock", "fullmove_number", "key", "move_stack", "_undo")
+
+    # Atributos de chess.Board que en este final siempre están vacíos.
+    castling_rights = 0
+    ep_square = None
+    pawns = knights = bishops = queens = 0
+
+    def __init__(self, white_king, black_king, rook_a=None, rook_b=None, turn=chess.WHITE,
+                 halfmove_clock=0, fullmove_number=1):
+        """
+        Args:
+            white_king (int): Casilla del Rey Blanco.
+            black_king (int): Casilla del Rey Negro.
+            rook_a (int, opcional): Casilla de la primera Torre Blanca (None si no está).
+            rook_b (int, opcional): Casilla de la segunda Torre Blanca (None si no está).
+            turn (bool): Jugador al turno (chess.WHITE o chess.BLACK).
+            halfmove_clock (int): Medias jugadas desde la última captura.
+            fullmove_number (int): Número de jugada de la partida.
+        """
+        self.white_king = white_king
+        self.black_king = black_king
+        self.rook_a = rook_a
+        self.rook_b = rook_b
+        self.turn = turn
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.move_stack = [] # Movimientos realizados (como en chess.Board)
+        self._undo = [] # Información para deshacer cada movimiento (enteros empaquetados)
+
+        # --- Clave Zobrist Completa (después se actualiza de forma incremental) ---
+        key = WHITE_KING_KEYS[white_king] ^ BLACK_KING_KEYS[black_king]
+        for rook in (rook_a, rook_b):
+            if rook is not None:
+                key ^= WHITE_ROOK_KEYS[rook]
+        if turn == chess.WHITE:
+            key ^= TURN_KEY
+        self.key = key
+
+    # --- Conversión desde y hacia chess.Board ---
+
+    @staticmethod
+    def supports(board):
+        """
+        True si la posición es un final de Rey Blanco con hasta dos Torres contra Rey Negro solo.
+        """
+        if board.castling_rights or board.ep_square is not None:
+            return False
+        rooks = board.pieces(chess.ROOK, chess.WHITE)
+        return (board.king(chess.WHITE) is not None and board.king(chess.BLACK) is not None and
+                len(rooks) <= 2 and chess.popcount(board.occupied) == 2 + len(rooks))
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Crea el tablero compacto equivalente a un chess.Board.
+
+        Si la posición inicial de la partida también es un final KRRK, se reproducen los
+        movimientos de la partida, de modo que el historial (necesario para detectar
+        repeticiones) se conserva.
+
+        Args:
+            board (chess.Board): Tablero con un final KRRK (ver supports()).
+
+        Returns:
+            KRRKBoard: El tablero compacto.
+
+        Raises:
+            ValueError: Si la posición no es un final KRRK.
+        """
+        if not cls.supports(board):
+            raise ValueError(f"Not a KRRK position: {board.fen()}")
+        root = board.root()
+        if board.move_stack and cls.supports(root):
+            compact = cls._from_position(root)
+            for move in board.move_stack:
+                compact.push(move)
+            return compact
+        return cls._from_position(board)
+
+    @classmethod
+    def _from_position(cls, board):
+        # Posición sin historial
+        rooks = list(board.pieces(chess.ROOK, chess.WHITE)) + [None, None]
+        return cls(board.king(chess.WHITE), board.king(chess.BLACK), rooks[0], rooks[1],
+                   board.turn, board.halfmove_clock, board.fullmove_number)
+
+    def to_board(self):
+        """
+        Devuelve el chess.Board equivalente a la posición actual (sin historial).
+        """
+        board = chess.Board(None)
+        board.set_piece_map(self.piece_map())
+        board.turn = self.turn
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        return board
+
+    def fen(self):
+        """
+        FEN de la posición actual.
+        """
+        return self.to_board().fen()
+
+    def copy(self, stack=True):
+        """
+        Copia del tablero. Con stack=False se descarta el historial de movimientos.
+        """
+        board = KRRKBoard.__new__(KRRKBoard)
+        board.white_king = self.white_king
+        board.black_king = self.black_king
+        board.rook_a = self.rook_a
+        board.rook_b = self.rook_b
+        board.turn = self.turn
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        board.key = self.key
+        board.move_stack = list(self.move_stack) if stack else []
+        board._undo = list(self._undo) if stack else []
+        return board
+
+    def zobrist_hash(self):
+        """
+        Clave Zobrist de la posición (igual a la de Polyglot para el chess.Board equivalente).
+        """
+        return self.key
+
+    # --- Consultas de Piezas (mismo API que chess.Board) ---
+
+    # Bitboards de los tipos de pieza que no existen en este final.
+    pawns = knights = bishops = queens = 0
+
+    @property
+    def occupied_co(self):
+        # Bitboards de las piezas de cada color, indexados por color (chess.BLACK = 0, chess.WHITE = 1)
+        white = SQUARE_BB[self.white_king]
+        if self.rook_a is not None:
+            white |= SQUARE_BB[self.rook_a]
+        if self.rook_b is not None:
+            white |= SQUARE_BB[self.rook_b]
+        return (SQUARE_BB[self.black_king], white)
+
+    @property
+    def occupied(self):
+        return self.occupied_co[chess.WHITE] | SQUARE_BB[self.black_king]
+
+    @property
+    def kings(self):
+        return SQUARE_BB[self.white_king] | SQUARE_BB[self.black_king]
+
+    @property
+    def rooks(self):
+        return self.occupied_co[chess.WHITE] & ~SQUARE_BB[self.white_king]
+
+    def king(self, color):
+        return self.white_king if color == chess.WHITE else self.black_king
+
+    def pieces(self, piece_type, color):
+        if piece_type == chess.KING:
+            return chess.SquareSet(SQUARE_BB[self.king(color)])
+        if piece_type == chess.ROOK and color == chess.WHITE:
+            return chess.SquareSet(self.rooks)
+        return chess.SquareSet()
+
+    def piece_type_at(self, square):
+        if square == self.white_king or square == self.black_king:
+            return chess.KING
+        if square == self.rook_a or square == self.rook_b:
+            return chess.ROOK
+        return None
+
+    def piece_at(self, square):
+        piece_type = self.piece_type_at(square)
+        if piece_type is None:
+            return None
+        return chess.Piece(piece_type, square != self.black_king)
+
+    def piece_map(self):
+        pieces = {self.white_king: chess.Piece(chess.KING, chess.WHITE),
+                  self.black_king: chess.Piece(chess.KING, chess.BLACK)}
+        for rook in (self.rook_a, self.rook_b):
+            if rook is not None:
+                pieces[rook] = chess.Piece(chess.ROOK, chess.WHITE)
+        return pieces
+
+    def is_capture(self, move):
+        # Solo el Rey Negro puede capturar (una torre)
+        return self.turn == chess.BLACK and (move.to_square == self.rook_a or move.to_square == self.rook_b)
+
+    # --- Generación de Movimientos ---
+
+    def _white_attacks(self, occupied):
+        # Casillas atacadas por las piezas blancas con la ocupación dada
+        attacks = KING_ATTACKS[self.white_king]
+        if self.rook_a is not None:
+            attacks |= rook_attacks(self.rook_a, occupied)
+        if self.rook_b is not None:
+            attacks |= rook_attacks(self.rook_b, occupied)
+        return attacks
+
+    def generate_legal_moves(self):
+        """
+        Genera los movimientos legales en el mismo orden que python-chess (casilla de origen
+        descendente y, para cada pieza, casilla de destino descendente).
+        """
+        black_king = self.black_king
+        if self.turn == chess.WHITE:
+            black_king_bb = SQUARE_BB[black_king]
+            occupied = self.occupied
+            white = occupied & ~black_king_bb
+            # Las Blancas nunca pueden estar en jaque (el único atacante posible es el Rey Negro)
+            # y sus torres no pueden quedar clavadas: todo movimiento pseudolegal es legal,
+            # salvo acercar un rey al otro.
+            pieces = sorted((square for square in (self.white_king, self.rook_a, self.rook_b)
+                             if square is not None), reverse=True)
+            for from_square in pieces:
+                if from_square == self.white_king:
+                    targets = KING_ATTACKS[from_square] & ~white & ~KING_ATTACKS[black_king]
+                else:
+                    targets = rook_attacks(from_square, occupied) & ~white & ~black_king_bb
+                row = MOVES[from_square]
+                while targets:
+                    to_square = targets.bit_length() - 1
+                    targets ^= SQUARE_BB[to_square]
+                    yield row[to_square]
+        else:
+            # El Rey Negro no bloquea los ataques sobre sus propias casillas de escape.
+            attacked = self._white_attacks(self.occupied & ~SQUARE_BB[black_king])
+            targets = KING_ATTACKS[black_king] & ~attacked & ~SQUARE_BB[self.white_king]
+            row = MOVES[black_king]
+            while targets:
+                to_square = targets.bit_length() - 1
+                targets ^= SQUARE_BB[to_square]
+                yield row[to_square]
+
+    @property
+    def legal_moves(self):
+        return list(self.generate_legal_moves())
+
+    def is_legal(self, move):
+        return move in self.legal_moves
+
+    def is_check(self):
+        # Solo el Rey Negro puede estar en jaque (de una torre)
+        if self.turn == chess.WHITE:
+            return False
+        occupied = self.occupied
+        black_king_bb = SQUARE_BB[self.black_king]
+        for rook in (self.rook_a, self.rook_b):
+            if rook is not None and rook_attacks(rook, occupied) & black_king_bb:
+                return True
+        return False
+
+    def is_insufficient_material(self):
+        return self.rook_a is None and self.rook_b is None
+
+    def is_repetition(self, count=3):
+        """
+        True si la posición actual ha aparecido al menos 'count' veces (contando la actual).
+        """
+        board = self.copy()
+        found = 1
+        for _ in range(min(self.halfmove_clock, len(self.move_stack))):
+            board.pop()
+            if board.key == self.key:
+                found += 1
+                if found >= count:
+                    return True
+        return False
+
+    # --- Realizar y Deshacer Movimientos ---
+
+    def push(self, move):
+        """
+        Realiza un movimiento (debe ser legal).
+        """
+        from_square = move.from_square
+        to_square = move.to_square
+        undo = self.halfmove_clock << 2 # Reloj anterior (los dos bits bajos son para la captura)
+        key = self.key ^ TURN_KEY
+        if self.turn == chess.WHITE:
+            if from_square == self.white_king:
+                self.white_king = to_square
+                key ^= WHITE_KING_KEYS[from_square] ^ WHITE_KING_KEYS[to_square]
+            else:
+                if from_square == self.rook_a:
+                    self.rook_a = to_square
+                else:
+                    self.rook_b = to_square
+                key ^= WHITE_ROOK_KEYS[from_square] ^ WHITE_ROOK_KEYS[to_square]
+            self.halfmove_clock += 1
+        else:
+            self.black_king = to_square
+            key ^= BLACK_KING_KEYS[from_square] ^ BLACK_KING_KEYS[to_square]
+            if to_square == self.rook_a or to_square == self.rook_b:
+                # Captura de una torre: se reinicia el reloj de 50 movimientos
+                if to_square == self.rook_a:
+                    self.rook_a = None
+                    undo |= _CAPTURED_A
+                else:
+                    self.rook_b = None
+                    undo |= _CAPTURED_B
+                key ^= WHITE_ROOK_KEYS[to_square]
+                self.halfmove_clock = 0
+            else:
+                self.halfmove_clock += 1
+            self.fullmove_number += 1
+        self.turn = not self.turn
+        self.key = key
+        self.move_stack.append(move)
+        self._undo.append(undo)
+
+    def pop(self):
+        """
+        Deshace el último movimiento y lo devuelve.
+        """
+        move = self.move_stack.pop()
+        undo = self._undo.pop()
+        from_square = move.from_square
+        to_square = move.to_square
+        key = self.key ^ TURN_KEY
+        self.turn = not self.turn
+        if self.turn == chess.WHITE:
+            if to_square == self.white_king:
+                self.white_king = from_square
+                key ^= WHITE_KING_KEYS[from_square] ^ WHITE_KING_KEYS[to_square]
+            else:
+                if to_square == self.rook_a:
+                    self.rook_a = from_square
+                else:
+                    self.rook_b = from_square
+                key ^= WHITE_ROOK_KEYS[from_square] ^ WHITE_ROOK_KEYS[to_square]
+        else:
+            self.black_king = from_square
+            key ^= BLACK_KING_KEYS[from_square] ^ BLACK_KING_KEYS[to_square]
+            if undo & _CAPTURED_A:
+                self.rook_a = to_square
+                key ^= WHITE_ROOK_KEYS[to_square]
+            elif undo & _CAPTURED_B:
+                self.rook_b = to_square
+                key ^= WHITE_ROOK_KEYS[to_square]
+            self.fullmove_number -= 1
+        self.halfmove_clock = undo >> 2
+        self.key = key
+        return move
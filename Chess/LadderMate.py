@@ -0,0 +1,162 @@
+import chess # Importa la librería python-chess para la lógica del ajedrez
+
+# --- Mate de la Escalera (Dos Torres contra Rey) ---
+# La técnica ganadora de KRRK es un procedimiento conocido: una torre corta al rey en una
+# fila (o columna), la otra le da jaque en la siguiente, y así, fila a fila, hasta el borde.
+# Cuando el rey ataca una torre, esta se aleja por su fila. Aquí se aplica como regla: entre
+# todos los movimientos de torre se elige el que más empuja al rey hacia el borde, sin dejar
+# ninguna torre colgada, sin ahogar y sin dejar que el rey retroceda. Si ninguno cumple (por
+# ejemplo, el rey blanco tapa la fila de la barrera), se devuelve None y decide la búsqueda.
+#
+# Todo se calcula con bitboards sobre las cuatro casillas de las piezas, sin mover el tablero,
+# así que cuesta microsegundos en lugar de una búsqueda completa.
+
+# LEVELS[d][casilla] = distancia de la casilla al borde opuesto al que se empuja al rey en la
+# dirección d (hacia la fila 8, la fila 1, la columna h o la columna a). El rey está en el
+# borde cuando su nivel es 7.
+LEVELS = (
+    [chess.square_rank(sq) for sq in chess.SQUARES],
+    [7 - chess.square_rank(sq) for sq in chess.SQUARES],
+    [chess.square_file(sq) for sq in chess.SQUARES],
+    [7 - chess.square_file(sq) for sq in chess.SQUARES],
+)
+# Ventaja (en niveles) de la dirección en la que ya hay una barrera: se sigue empujando hacia
+# ese borde aunque otro esté un poco más cerca, pero no si el rey está casi en el borde contrario.
+FENCE_BONUS = 2
+
+
+def _rook_attacks(square, occupied):
+    # Casillas atacadas por una torre en 'square' con las piezas de 'occupied' como bloqueo
+    return (chess.BB_RANK_ATTACKS[square][occupied & chess.BB_RANK_MASKS[square]] |
+            chess.BB_FILE_ATTACKS[square][occupied & chess.BB_FILE_MASKS[square]])
+
+
+def _escapes(white_king, rooks, black_king):
+    """
+    Respuestas del Rey Negro solo ante el Rey y las Torres blancas.
+
+    Args:
+        white_king (int): Casilla del Rey Blanco.
+        rooks (tuple): Casillas de las dos Torres.
+        black_king (int): Casilla del Rey Negro.
+
+    Returns:
+        tuple: (bitboard de casillas a las que puede ir el Rey Negro, True si está en jaque).
+    """
+    # El Rey Negro no bloquea los rayos (si se aparta por la misma fila, sigue atacado), y una
+    # torre defendida por la otra o por el rey cuenta como atacada: no la puede capturar.
+    occupied = chess.BB_SQUARES[white_king] | chess.BB_SQUARES[rooks[0]] | chess.BB_SQUARES[rooks[1]]
+    attacks = (chess.BB_KING_ATTACKS[white_king] |
+               _rook_attacks(rooks[0], occupied) | _rook_attacks(rooks[1], occupied))
+    return chess.BB_KING_ATTACKS[black_king] & ~attacks, bool(attacks & chess.BB_SQUARES[black_king])
+
+
+def _directions(white_king, rooks, black_king):
+    # Direcciones en las que se puede empujar al rey, de la preferida a la última: por cercanía
+    # al borde, con ventaja para las que ya tienen la barrera formada (el rey no puede bajar de nivel).
+    escapes, _ = _escapes(white_king, rooks, black_king)
+    keys = []
+    for level in LEVELS:
+        current = level[black_king]
+        fenced = current > 0 and all(level[sq] >= current for sq in chess.scan_forward(escapes))
+        keys.append(current + FENCE_BONUS * fenced)
+    return [LEVELS[direction] for direction in sorted(range(len(LEVELS)), key=keys.__getitem__, reverse=True)]
+
+
+def applies(board):
+    """
+    True si la posición es un final de Rey y dos Torres contra Rey solo, con Blancas al turno.
+    """
+    return (board.turn == chess.WHITE and chess.popcount(board.occupied) == 4 and
+            chess.popcount(board.rooks & board.occupied_co[chess.WHITE]) == 2 and
+            board.king(chess.WHITE) is not None and board.king(chess.BLACK) is not None)
+
+
+def ladder_move(board):
+    """
+    Movimiento del mate de la escalera para la posición, si la regla se puede aplicar.
+
+    Garantiza progreso: tras el movimiento, el Rey Negro no puede capturar una torre, no
+    está ahogado y no puede volver a un nivel más alejado del borde que el actual. Entre los
+    movimientos que lo cumplen se prefiere el mate, después el que más sube el nivel mínimo
+    del rey (jaque con la barrera puesta), después el que le deja menos casillas y, por último,
+    el que deja las torres más lejos de él. No se repiten posiciones de la partida.
+
+    Args:
+        board (chess.Board): La posición (Blancas al turno).
+
+    Returns:
+        chess.Move o None: El movimiento, o None si la posición no es de dos Torres contra
+                           Rey o ningún movimiento de torre cumple las condiciones.
+    """
+    if not applies(board):
+        return None
+    white_king = board.king(chess.WHITE)
+    black_king = board.king(chess.BLACK)
+    rooks = tuple(chess.scan_forward(board.rooks))
+    # Se prueba cada dirección en orden de preferencia hasta que una tenga un movimiento válido.
+    for level in _directions(white_king, rooks, black_king):
+        move = _push_move(board, white_king, rooks, black_king, level)
+        if move is not None:
+            return move
+    return None
+
+
+def _progress(white_king, rooks, black_king, level):
+    # Nivel mínimo al que puede ir el rey tras el movimiento (None si el movimiento no vale:
+    # ahogado o torre colgada; 8 si es mate) y sus casillas de escape
+    escapes, check = _escapes(white_king, rooks, black_king)
+    if not escapes:
+        return (8 if check else None), escapes
+    if escapes & (chess.BB_SQUARES[rooks[0]] | chess.BB_SQUARES[rooks[1]]):
+        return None, escapes
+    return min(level[sq] for sq in chess.scan_forward(escapes)), escapes
+
+
+def _check_ready(white_king, rooks, black_king, level, occupied):
+    # True si alguna torre puede dar, en el siguiente movimiento, un jaque que suba el nivel
+    # del rey (suponiendo que el rey sigue en su fila): así se prefieren las esperas útiles.
+    current = level[black_king]
+    for index, rook in enumerate(rooks):
+        targets = _rook_attacks(rook, occupied) & ~occupied
+        for target in chess.scan_forward(targets):
+            if level[target] != current:
+                continue
+            lowest, _ = _progress(white_king, (target, rooks[1 - index]), black_king, level)
+            if lowest is not None and lowest > current:
+                return True
+    return False
+
+
+def _push_move(board, white_king, rooks, black_king, level):
+    # Mejor movimiento de torre que empuja al rey en la dirección de 'level' (o None)
+    current = level[black_king]
+    candidates = []
+    for index, rook in enumerate(rooks):
+        other = rooks[1 - index]
+        targets = _rook_attacks(rook, board.occupied) & ~board.occupied_co[chess.WHITE]
+        for target in chess.scan_forward(targets):
+            moved = (target, other)
+            lowest, escapes = _progress(white_king, moved, black_king, level)
+            if lowest is None:
+                continue # Ahogado o torre colgada
+            if lowest == 8:
+                return chess.Move(rook, target) # Mate
+            if lowest < current:
+                continue # El rey se escapa hacia atrás
+            # Si el movimiento no da jaque, mejor uno que deje preparado el jaque siguiente.
+            occupied = board.occupied & ~chess.BB_SQUARES[rook] | chess.BB_SQUARES[target]
+            ready = lowest > current or _check_ready(white_king, moved, black_king, level, occupied)
+            safety = min(chess.square_distance(target, black_king), chess.square_distance(other, black_king))
+            candidates.append(((lowest, ready, -chess.popcount(escapes), safety), chess.Move(rook, target)))
+
+    # Sin repetir posiciones: así la regla nunca entra en un ciclo (solo se comprueba el
+    # movimiento elegido, salvo que repita).
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    for _, move in candidates:
+        board.push(move)
+        repeated = board.is_repetition(2)
+        board.pop()
+        if not repeated:
+            return move
+    return None
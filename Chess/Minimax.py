@@ -1,13 +1,317 @@
 import chess # Importa la librería python-chess para la representación del tablero y movimientos
 import math # Importa el módulo math para usar 'inf' (infinito)
-from Heuristic import evaluate_board, CHECKMATE_SCORE # Importa la función de evaluación y la constante de puntuación de jaque mate
+import time # Importa el módulo time para controlar el tiempo límite de búsqueda
+from Heuristic import evaluate_board, evaluate_batch, static_evaluation, EvaluationState, classify_terminal, mate_score, is_mate_score, mate_in_plies, NOT_TERMINAL, CHECKMATE # Importa la evaluación (individual, en lote e incremental), la clasificación de posiciones terminales y las puntuaciones de mate
+from KRRKBoard import KRRKBoard # Importa el tablero compacto especializado en el final KRRK
+from LadderMate import ladder_move # Importa la regla del mate de la escalera (dos Torres contra Rey)
+from MoveOrdering import MoveOrderer # Importa el ordenador de movimientos (jaques, killer moves, historia)
+from Tablebase import get_tablebase # Importa la tabla de finales KRRK precalculada (si está generada)
+from TranspositionTable import TranspositionTable, position_key, next_position_key # Importa la tabla de transposición y la función que calcula la clave (hash Zobrist) de una posición
 
-def minimax(board, depth, alpha, beta, maximizing_player):
+# Profundidad máxima que alcanza la profundización iterativa cuando solo se limita por tiempo.
+MAX_ITERATIVE_DEPTH = 64
+# Presupuesto de memoria (MB) de la tabla temporal que se crea si la búsqueda por tiempo no recibe una.
+DEFAULT_TT_SIZE_MB = 16
+# Semiancho inicial de la ventana de aspiración en la raíz, centrada en la puntuación anterior.
+# Equivale a la bonificación por llevar al Rey Negro al borde.
+ASPIRATION_WINDOW = 50
+
+
+class SearchTimeout(Exception):
+    """
+    Se lanza dentro de minimax cuando se agota el tiempo límite de la búsqueda.
+    """
+    pass
+
+
+class SearchContext:
+    """
+    Estado compartido por todos los nodos de una búsqueda.
+    """
+
+    def __init__(self, tt=None, deadline=None, move_ordering=True, stop_event=None, batch_evaluation=False,
+                 stats=None):
+        """
+        Args:
+            tt (TranspositionTable, opcional): Tabla de transposición de la búsqueda.
+            deadline (float, opcional): Instante (según time.monotonic()) en el que la búsqueda
+                                        debe abandonarse lanzando SearchTimeout.
+            move_ordering (bool): Si es False, los movimientos se recorren en el orden del
+                                  generador de python-chess (para comparar el número de nodos).
+            stop_event (threading.Event, opcional): Si se activa desde otro hilo, la búsqueda
+                                                    se abandona igual que al agotar el tiempo.
+            batch_evaluation (bool): Si es True, los hijos de cada nodo de la frontera
+                                     (profundidad 1) se evalúan juntos con evaluate_batch().
+            stats (SearchStats, opcional): Si se indica, la búsqueda anota en él nodos por nivel,
+                                           evaluaciones, cortes por índice de movimiento e iteraciones.
+        """
+        self.tt = tt
+        self.deadline = deadline
+        self.stop_event = stop_event
+        self.ordering = MoveOrderer() if move_ordering else None
+        self.batch_evaluation = batch_evaluation
+        self.stats = stats
+        self.nodes = 0 # Número de nodos visitados
+        self.repetitions = {} # Clave de posición -> veces que aparece en la partida más la rama actual
+        self.evaluation = None # Evaluación incremental de la posición actual (EvaluationState, desde set_root)
+
+    def set_root(self, board):
+        """
+        Inicializa el contador de repeticiones con las posiciones de la partida que llevan
+        a la raíz (incluida la propia raíz).
+
+        Solo se recorre el historial hasta el último movimiento irreversible (captura o
+        movimiento de peón): ninguna posición anterior puede volver a repetirse.
+
+        También inicializa la evaluación incremental con la posición raíz.
+
+        Args:
+            board (chess.Board): La posición raíz de la búsqueda.
+        """
+        self.evaluation = EvaluationState(board)
+        repetitions = {}
+        board = board.copy() # Copia con historial, para poder deshacer movimientos
+        while True:
+            key = position_key(board)
+            repetitions[key] = repetitions.get(key, 0) + 1
+            if not board.move_stack or board.halfmove_clock == 0:
+                break
+            board.pop()
+        self.repetitions = repetitions
+
+    def push(self, board, move, key=None):
+        """
+        Realiza un movimiento en el tablero, cuenta la nueva posición en el contador
+        de repeticiones y actualiza la evaluación incremental.
+
+        Args:
+            board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+            move (chess.Move): El movimiento a realizar.
+            key (int, opcional): La clave de la posición actual; si se indica, la nueva clave
+                                 se calcula de forma incremental siempre que sea posible.
+
+        Returns:
+            int: La clave (hash Zobrist) de la nueva posición, que se pasa a negamax() y a pop().
+        """
+        if key is not None:
+            key = next_position_key(board, move, key)
+        if self.evaluation is not None:
+            self.evaluation.push(board, move) # Antes de mover: necesita el tablero anterior
+        board.push(move)
+        if key is None:
+            key = position_key(board)
+        self.repetitions[key] = self.repetitions.get(key, 0) + 1
+        return key
+
+    def pop(self, board, key):
+        """
+        Deshace el último movimiento y lo descuenta del contador de repeticiones.
+
+        Args:
+            board (chess.Board): El tablero en el que se hizo push().
+            key (int): La clave devuelta por push().
+        """
+        count = self.repetitions[key] - 1
+        if count:
+            self.repetitions[key] = count
+        else:
+            del self.repetitions[key]
+        if self.evaluation is not None:
+            self.evaluation.pop()
+        board.pop()
+
+
+def _frontier_scores(board, moves, key, color, context, ply):
+    """
+    Evalúa en lote todos los hijos de un nodo de la frontera (profundidad 1).
+
+    Returns:
+        list: Puntuación de cada movimiento para el jugador al turno, la misma que
+              devolvería -negamax(hijo, 0, ...).
+    """
+    terminals = [] # Clasificación de fin de partida de cada hijo
+    static_scores = [] # Parte posicional de la evaluación de cada hijo
+    for move in moves:
+        child_key = context.push(board, move, key)
+        terminals.append(classify_terminal(board, None, context.repetitions[child_key]))
+        static_scores.append(context.evaluation.score if context.evaluation is not None else static_evaluation(board))
+        context.pop(board, child_key)
+    context.nodes += len(moves) # Cada hijo cuenta como un nodo visitado
+    if context.stats is not None:
+        for _ in moves:
+            context.stats.record_node(ply + 1)
+        context.stats.leaf_evaluations += len(moves)
+    scores = (color * evaluate_batch(static_scores, terminals)).tolist()
+    for index, terminal in enumerate(terminals):
+        if terminal == CHECKMATE:
+            scores[index] = mate_score(ply + 1) # El rival queda mateado en el hijo (a ply + 1 de la raíz)
+    return scores
+
+def negamax(board, depth, alpha, beta, context=None, ply=0, key=None):
+    """
+    Núcleo de búsqueda: Negamax con poda Alpha-Beta y búsqueda de variante principal (PVS).
+
+    En Negamax las puntuaciones son siempre desde la perspectiva del jugador al que le toca
+    mover, de modo que el mejor valor para un jugador es el opuesto del mejor valor para el
+    rival: max(a, b) = -min(-a, -b). Así un único bucle sirve para Blancas y Negras.
+
+    Con PVS, solo el primer movimiento (el más prometedor según la ordenación) se busca con
+    la ventana completa; el resto se busca con una ventana nula (alpha, alpha + 1) que solo
+    responde "¿es mejor que alpha?". Si alguno resulta serlo, se vuelve a buscar con la
+    ventana completa.
+
+    Los jaques mate se puntúan según su distancia a la raíz (ver Heuristic.mate_score), así
+    que la búsqueda prefiere el mate más corto y retrasa lo más posible el propio. Con la
+    poda por distancia al mate, un nodo a 'ply' medias jugadas de la raíz no se explora si
+    ni el mejor resultado posible desde él (dar mate en la siguiente jugada) ni el peor
+    (estar mateado ya) caen dentro de la ventana: ya hay un mate más corto garantizado.
+
+    Args:
+        board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+        depth (int): La profundidad restante en el árbol de búsqueda.
+        alpha (float): La mejor puntuación que el jugador al turno tiene garantizada.
+        beta (float): La puntuación a partir de la cual el rival evitará esta posición.
+        context (SearchContext, opcional): Estado de la búsqueda (tabla de transposición,
+                                           tiempo límite, ordenación de movimientos y contador de nodos).
+        ply (int): Distancia (en medias jugadas) desde la raíz de la búsqueda.
+        key (int, opcional): Clave (hash Zobrist) de la posición, si el llamador ya la calculó
+                             con SearchContext.push().
+
+    Returns:
+        tuple: Una tupla que contiene:
+               - best_score (float): La mejor puntuación para el jugador al turno.
+               - best_move (chess.Move): El mejor movimiento correspondiente a esa puntuación.
+    """
+    if context is None:
+        context = SearchContext()
+    context.nodes += 1
+    tt = context.tt
+    stats = context.stats # Estadísticas opcionales (None = desactivadas, sin coste)
+    if stats is not None:
+        stats.record_node(ply)
+
+    # Si se ha superado el tiempo límite (o se pidió detener la búsqueda), se abandona.
+    if context.deadline is not None and time.monotonic() >= context.deadline:
+        raise SearchTimeout()
+    if context.stop_event is not None and context.stop_event.is_set():
+        raise SearchTimeout()
+
+    # evaluate_board puntúa desde la perspectiva de Blancas; se cambia el signo si mueven Negras.
+    color = 1 if board.turn == chess.WHITE else -1
+
+    # --- Contador de Repeticiones ---
+    # En la raíz se cuenta el historial de la partida; en el resto de nodos, el padre ya
+    # contó la posición al hacer el movimiento (SearchContext.push).
+    if key is None:
+        key = position_key(board) # Hash Zobrist de la posición
+    if ply == 0:
+        context.set_root(board)
+    repetitions = context.repetitions.get(key, 0)
+
+    # --- Poda por Distancia al Mate ---
+    # Desde aquí, lo mejor posible es dar mate en la siguiente jugada y lo peor, estar mateado
+    # ya. Si la ventana queda vacía, una rama anterior ya garantiza un mate más corto.
+    if ply > 0:
+        alpha = max(alpha, -mate_score(ply))
+        beta = min(beta, mate_score(ply + 1))
+        if alpha >= beta:
+            return alpha, None
+
+    # --- Casos Base para la Recursión ---
+    # Al alcanzar la profundidad límite se evalúa la posición. La clasificación de fin de
+    # partida solo necesita saber si existe algún movimiento legal, no generarlos todos.
+    if depth == 0:
+        if stats is not None:
+            stats.leaf_evaluations += 1
+        terminal = classify_terminal(board, None, repetitions)
+        if terminal == CHECKMATE:
+            return -mate_score(ply), None # El jugador al turno está mateado
+        # La parte posicional se lee del acumulador incremental: no se recalcula en cada hoja.
+        static_score = context.evaluation.score if context.evaluation is not None else None
+        return color * evaluate_board(board, terminal, static_score), None
+
+    # --- Consulta de la Tabla de Transposición ---
+    # Si esta posición ya se buscó (por otro orden de movimientos o en un turno anterior)
+    # a suficiente profundidad, se reutiliza su resultado sin volver a explorarla.
+    tt_move = None
+    if tt is not None:
+        tt_score, tt_move = tt.lookup(key, depth, alpha, beta, ply)
+        if tt_score is not None:
+            return tt_score, tt_move
+    alpha_orig = alpha # Alpha original, necesario para saber el tipo de cota al guardar
+
+    # --- Fin de la Partida ---
+    # Los movimientos legales se generan una sola vez: sirven para detectar el jaque mate o el
+    # ahogado (lista vacía) y después para recorrerlos.
+    moves = list(board.legal_moves)
+    terminal = classify_terminal(board, moves, repetitions)
+    if terminal != NOT_TERMINAL:
+        if stats is not None:
+            stats.leaf_evaluations += 1
+        if terminal == CHECKMATE:
+            return -mate_score(ply), None # El jugador al turno está mateado
+        return color * evaluate_board(board, terminal), None
+
+    # --- Ordenación de Movimientos ---
+    # Primero el mejor movimiento guardado en la tabla (en la profundización iterativa, el de
+    # la variante principal anterior), luego jaques, movimientos que quitan casillas al Rey
+    # Negro, movimientos asesinos e historia. Sin ordenación se usa el orden del generador.
+    if context.ordering is not None:
+        moves = context.ordering.order(board, moves, tt_move, ply)
+
+    # --- Evaluación en Lote de la Frontera ---
+    # Las hojas se puntúan igual con cualquier ventana, así que evaluarlas todas de una vez no
+    # cambia el resultado: el bucle de abajo toma las puntuaciones en orden y corta igual.
+    frontier_scores = None
+    if depth == 1 and context.batch_evaluation:
+        frontier_scores = _frontier_scores(board, moves, key, color, context, ply)
+
+    best_score = -math.inf # Inicializa la mejor evaluación con un valor muy bajo (infinito negativo)
+    best_move = None # Inicializa el mejor movimiento como None
+    for index, move in enumerate(moves):
+        if frontier_scores is not None:
+            score = frontier_scores[index] # Hijo ya evaluado en lote
+        else:
+            child_key = context.push(board, move, key) # Realiza el movimiento en el tablero (simula el movimiento)
+            if index == 0:
+                # Primer movimiento: ventana completa
+                score = -negamax(board, depth - 1, -beta, -alpha, context, ply + 1, child_key)[0]
+            else:
+                # Resto de movimientos: ventana nula, solo se comprueba si mejoran alpha
+                score = -negamax(board, depth - 1, -alpha - 1, -alpha, context, ply + 1, child_key)[0]
+                if alpha < score < beta:
+                    # Lo mejora: hay que conocer su valor exacto, se repite con la ventana completa
+                    score = -negamax(board, depth - 1, -beta, -alpha, context, ply + 1, child_key)[0]
+            context.pop(board, child_key) # Deshace el movimiento para restaurar el tablero a su estado anterior (backtracking)
+
+        # Si la evaluación de este movimiento es mejor que la mejor evaluación encontrada hasta ahora
+        if score > best_score:
+            best_score = score # Actualiza la mejor evaluación
+            best_move = move # Actualiza el mejor movimiento
+        alpha = max(alpha, score)
+
+        # --- Poda Alpha-Beta ---
+        # Si alpha alcanza a beta, el rival ya tiene una opción mejor en una rama anterior
+        # y nunca permitirá llegar a esta posición: no hace falta explorar más movimientos.
+        if alpha >= beta:
+            if context.ordering is not None:
+                context.ordering.record_cutoff(board, move, ply, depth) # Aprende del corte (killer e historia)
+            if stats is not None:
+                stats.record_cutoff(index)
+            break # Poda la rama (corta la búsqueda)
+
+    # --- Guardado en la Tabla de Transposición ---
+    # Se guarda la puntuación junto con la profundidad, el tipo de cota y el mejor movimiento.
+    if tt is not None:
+        tt.store(key, depth, best_score, alpha_orig, beta, best_move, ply)
+    return best_score, best_move # Devuelve la mejor evaluación y el mejor movimiento
+
+def minimax(board, depth, alpha, beta, maximizing_player, context=None, ply=0):
     """
     Implementa el algoritmo Minimax con poda Alpha-Beta.
 
-    Este algoritmo busca el mejor movimiento posible para el jugador actual
-    asumiendo que ambos jugadores juegan de forma óptima.
+    Se conserva por compatibilidad: las puntuaciones (y alpha y beta) son siempre desde
+    la perspectiva de Blancas, y el trabajo lo hace el núcleo negamax().
 
     Args:
         board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
@@ -21,95 +325,263 @@ def minimax(board, depth, alpha, beta, maximizing_player):
                       (Negras) puede garantizar hasta el momento.
         maximizing_player (bool): True si es el turno del jugador maximizador (Blancas),
                                   False si es el turno del jugador minimizador (Negras).
+        context (SearchContext, opcional): Estado de la búsqueda (tabla de transposición,
+                                           tiempo límite, ordenación de movimientos y contador de nodos).
+        ply (int): Distancia (en medias jugadas) desde la raíz de la búsqueda.
 
     Returns:
         tuple: Una tupla que contiene:
                - best_score (float): La mejor puntuación encontrada para la posición.
                - best_move (chess.Move): El mejor movimiento correspondiente a esa puntuación.
     """
-    # --- Casos Base para la Recursión ---
-    # La recursión se detiene si:
-    # 1. Se alcanza la profundidad límite (depth == 0).
-    # 2. El juego ha terminado (jaque mate, ahogado, etc.), lo cual se verifica con board.is_game_over().
-    if depth == 0 or board.is_game_over():
-        # En los casos base, se evalúa la posición final y se devuelve la puntuación
-        # junto con None para el movimiento, ya que no hay más movimientos que hacer.
-        return evaluate_board(board), None
-
-    # --- Lógica para el Jugador Maximizador (Blancas) ---
-    # Este jugador intenta obtener la puntuación más alta posible.
     if maximizing_player:
-        max_eval = -math.inf # Inicializa la mejor evaluación con un valor muy bajo (infinito negativo)
-        best_move = None # Inicializa el mejor movimiento como None
-
-        # Itera sobre todos los movimientos legales disponibles desde la posición actual
-        for move in board.legal_moves:
-            board.push(move) # Realiza el movimiento en el tablero (simula el movimiento)
-            
-            # Llama recursivamente a minimax para el siguiente nivel del árbol de búsqueda.
-            # El siguiente jugador será el minimizador (False).
-            # Se pasan los valores alpha y beta actualizados.
-            eval, _ = minimax(board, depth - 1, alpha, beta, False) 
-            
-            board.pop() # Deshace el movimiento para restaurar el tablero a su estado anterior (backtracking)
-
-            # Si la evaluación de este movimiento es mejor que la mejor evaluación encontrada hasta ahora
-            if eval > max_eval:
-                max_eval = eval # Actualiza la mejor evaluación
-                best_move = move # Actualiza el mejor movimiento
-            
-            # --- Poda Alpha-Beta (Alpha Cut-off) ---
-            # Actualiza el valor alpha: es el máximo entre el alpha actual y la evaluación de este movimiento.
-            alpha = max(alpha, eval)
-            # Si el valor beta es menor o igual al valor alpha, significa que el jugador minimizador
-            # ya tiene una opción mejor en una rama anterior y no explorará esta rama más a fondo.
-            if beta <= alpha: 
-                break # Poda la rama (corta la búsqueda)
-        return max_eval, best_move # Devuelve la mejor evaluación y el mejor movimiento para el maximizador
-    
-    # --- Lógica para el Jugador Minimizador (Negras) ---
-    # Este jugador intenta obtener la puntuación más baja posible (desde la perspectiva del maximizador).
-    else:  
-        min_eval = math.inf # Inicializa la mejor evaluación con un valor muy alto (infinito positivo)
-        best_move = None # Inicializa el mejor movimiento como None
-
-        # Itera sobre todos los movimientos legales disponibles
-        for move in board.legal_moves:
-            board.push(move) # Realiza el movimiento en el tablero (simula el movimiento)
-            
-            # Llama recursivamente a minimax para el siguiente nivel del árbol de búsqueda.
-            # El siguiente jugador será el maximizador (True).
-            # Se pasan los valores alpha y beta actualizados.
-            eval, _ = minimax(board, depth - 1, alpha, beta, True) 
-            
-            board.pop() # Deshace el movimiento
-
-            # Si la evaluación de este movimiento es peor que la mejor evaluación encontrada hasta ahora
-            if eval < min_eval:
-                min_eval = eval # Actualiza la mejor evaluación
-                best_move = move # Actualiza el mejor movimiento
-            
-            # --- Poda Alpha-Beta (Beta Cut-off) ---
-            # Actualiza el valor beta: es el mínimo entre el beta actual y la evaluación de este movimiento.
-            beta = min(beta, eval)
-            # Si el valor beta es menor o igual al valor alpha, significa que el jugador maximizador
-            # ya tiene una opción mejor en una rama anterior y no explorará esta rama más a fondo.
-            if beta <= alpha: 
-                break # Poda la rama (corta la búsqueda)
-        return min_eval, best_move # Devuelve la mejor evaluación y el mejor movimiento para el minimizador
-
-def find_best_move(board, depth):
-    """
-    Función envoltorio para iniciar la búsqueda Minimax para el jugador Blanco (maximizador).
+        return negamax(board, depth, alpha, beta, context, ply)
+    score, move = negamax(board, depth, -beta, -alpha, context, ply)
+    return -score, move # Se vuelve a la perspectiva de Blancas
+
+def aspiration_search(board, depth, previous_score, context):
+    """
+    Búsqueda en la raíz con ventana de aspiración.
+
+    En lugar de buscar con la ventana (-inf, +inf), se busca con una ventana estrecha
+    centrada en la puntuación de la iteración anterior, lo que produce muchos más cortes.
+    Si el resultado cae fuera de la ventana, se amplía ese lado y se repite la búsqueda.
+
+    Args:
+        board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+        depth (int): La profundidad de la búsqueda.
+        previous_score (float o None): Puntuación de la iteración anterior (jugador al turno),
+                                       o None para buscar con la ventana completa.
+        context (SearchContext): Estado de la búsqueda.
+
+    Returns:
+        tuple: (puntuación para el jugador al turno, mejor movimiento).
+    """
+    if previous_score is None or is_mate_score(previous_score):
+        return negamax(board, depth, -math.inf, math.inf, context)
+
+    delta = ASPIRATION_WINDOW
+    alpha, beta = previous_score - delta, previous_score + delta
+    while True:
+        score, move = negamax(board, depth, alpha, beta, context)
+        if score <= alpha:
+            alpha = score - delta # Falla por abajo: el valor real es <= score
+        elif score >= beta:
+            beta = score + delta # Falla por arriba: el valor real es >= score
+        else:
+            return score, move # Resultado exacto dentro de la ventana
+        delta *= 4 # Cada repetición amplía más la ventana
+
+def principal_variation(board, tt, max_length=MAX_ITERATIVE_DEPTH):
+    """
+    Reconstruye la variante principal siguiendo los mejores movimientos guardados en la tabla.
+
+    Args:
+        board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+        tt (TranspositionTable): Tabla de transposición de la última búsqueda.
+        max_length (int): Número máximo de movimientos a reconstruir.
+
+    Returns:
+        list: Lista de chess.Move con la secuencia de mejores movimientos.
+    """
+    pv = []
+    board = board.copy(stack=False) # Copia para no modificar el tablero original
+    seen = set() # Posiciones ya visitadas (evita ciclos en la tabla)
+    while len(pv) < max_length:
+        key = position_key(board)
+        if key in seen:
+            break
+        seen.add(key)
+        move = tt.best_move(key)
+        if move is None or not board.is_legal(move): # Sin entrada o entrada de otra posición
+            break
+        pv.append(move)
+        board.push(move)
+    return pv
+
+def _proven_mate(score, depth):
+    # True si una búsqueda completa a 'depth' demuestra un mate: todas las líneas más cortas
+    # ya se han buscado, así que ninguna búsqueda más profunda puede cambiar el resultado.
+    return is_mate_score(score) and abs(mate_in_plies(score)) <= depth
+
+def _cache_depth(score, depth):
+    # Profundidad con la que se guarda un resultado en la caché: un mate demostrado queda
+    # resuelto y se guarda a MAX_ITERATIVE_DEPTH, para que sirva a cualquier profundidad pedida.
+    return MAX_ITERATIVE_DEPTH if _proven_mate(score, depth) else depth
+
+def _restore(board, stack_size):
+    # Deshace los movimientos que una búsqueda interrumpida dejó aplicados en el tablero
+    while len(board.move_stack) > stack_size:
+        board.pop()
+
+def _record_iteration(board, depth, score, context, start, nodes_before):
+    # Anota una profundidad completada en las estadísticas de la búsqueda (si están activadas)
+    if context.stats is None:
+        return
+    pv = principal_variation(board, context.tt, depth) if context.tt is not None else []
+    context.stats.record_iteration(depth, context.nodes - nodes_before, time.perf_counter() - start, score, pv)
+
+def find_best_move(board, depth=None, tt=None, time_limit=None, use_tablebase=True, move_ordering=True, context=None,
+                   compact=False, cache=None, use_ladder=False):
+    """
+    Función envoltorio para iniciar la búsqueda para el jugador al que le toca mover
+    (en la partida, siempre Blancas).
+
+    Si la tabla de finales KRRK está generada y cubre la posición, el movimiento se
+    toma directamente de ella (juego perfecto, sin búsqueda). Con use_ladder, las
+    posiciones de dos Torres contra Rey se resuelven con la regla del mate de la escalera
+    (LadderMate), y solo se busca cuando la regla no se puede aplicar.
+
+    Si se indica un tiempo límite, la búsqueda se hace por profundización iterativa:
+    se busca a profundidad 1, 2, 3... (cada iteración empieza por la variante principal
+    de la anterior) y se devuelve el mejor movimiento de la última profundidad completada
+    antes de agotar el tiempo. Si una iteración demuestra un mate dentro de su horizonte,
+    se deja de profundizar: una búsqueda más profunda no puede encontrar uno más corto.
+
+    La raíz se busca con una ventana de aspiración centrada en la puntuación anterior
+    (la de la iteración previa, o la guardada en la tabla de transposición).
 
     Args:
         board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
         depth (int): La profundidad máxima a la que el algoritmo debe buscar.
+                     Con tiempo límite es opcional y solo actúa como tope.
+        tt (TranspositionTable, opcional): Tabla de transposición que se conserva entre
+                                           movimientos de la misma partida.
+        time_limit (float, opcional): Tiempo máximo de búsqueda en segundos.
+        use_tablebase (bool): Si es False, no se consulta la tabla de finales (útil para
+                              medir la búsqueda por sí sola).
+        move_ordering (bool): Si es False, se desactiva la ordenación de movimientos.
+        context (SearchContext, opcional): Estado de búsqueda ya creado por el llamador (por
+                                           ejemplo, para leer después context.nodes). Si se
+                                           indica, se ignoran tt y move_ordering.
+        compact (bool): Si es True y la posición es un final KRRK, la búsqueda se hace sobre
+                        un KRRKBoard (más rápido de mover y deshacer que chess.Board). El
+                        movimiento devuelto es el mismo chess.Move en ambos casos.
+        cache (SearchCache, opcional): Caché persistente en disco. Si guarda un resultado de
+                                       esta posición suficientemente profundo, se devuelve sin
+                                       buscar; si no, se guarda el de esta búsqueda. A profundidad
+                                       fija, debe llegar a la profundidad pedida; con tiempo límite,
+                                       a la que completa normalmente ese tiempo (tope: depth). Un
+                                       mate demostrado sirve para cualquier profundidad.
+        use_ladder (bool): Si es True, se prueba antes la regla del mate de la escalera
+                           (microsegundos en lugar de una búsqueda, aunque no siempre el mate
+                           más corto). La regla va antes que la caché: la caché solo guarda
+                           resultados de búsquedas, así que con la regla activa sirve las
+                           posiciones en las que la regla no se aplica (Negras al turno,
+                           KRK, o la regla sin movimiento válido).
 
     Returns:
         chess.Move: El mejor movimiento que la IA (Blancas) debe realizar.
+
+    Raises:
+        ValueError: Si no se indica ni profundidad ni tiempo límite.
+        SearchTimeout: Si se agota el tiempo o se activa stop_event en una búsqueda a
+                       profundidad fija. El tablero queda como estaba antes de la llamada.
     """
-    # Inicia la búsqueda Minimax con los valores iniciales de alpha (-inf) y beta (+inf).
-    # Se indica que el jugador actual es el maximizador (True) porque es el turno de Blancas.
-    score, move = minimax(board, depth, -math.inf, math.inf, True)
-    return move # Devuelve solo el mejor movimiento
\ No newline at end of file
+    if depth is None and time_limit is None:
+        raise ValueError("find_best_move needs a depth or a time limit")
+
+    # --- Consulta de la Tabla de Finales ---
+    # Una posición KRRK o KRK se responde al instante y de forma perfecta desde la tabla.
+    if use_tablebase:
+        tablebase = get_tablebase()
+        if tablebase is not None:
+            move = tablebase.best_move(board)
+            if move is not None:
+                return move
+
+    # --- Mate de la Escalera ---
+    # Con dos Torres contra Rey, la técnica conocida da un movimiento que progresa sin buscar.
+    # Se consulta antes que la caché: cuesta menos que una consulta a SQLite y, cuando se
+    # aplica, la caché no tendría nada guardado (solo guarda resultados de búsquedas).
+    if use_ladder and isinstance(board, chess.Board):
+        move = ladder_move(board)
+        if move is not None:
+            return move
+
+    # --- Consulta de la Caché Persistente ---
+    # Solo se usa si la posición no se ha repetido en la partida: el resultado guardado no
+    # tiene en cuenta el historial (y con él, las tablas por repetición).
+    if cache is not None and board.is_repetition(2):
+        cache = None
+    if cache is not None:
+        # Con tiempo límite, el resultado guardado debe ser al menos tan profundo como lo que
+        # completa normalmente ese tiempo (con depth como tope): una búsqueda interrumpida pronto
+        # no sustituye a una completa. Sin ninguna búsqueda medida con ese tiempo, se busca.
+        required = depth
+        if time_limit is not None:
+            expected = cache.expected_depth(time_limit)
+            required = None if expected is None else min(expected, depth if depth is not None else MAX_ITERATIVE_DEPTH)
+        cached = cache.lookup(board, required) if required is not None else None
+        if cached is not None:
+            return cached[0]
+    cache_board = board # Posición original (la clave es la misma con el tablero compacto)
+
+    # --- Tablero Compacto ---
+    if compact and isinstance(board, chess.Board) and KRRKBoard.supports(board):
+        board = KRRKBoard.from_board(board) # Copia compacta: el tablero del llamador no se modifica
+
+    if context is None:
+        context = SearchContext(tt, move_ordering=move_ordering)
+    if context.tt is not None:
+        context.tt.new_search() # Las entradas de búsquedas anteriores pasan a ser reemplazables
+    stack_size = len(board.move_stack) # Para restaurar el tablero si la búsqueda se interrumpe
+
+    # --- Búsqueda a Profundidad Fija ---
+    if time_limit is None:
+        # La ventana de aspiración se centra en la puntuación que la tabla guarda de esta
+        # posición (de la búsqueda del turno anterior), si la hay.
+        previous_score = None
+        if context.tt is not None:
+            entry = context.tt.entry(position_key(board))
+            if entry is not None:
+                previous_score = entry[2]
+        start, nodes_before = time.perf_counter(), context.nodes
+        try:
+            score, move = aspiration_search(board, depth, previous_score, context)
+        finally:
+            _restore(board, stack_size) # Si se interrumpe, deshace los movimientos que quedaron aplicados
+        _record_iteration(board, depth, score, context, start, nodes_before)
+        if cache is not None:
+            cache.store(cache_board, _cache_depth(score, depth), move, score)
+        return move # Devuelve solo el mejor movimiento
+
+    # --- Profundización Iterativa con Tiempo Límite ---
+    max_depth = depth if depth is not None else MAX_ITERATIVE_DEPTH
+    if context.tt is None:
+        # La tabla es la que transmite la variante principal de una iteración a la siguiente.
+        context.tt = TranspositionTable(DEFAULT_TT_SIZE_MB)
+
+    # La profundidad 1 se completa siempre, sin tiempo límite ni señal de parada, para tener
+    # al menos un movimiento (una parada pedida durante ella se atiende en la profundidad 2).
+    context.deadline = None
+    stop_event, context.stop_event = context.stop_event, None
+    start, nodes_before = time.perf_counter(), context.nodes
+    try:
+        score, best_move = negamax(board, 1, -math.inf, math.inf, context)
+    finally:
+        context.stop_event = stop_event
+        _restore(board, stack_size)
+    _record_iteration(board, 1, score, context, start, nodes_before)
+    completed_depth, best_score = 1, score # Última profundidad completada y su puntuación
+    context.deadline = time.monotonic() + time_limit # Instante en el que hay que detener la búsqueda
+    for current_depth in range(2, max_depth + 1):
+        if _proven_mate(score, completed_depth):
+            break # Mate demostrado: todas las líneas más cortas ya se han buscado
+        start, nodes_before = time.perf_counter(), context.nodes
+        try:
+            # Ventana de aspiración centrada en la puntuación de la iteración anterior.
+            score, move = aspiration_search(board, current_depth, score, context)
+        except SearchTimeout:
+            break
+        finally:
+            _restore(board, stack_size) # Deshace los movimientos que quedaron aplicados al interrumpir la recursión
+        if move is not None:
+            best_move = move # Mejor movimiento de la última profundidad completada
+            completed_depth, best_score = current_depth, score
+        _record_iteration(board, current_depth, score, context, start, nodes_before)
+    if cache is not None:
+        if not _proven_mate(best_score, completed_depth):
+            cache.record_reached_depth(time_limit, completed_depth) # Un mate corta la búsqueda antes de tiempo
+        cache.store(cache_board, _cache_depth(best_score, completed_depth), best_move, best_score)
+    return best_move # Devuelve solo el mejor movimiento
\ No newline at end of file
@@ -0,0 +1,148 @@
+import chess # Importa la librería python-chess para la lógica del ajedrez
+
+# --- Prioridades de Ordenación ---
+# Cada nivel domina por completo a los siguientes: primero el movimiento de la tabla de
+# transposición (variante principal), luego los jaques, luego los que reducen la movilidad
+# del Rey Negro, luego los movimientos asesinos (killer moves) y por último la historia.
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 26 # Capturas (en este final, el Rey Negro capturando una torre)
+CHECK_SCORE = 1 << 24
+MOBILITY_SCORE = 1 << 20 # Por cada casilla de escape que se le quita al Rey Negro
+KILLER_SCORES = (1 << 19, 1 << 18) # Primer y segundo movimiento asesino de la misma profundidad
+HISTORY_MAX = (1 << 18) - 1 # Tope de la puntuación de historia, para no invadir el nivel anterior
+KILLERS_PER_PLY = 2 # Movimientos asesinos guardados por cada nivel del árbol
+
+
+def _attacks(piece_type, color, square, occupied):
+    """
+    Casillas atacadas por una pieza desde 'square' con la ocupación 'occupied'.
+    """
+    if piece_type == chess.PAWN:
+        return chess.BB_PAWN_ATTACKS[color][square]
+    if piece_type == chess.KNIGHT:
+        return chess.BB_KNIGHT_ATTACKS[square]
+    if piece_type == chess.KING:
+        return chess.BB_KING_ATTACKS[square]
+    attacks = 0
+    if piece_type in (chess.ROOK, chess.QUEEN): # Filas y columnas
+        attacks |= (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] |
+                    chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+    if piece_type in (chess.BISHOP, chess.QUEEN): # Diagonales
+        attacks |= chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+    return attacks
+
+
+class MoveOrderer:
+    """
+    Ordena los movimientos de cada nodo para que la poda Alpha-Beta corte lo antes posible.
+
+    Guarda el estado que se aprende durante la búsqueda: los movimientos asesinos
+    (los que provocaron un corte en la misma profundidad) y la tabla de historia
+    (cuántas veces y a qué profundidad cada movimiento provocó un corte).
+    """
+
+    def __init__(self):
+        self.killers = [] # killers[ply] = lista con los últimos movimientos asesinos de ese nivel
+        self.history = [[0] * (64 * 64) for _ in chess.COLORS] # history[color][origen * 64 + destino]
+
+    def order(self, board, moves, tt_move, ply):
+        """
+        Devuelve los movimientos ordenados del más prometedor al menos prometedor.
+
+        Args:
+            board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+            moves (list): Lista de movimientos legales de la posición.
+            tt_move (chess.Move o None): Mejor movimiento guardado en la tabla de transposición.
+            ply (int): Distancia (en medias jugadas) desde la raíz de la búsqueda.
+
+        Returns:
+            list: Los mismos movimientos, ordenados.
+        """
+        us = board.turn
+        them = not us
+        occupied = board.occupied
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history[us]
+
+        # --- Datos del Rey Rival (para jaques y movilidad) ---
+        # Solo tiene sentido para el bando atacante (el que tiene piezas además del rey).
+        their_king = board.king(them) if board.occupied_co[us] & ~board.kings else None
+        if their_king is not None:
+            king_bb = chess.BB_SQUARES[their_king]
+            ring = chess.BB_KING_ATTACKS[their_king] & ~board.occupied_co[them] # Casillas de escape del rey rival
+            # Casillas atacadas actualmente por cada una de nuestras piezas (ignorando al rey rival,
+            # que no bloquea los ataques sobre sus propias casillas de escape).
+            piece_attacks = {}
+            for square in chess.scan_forward(board.occupied_co[us]):
+                piece_type = board.piece_type_at(square)
+                piece_attacks[square] = _attacks(piece_type, us, square, occupied & ~king_bb)
+
+        scores = []
+        for move in moves:
+            if move == tt_move:
+                scores.append(HASH_MOVE_SCORE)
+                continue
+            score = 0
+            if board.is_capture(move):
+                score += CAPTURE_SCORE
+
+            if their_king is not None:
+                # Ocupación después del movimiento
+                after = (occupied & ~chess.BB_SQUARES[move.from_square]) | chess.BB_SQUARES[move.to_square]
+                piece_type = move.promotion or board.piece_type_at(move.from_square)
+                moved_attacks = _attacks(piece_type, us, move.to_square, after)
+
+                # --- Jaques (directos y descubiertos) ---
+                gives_check = bool(moved_attacks & king_bb)
+                if not gives_check:
+                    for square in chess.scan_forward(board.occupied_co[us] & ~board.kings & ~board.knights & ~board.pawns):
+                        if square != move.from_square and _attacks(board.piece_type_at(square), us, square, after) & king_bb:
+                            gives_check = True
+                            break
+                if gives_check:
+                    score += CHECK_SCORE
+
+                # --- Movilidad del Rey Rival ---
+                # Se cuentan las casillas de escape que quedan cubiertas tras el movimiento.
+                covered = moved_attacks & ~king_bb
+                for square, attacks in piece_attacks.items():
+                    if square != move.from_square:
+                        covered |= attacks
+                score += MOBILITY_SCORE * chess.popcount(ring & covered)
+
+            # --- Movimientos Asesinos e Historia ---
+            if move in killers:
+                score += KILLER_SCORES[killers.index(move)]
+            score += history[move.from_square * 64 + move.to_square]
+            scores.append(score)
+
+        # Orden estable: a igualdad de puntuación se conserva el orden del generador.
+        order = sorted(range(len(moves)), key=scores.__getitem__, reverse=True)
+        return [moves[i] for i in order]
+
+    def record_cutoff(self, board, move, ply, depth):
+        """
+        Registra que un movimiento provocó un corte beta.
+
+        Args:
+            board (chess.Board): El tablero en la posición donde se jugó el movimiento.
+            move (chess.Move): El movimiento que provocó el corte.
+            ply (int): Distancia (en medias jugadas) desde la raíz de la búsqueda.
+            depth (int): Profundidad restante en ese nodo.
+        """
+        if board.is_capture(move):
+            return # Las capturas ya se ordenan primero por sí mismas
+
+        # --- Movimientos Asesinos ---
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move) # El más reciente pasa a ser el primero
+            del killers[KILLERS_PER_PLY:]
+
+        # --- Historia ---
+        # Los cortes cerca de la raíz (mayor profundidad) pesan más.
+        index = move.from_square * 64 + move.to_square
+        history = self.history[board.turn]
+        history[index] = min(HISTORY_MAX, history[index] + depth * depth)
@@ -0,0 +1,203 @@
+import math # Importa el módulo math para usar 'inf' (infinito)
+import multiprocessing # Importa multiprocessing para compartir la cota alpha entre procesos
+import os # Importa os para conocer el número de núcleos
+import sys # Importa sys para leer argumentos de la línea de comandos
+import time # Importa time para medir la aceleración frente a la búsqueda en serie
+from concurrent.futures import ProcessPoolExecutor, as_completed # Importa el grupo de procesos
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from Minimax import negamax, find_best_move, SearchContext # Importa el núcleo de búsqueda
+from MoveOrdering import MoveOrderer # Importa la ordenación de movimientos para repartir la raíz
+from Tablebase import get_tablebase # Importa la tabla de finales (si está generada)
+from TranspositionTable import TranspositionTable, position_key # Importa la tabla de transposición de cada proceso
+
+# --- Búsqueda Paralela por División de la Raíz ---
+# El primer movimiento de la raíz (el más prometedor) se busca en serie para obtener una
+# cota alpha. El resto de movimientos se reparte entre un grupo de procesos; cada uno lee
+# la mejor cota alpha compartida al empezar su movimiento y la actualiza si la mejora.
+# Cada proceso tiene su propia tabla de transposición, que se conserva entre movimientos.
+#
+# Solo se usa para medir la aceleración (benchmark_speedup y este módulo como script): la
+# partida, el servidor y UCI buscan por profundización iterativa con tiempo límite y señal
+# de parada, que esta búsqueda a profundidad fija no admite.
+
+# Presupuesto de memoria (MB) de la tabla de transposición de cada proceso.
+WORKER_TT_SIZE_MB = 16
+
+# --- Estado de Cada Proceso Trabajador ---
+_shared_alpha = None # multiprocessing.Value con la mejor puntuación conocida en la raíz
+_worker_context = None # SearchContext propio del proceso (tabla de transposición incluida)
+
+def _init_worker(shared_alpha):
+    """
+    Inicializa un proceso trabajador (se ejecuta una vez al crear el proceso).
+    """
+    global _shared_alpha, _worker_context
+    _shared_alpha = shared_alpha
+    _worker_context = SearchContext(TranspositionTable(WORKER_TT_SIZE_MB))
+
+def _search_root_move(board, move, depth):
+    """
+    Busca un movimiento de la raíz en un proceso trabajador.
+
+    Returns:
+        tuple: (movimiento, puntuación para el jugador de la raíz, True si la puntuación es
+                exacta, nodos visitados). Si no supera la alpha con la que se buscó, la
+                puntuación (fail-soft) es solo una cota superior.
+    """
+    context = _worker_context
+    context.tt.new_search()
+    nodes_before = context.nodes
+    alpha = _shared_alpha.value # Mejor puntuación ya asegurada por otro movimiento de la raíz
+    context.set_root(board) # Historial de la partida, para detectar repeticiones
+    key = context.push(board, move)
+    try:
+        # Ventana (alpha, +inf): solo interesa saber si el movimiento mejora alpha, y cuánto.
+        score = -negamax(board, depth - 1, -math.inf, -alpha, context, 1, key)[0]
+    finally:
+        context.pop(board, key) # El contexto (repeticiones, evaluación) vuelve a la raíz
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score # Comparte la nueva cota con el resto de procesos
+    return move, score, score > alpha, context.nodes - nodes_before
+
+
+class ParallelSearcher:
+    """
+    Búsqueda en paralelo de la raíz con un grupo de procesos reutilizable.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int, opcional): Número de procesos. Por defecto, uno por núcleo.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.shared_alpha = multiprocessing.Value("d", -math.inf)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.shared_alpha,))
+        self.context = SearchContext(TranspositionTable(WORKER_TT_SIZE_MB)) # Para el primer movimiento (en serie)
+        self.nodes = 0 # Nodos visitados en la última búsqueda (sumando todos los procesos)
+
+    def search(self, board, depth):
+        """
+        Busca el mejor movimiento a profundidad fija repartiendo la raíz entre los procesos.
+
+        Args:
+            board (chess.Board): El objeto del tablero de ajedrez en su estado actual.
+            depth (int): La profundidad de la búsqueda.
+
+        Returns:
+            tuple: (puntuación para el jugador al turno, mejor movimiento).
+        """
+        moves = list(board.legal_moves)
+        if not moves or depth < 1:
+            return negamax(board, depth, -math.inf, math.inf, self.context)
+        moves = MoveOrderer().order(board, moves, None, 0)
+
+        # --- Primer Movimiento en Serie ---
+        nodes_before = self.context.nodes
+        self.context.tt.new_search()
+        self.context.set_root(board)
+        key = self.context.push(board, moves[0])
+        try:
+            best_score = -negamax(board, depth - 1, -math.inf, math.inf, self.context, 1, key)[0]
+        finally:
+            self.context.pop(board, key)
+        best_move = moves[0]
+        self.nodes = self.context.nodes - nodes_before
+
+        # --- Resto de Movimientos en Paralelo ---
+        self.shared_alpha.value = best_score
+        futures = {self.pool.submit(_search_root_move, board, move, depth): index
+                   for index, move in enumerate(moves[1:], 1)}
+        results = []
+        for future in as_completed(futures):
+            move, score, exact, nodes = future.result()
+            self.nodes += nodes
+            results.append((futures[future], move, score, exact))
+        # Solo cuentan las puntuaciones exactas: una cota superior igual a la mejor puntuación
+        # no demuestra que el movimiento sea tan bueno. (La alpha compartida solo guarda
+        # puntuaciones exactas, así que el mejor movimiento siempre tiene una.) A igualdad de
+        # puntuación gana el movimiento que va antes en la ordenación.
+        for index, move, score, exact in sorted(results, key=lambda result: result[0]):
+            if exact and score > best_score:
+                best_score, best_move = score, move
+        return best_score, best_move
+
+    def find_best_move(self, board, depth, use_tablebase=True):
+        """
+        Igual que Minimax.find_best_move a profundidad fija, pero en paralelo.
+        """
+        if use_tablebase:
+            tablebase = get_tablebase()
+            if tablebase is not None:
+                move = tablebase.best_move(board)
+                if move is not None:
+                    return move
+        return self.search(board, depth)[1]
+
+    def close(self):
+        """
+        Detiene los procesos trabajadores.
+        """
+        self.pool.shutdown()
+
+
+def benchmark_speedup(fens, depth, workers=None):
+    """
+    Compara la búsqueda en serie con la búsqueda en paralelo a la misma profundidad.
+
+    Args:
+        fens (list): Posiciones (FEN) a analizar.
+        depth (int): Profundidad de ambas búsquedas.
+        workers (int, opcional): Número de procesos de la búsqueda en paralelo.
+
+    Returns:
+        dict: Tiempos totales, aceleración y resultado de cada posición (movimiento y
+              puntuación de ambas búsquedas).
+    """
+    searcher = ParallelSearcher(workers)
+    report = {"depth": depth, "workers": searcher.workers, "positions": []}
+    serial_total = parallel_total = 0.0
+    try:
+        for fen in fens:
+            board = chess.Board(fen)
+
+            start = time.perf_counter()
+            context = SearchContext(TranspositionTable(WORKER_TT_SIZE_MB))
+            serial_move = find_best_move(board, depth, context=context, use_tablebase=False)
+            serial_time = time.perf_counter() - start
+            # Puntuación exacta de la raíz, la última que guardó la propia búsqueda medida
+            serial_score = context.tt.entry(position_key(board))[2]
+
+            start = time.perf_counter()
+            parallel_score, parallel_move = searcher.search(board, depth)
+            parallel_time = time.perf_counter() - start
+
+            serial_total += serial_time
+            parallel_total += parallel_time
+            report["positions"].append({
+                "fen": fen,
+                "serial_move": serial_move.uci(), "serial_score": serial_score,
+                "serial_time": serial_time, "serial_nodes": context.nodes,
+                "parallel_move": parallel_move.uci(), "parallel_score": parallel_score,
+                "parallel_time": parallel_time, "parallel_nodes": searcher.nodes,
+            })
+    finally:
+        searcher.close()
+    report["serial_time"] = serial_total
+    report["parallel_time"] = parallel_total
+    report["speedup"] = serial_total / parallel_total if parallel_total else 0.0
+    return report
+
+
+if __name__ == "__main__":
+    # Uso: python ParallelSearch.py [profundidad] [procesos] [FEN ...]
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    fens = sys.argv[3:] or ["8/8/3k4/8/8/2K5/6R1/7R w - - 0 1", "7R/8/8/3k4/8/8/1R6/4K3 w - - 0 1"]
+    report = benchmark_speedup(fens, depth, workers)
+    for position in report["positions"]:
+        print(f"{position['fen']}: serial {position['serial_move']} ({position['serial_score']}, "
+              f"{position['serial_time']:.2f}s) | parallel {position['parallel_move']} "
+              f"({position['parallel_score']}, {position['parallel_time']:.2f}s)")
+    print(f"Depth {depth}, {report['workers']} workers: speedup x{report['speedup']:.2f}")
@@ -0,0 +1,186 @@
+import os # Importa os para construir la ruta por defecto junto al módulo
+import sqlite3 # Importa sqlite3 para guardar la caché en disco
+import threading # Importa threading para proteger la conexión (la búsqueda corre en otro hilo)
+import chess # Importa la librería python-chess para reconstruir los movimientos guardados
+from TranspositionTable import canonical_key, transform_move, INVERSE_TRANSFORMS # Importa la clave canónica (común a las posiciones simétricas)
+
+# --- Caché Persistente de Búsquedas ---
+# Guarda en un archivo SQLite el mejor movimiento y la puntuación de cada posición buscada,
+# junto con la profundidad alcanzada, para que las posiciones repetidas (o transpuestas) en
+# partidas posteriores cuesten una consulta en lugar de una búsqueda. Las posiciones se
+# guardan por su clave canónica, así que las variantes simétricas (reflejos y rotaciones)
+# comparten entrada; el movimiento se guarda en la orientación canónica.
+# Las búsquedas con tiempo límite anotan además la profundidad que completan, para que un
+# resultado solo se sirva si es tan profundo como lo que ese tiempo alcanza normalmente.
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 200000 # Número máximo de posiciones guardadas (las menos usadas se descartan)
+EVICTION_INTERVAL = 64 # Cada cuántas escrituras se comprueba el tamaño de la caché
+REACHED_DEPTH_SAMPLES = 16 # Búsquedas por tiempo recientes con las que se estima la profundidad habitual
+# Versión del contenido: se incrementa cuando cambia la evaluación o la búsqueda, para que
+# los resultados guardados por versiones anteriores se descarten en lugar de reutilizarse.
+FORMAT_VERSION = 4
+
+
+def _to_signed(key):
+    # SQLite guarda enteros de 64 bits con signo; el hash Zobrist no tiene signo.
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+class SearchCache:
+    """
+    Caché de resultados de find_best_move en un archivo SQLite, con descarte de las
+    entradas menos usadas recientemente (LRU) cuando se supera el tamaño máximo.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path (str): Ruta del archivo SQLite (se crea si no existe; ":memory:" para pruebas).
+            max_entries (int): Número máximo de posiciones guardadas.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        # La conexión se comparte entre el hilo principal y el de la búsqueda (protegida por el lock).
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL") # Escrituras rápidas sin bloquear las lecturas
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != FORMAT_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS positions") # Resultados de otra versión del motor
+            self.connection.execute("DROP TABLE IF EXISTS reached_depths")
+            self.connection.execute(f"PRAGMA user_version={FORMAT_VERSION}")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS positions ("
+            "key INTEGER PRIMARY KEY, depth INTEGER NOT NULL, move TEXT NOT NULL, "
+            "score REAL NOT NULL, last_used INTEGER NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS positions_last_used ON positions (last_used)")
+        # Profundidades completadas por las búsquedas con tiempo límite (ver expected_depth).
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS reached_depths (time_limit REAL NOT NULL, depth INTEGER NOT NULL)")
+        self.connection.commit()
+        # Reloj lógico para el LRU: continúa desde el último valor guardado.
+        self.clock = self.connection.execute("SELECT COALESCE(MAX(last_used), 0) FROM positions").fetchone()[0]
+        self.writes = 0 # Escrituras desde la última comprobación de tamaño
+        self.hits = 0 # Consultas que devolvieron un movimiento
+        self.misses = 0 # Consultas sin resultado utilizable
+
+    def lookup(self, board, depth):
+        """
+        Busca un resultado guardado para la posición.
+
+        Args:
+            board (chess.Board): La posición.
+            depth (int): Profundidad mínima que debe tener el resultado guardado.
+
+        Returns:
+            tuple o None: (movimiento, puntuación para el jugador al turno, profundidad guardada),
+                          o None si no hay un resultado suficientemente profundo.
+        """
+        key, transform = canonical_key(board)
+        key = _to_signed(key)
+        with self.lock:
+            row = self.connection.execute("SELECT depth, move, score FROM positions WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] < depth:
+                self.misses += 1
+                return None
+            # Movimiento guardado en la orientación canónica: se devuelve a la de esta posición.
+            move = transform_move(chess.Move.from_uci(row[1]), INVERSE_TRANSFORMS[transform])
+            if not board.is_legal(move): # Colisión de hash (otra posición con la misma clave)
+                self.misses += 1
+                return None
+            self.clock += 1
+            self.connection.execute("UPDATE positions SET last_used = ? WHERE key = ?", (self.clock, key))
+            self.connection.commit()
+            self.hits += 1
+            return move, row[2], row[0]
+
+    def store(self, board, depth, move, score):
+        """
+        Guarda el resultado de una búsqueda. Si ya había uno más profundo, se conserva ese.
+
+        Args:
+            board (chess.Board): La posición buscada.
+            depth (int): Profundidad completada.
+            move (chess.Move): Mejor movimiento encontrado.
+            score (float): Puntuación para el jugador al turno.
+        """
+        if move is None:
+            return
+        key, transform = canonical_key(board)
+        key = _to_signed(key)
+        move = transform_move(move, transform) # Se guarda en la orientación canónica
+        with self.lock:
+            self.clock += 1
+            self.connection.execute(
+                "INSERT INTO positions (key, depth, move, score, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET depth = excluded.depth, move = excluded.move, "
+                "score = excluded.score, last_used = excluded.last_used WHERE excluded.depth >= positions.depth",
+                (key, depth, move.uci(), score, self.clock))
+            self.writes += 1
+            if self.writes >= EVICTION_INTERVAL:
+                self._evict()
+            self.connection.commit()
+
+    def record_reached_depth(self, time_limit, depth):
+        """
+        Anota (en el archivo, para las sesiones siguientes) la profundidad que completó una
+        búsqueda con tiempo límite (ver expected_depth).
+
+        Args:
+            time_limit (float): Tiempo límite de la búsqueda, en segundos.
+            depth (int): Última profundidad completada.
+        """
+        with self.lock:
+            self.connection.execute("INSERT INTO reached_depths (time_limit, depth) VALUES (?, ?)", (time_limit, depth))
+            # Solo se conservan las más recientes
+            self.connection.execute(
+                "DELETE FROM reached_depths WHERE time_limit = ? AND rowid NOT IN "
+                "(SELECT rowid FROM reached_depths WHERE time_limit = ? ORDER BY rowid DESC LIMIT ?)",
+                (time_limit, time_limit, REACHED_DEPTH_SAMPLES))
+            self.connection.commit()
+
+    def expected_depth(self, time_limit):
+        """
+        Profundidad que completa normalmente una búsqueda con este tiempo límite: la mediana
+        de las últimas búsquedas anotadas con record_reached_depth().
+
+        Args:
+            time_limit (float): Tiempo límite de la búsqueda, en segundos.
+
+        Returns:
+            int o None: La profundidad, o None si todavía no se ha anotado ninguna búsqueda.
+        """
+        with self.lock:
+            depths = [row[0] for row in self.connection.execute(
+                "SELECT depth FROM reached_depths WHERE time_limit = ? ORDER BY depth", (time_limit,))]
+        return depths[len(depths) // 2] if depths else None
+
+    def _evict(self):
+        # Descarta las entradas menos usadas recientemente hasta volver al tamaño máximo
+        self.writes = 0
+        excess = self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM positions WHERE key IN (SELECT key FROM positions ORDER BY last_used LIMIT ?)", (excess,))
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def close(self):
+        """
+        Aplica el límite de tamaño y cierra el archivo.
+        """
+        with self.lock:
+            self._evict()
+            self.connection.commit()
+            self.connection.close()
+
+    def __str__(self):
+        """
+        Resumen legible de la tasa de aciertos (para imprimir en consola).
+        """
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return f"Cache: {self.hits}/{lookups} hits ({rate:.1%})"
@@ -0,0 +1,204 @@
+import collections # Importa collections para contar las muestras del perfilador por muestreo
+import cProfile # Importa cProfile para perfilar una búsqueda completa
+import io # Importa io para capturar el informe de pstats como texto
+import pstats # Importa pstats para ordenar y volcar los resultados de cProfile
+import sys # Importa sys para leer la pila del hilo de búsqueda y los argumentos de la línea de comandos
+import threading # Importa threading para el hilo que toma las muestras
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from Minimax import find_best_move, SearchContext # Importa la búsqueda que se instrumenta
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición (necesaria para la variante principal)
+
+# Intervalo (en segundos) entre muestras del perfilador por muestreo.
+SAMPLE_INTERVAL = 0.001
+
+
+class SearchStats:
+    """
+    Estadísticas opcionales de una búsqueda. Se activan pasando una instancia a
+    SearchContext(stats=...); sin ella, negamax solo paga una comparación con None.
+    """
+
+    def __init__(self):
+        self.nodes_by_ply = [] # nodes_by_ply[ply] = nodos visitados a esa distancia de la raíz
+        self.leaf_evaluations = 0 # Llamadas a la función de evaluación (hojas y posiciones terminales)
+        self.cutoffs_by_index = [] # cutoffs_by_index[i] = cortes beta provocados por el movimiento i-ésimo
+        self.iterations = [] # Una entrada por profundidad completada (ver record_iteration)
+
+    def record_node(self, ply):
+        """
+        Cuenta un nodo visitado a distancia 'ply' de la raíz.
+        """
+        while len(self.nodes_by_ply) <= ply:
+            self.nodes_by_ply.append(0)
+        self.nodes_by_ply[ply] += 1
+
+    def record_cutoff(self, index):
+        """
+        Cuenta un corte beta provocado por el movimiento que ocupaba la posición 'index'
+        en la lista ordenada (0 = el primero).
+        """
+        while len(self.cutoffs_by_index) <= index:
+            self.cutoffs_by_index.append(0)
+        self.cutoffs_by_index[index] += 1
+
+    def record_iteration(self, depth, nodes, elapsed, score, pv):
+        """
+        Registra una profundidad completada.
+
+        Args:
+            depth (int): Profundidad de la iteración.
+            nodes (int): Nodos visitados durante la iteración.
+            elapsed (float): Tiempo de la iteración, en segundos.
+            score (float): Puntuación de la raíz (jugador al turno).
+            pv (list): Variante principal (lista de chess.Move).
+        """
+        self.iterations.append({
+            "depth": depth,
+            "nodes": nodes,
+            "time": elapsed,
+            "score": score,
+            "pv": [move.uci() for move in pv],
+        })
+
+    @property
+    def pv(self):
+        """
+        Variante principal de la última profundidad completada (en notación UCI).
+        """
+        return self.iterations[-1]["pv"] if self.iterations else []
+
+    def branching_factors(self):
+        """
+        Factor de ramificación efectivo entre profundidades consecutivas
+        (nodos de la iteración d / nodos de la iteración d - 1).
+        """
+        return [current["nodes"] / previous["nodes"]
+                for previous, current in zip(self.iterations, self.iterations[1:]) if previous["nodes"]]
+
+    def first_move_cutoff_rate(self):
+        """
+        Fracción de los cortes beta provocados por el primer movimiento (mide la ordenación).
+        """
+        total = sum(self.cutoffs_by_index)
+        return self.cutoffs_by_index[0] / total if total else 0.0
+
+    def to_dict(self):
+        """
+        Devuelve todas las estadísticas en un diccionario (serializable a JSON).
+        """
+        return {
+            "nodes_by_ply": self.nodes_by_ply,
+            "leaf_evaluations": self.leaf_evaluations,
+            "cutoffs_by_index": self.cutoffs_by_index,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate(),
+            "branching_factors": self.branching_factors(),
+            "iterations": self.iterations,
+            "pv": self.pv,
+        }
+
+    def __str__(self):
+        """
+        Resumen legible de las estadísticas (para imprimir en consola).
+        """
+        lines = [f"Nodes by ply: {self.nodes_by_ply}",
+                 f"Leaf evaluations: {self.leaf_evaluations}",
+                 f"Cutoffs by move index: {self.cutoffs_by_index} "
+                 f"({self.first_move_cutoff_rate():.1%} on the first move)"]
+        for iteration in self.iterations:
+            lines.append(f"Depth {iteration['depth']}: {iteration['nodes']} nodes in {iteration['time']:.3f}s, "
+                         f"score {iteration['score']}, pv {' '.join(iteration['pv'])}")
+        if self.branching_factors():
+            lines.append("Effective branching factor: " +
+                         ", ".join(f"{factor:.2f}" for factor in self.branching_factors()))
+        return "\n".join(lines)
+
+
+# --- Perfiladores ---
+
+def _sample_profile(function, *args, **kwargs):
+    # Ejecuta function en el hilo actual mientras otro hilo anota, cada SAMPLE_INTERVAL,
+    # qué función se está ejecutando (propio) y qué funciones están en la pila (acumulado).
+    target = threading.get_ident()
+    own = collections.Counter()
+    cumulative = collections.Counter()
+    done = threading.Event()
+
+    def sampler():
+        while not done.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            own[(frame.f_code.co_filename, frame.f_code.co_name)] += 1
+            seen = set()
+            while frame is not None:
+                name = (frame.f_code.co_filename, frame.f_code.co_name)
+                if name not in seen: # Las funciones recursivas solo cuentan una vez por muestra
+                    seen.add(name)
+                    cumulative[name] += 1
+                frame = frame.f_back
+
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        done.set()
+        thread.join()
+    return result, own, cumulative
+
+
+def profile_find_best_move(board, profiler="cprofile", output=None, top=25, **kwargs):
+    """
+    Ejecuta find_best_move bajo un perfilador y devuelve el informe.
+
+    Args:
+        board (chess.Board): Posición a analizar.
+        profiler (str): "cprofile" (determinista, cuenta cada llamada) o "sample" (por
+                        muestreo: apenas ralentiza la búsqueda, pero es aproximado).
+        output (str, opcional): Archivo donde volcar los resultados: con cProfile, en el
+                                formato de pstats (para snakeviz, gprof2dot...); por muestreo,
+                                como texto.
+        top (int): Número de funciones que se incluyen en el informe.
+        **kwargs: Argumentos para find_best_move (depth, time_limit, context...).
+
+    Returns:
+        tuple: (movimiento devuelto por find_best_move, informe en texto).
+    """
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        move = profile.runcall(find_best_move, board, **kwargs)
+        if output:
+            profile.dump_stats(output)
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(top)
+        return move, stream.getvalue()
+
+    if profiler == "sample":
+        move, own, cumulative = _sample_profile(find_best_move, board, **kwargs)
+        total = sum(own.values()) or 1
+        lines = [f"{total} samples every {SAMPLE_INTERVAL * 1000:.1f} ms", "  own%  cumul%  function"]
+        for name, count in own.most_common(top):
+            lines.append(f"{count / total:6.1%} {cumulative[name] / total:7.1%}  {name[1]} ({name[0]})")
+        report = "\n".join(lines)
+        if output:
+            with open(output, "w") as f:
+                f.write(report + "\n")
+        return move, report
+
+    raise ValueError(f"Unknown profiler: {profiler}")
+
+
+if __name__ == "__main__":
+    # Uso: python SearchStats.py [FEN] [profundidad] [cprofile|sample] [archivo de salida]
+    fen = sys.argv[1] if len(sys.argv) > 1 else "8/8/3k4/8/8/2K5/6R1/7R w - - 0 1"
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    profiler = sys.argv[3] if len(sys.argv) > 3 else "cprofile"
+    output = sys.argv[4] if len(sys.argv) > 4 else None
+
+    stats = SearchStats()
+    context = SearchContext(TranspositionTable(16), stats=stats)
+    move, report = profile_find_best_move(chess.Board(fen), profiler, output, depth=depth,
+                                          context=context, use_tablebase=False)
+    print(f"Best move: {move}")
+    print(stats)
+    print(report)
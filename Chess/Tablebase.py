@@ -0,0 +1,419 @@
+import mmap # Importa mmap para mapear el archivo de la tabla en memoria (páginas compartidas entre procesos)
+import os # Importa os para construir la ruta del archivo de la tabla
+import sys # Importa sys para leer argumentos de la línea de comandos
+import time # Importa time para medir la duración de la generación
+import chess # Importa la librería python-chess para la lógica del ajedrez
+
+# --- Tabla de Finales KRRK / KRK (Distancia al Mate) ---
+# Este módulo contiene:
+# 1. Un generador offline que resuelve por completo, mediante análisis retrógrado,
+#    los finales Rey + dos Torres contra Rey (KRRK) y Rey + Torre contra Rey (KRK),
+#    y escribe la distancia al mate (en medias jugadas) de cada posición en un archivo.
+# 2. Una capa de consulta que mapea el archivo en memoria (mmap), de modo que varios
+#    procesos comparten las mismas páginas sin cargar cada uno su propia copia.
+#
+# Para generar el archivo (requiere NumPy, solo en la generación):
+#     python Tablebase.py [ruta_de_salida]
+
+# Ruta por defecto del archivo, junto a este módulo.
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "krrk.dtm")
+# Cabecera que identifica el formato del archivo.
+MAGIC = b"KRRKDTM1"
+
+# --- Codificación de un Byte por Posición ---
+DRAW_BYTE = 0 # La posición es tablas (ahogado o las Negras capturan material suficiente)
+ILLEGAL_BYTE = 255 # La posición es ilegal (piezas superpuestas, reyes adyacentes, etc.)
+# Cualquier otro valor v significa que las Blancas dan mate en (v - 1) medias jugadas.
+
+# --- Simetría del Tablero ---
+# Sin peones ni enroques, una posición equivale a sus 8 reflejos y rotaciones.
+# Cada transformación se codifica con 3 bits: bit 0 refleja columnas, bit 1 refleja filas
+# y bit 2 intercambia filas por columnas (reflejo en la diagonal a1-h8).
+def _transform_square(square, t):
+    file, rank = chess.square_file(square), chess.square_rank(square)
+    if t & 1:
+        file = 7 - file
+    if t & 2:
+        rank = 7 - rank
+    if t & 4:
+        file, rank = rank, file
+    return chess.square(file, rank)
+
+TRANSFORMS = [[_transform_square(sq, t) for sq in chess.SQUARES] for t in range(8)] # TRANSFORMS[t][casilla]
+
+# El Rey Blanco se lleva siempre al triángulo a1-d1-d4 (10 casillas).
+TRIANGLE = [chess.A1, chess.B1, chess.C1, chess.D1, chess.B2, chess.C2, chess.D2, chess.C3, chess.D3, chess.D4]
+TRIANGLE_INDEX = {sq: i for i, sq in enumerate(TRIANGLE)} # Casilla del triángulo -> índice 0-9
+# Para cada casilla, la primera transformación que lleva esa casilla al triángulo.
+CANONICAL_TRANSFORM = [next(t for t in range(8) if TRANSFORMS[t][sq] in TRIANGLE_INDEX) for sq in chess.SQUARES]
+
+# --- Tamaños de las Secciones del Archivo ---
+ROOK_PAIRS = 64 * 63 // 2 # Pares no ordenados de casillas distintas para las dos torres (son intercambiables)
+KRK_SIZE = 10 * 64 * 64 # Rey Blanco (10) x Rey Negro (64) x Torre (64)
+KRRK_SIZE = 10 * 64 * ROOK_PAIRS # Rey Blanco (10) x Rey Negro (64) x par de Torres (2016)
+# Orden de las secciones: KRK con Blancas al turno, KRK con Negras, KRRK con Blancas, KRRK con Negras.
+KRK_OFFSET = len(MAGIC)
+KRRK_OFFSET = KRK_OFFSET + 2 * KRK_SIZE
+FILE_SIZE = KRRK_OFFSET + 2 * KRRK_SIZE
+
+
+def _pair_index(a, b):
+    """
+    Índice (0-2015) del par no ordenado de casillas {a, b}, con a < b.
+    """
+    return a * 63 - a * (a - 1) // 2 + (b - a - 1)
+
+
+class Tablebase:
+    """
+    Consulta de la tabla de finales KRRK/KRK mapeada en memoria.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Args:
+            path (str): Ruta del archivo generado con generate().
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        # Mapeo de solo lectura: el sistema operativo comparte estas páginas entre procesos.
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) != FILE_SIZE or self._data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a KRRK tablebase file")
+
+    def close(self):
+        """
+        Libera el mapeo en memoria y cierra el archivo.
+        """
+        self._data.close()
+        self._file.close()
+
+    def _offset(self, board):
+        """
+        Calcula la posición (byte) del archivo donde está guardado el tablero.
+        Lanza KeyError si el material no corresponde a KRRK o KRK.
+        Devuelve None si solo quedan los dos reyes.
+        """
+        if board.castling_rights or board.ep_square is not None:
+            raise KeyError("castling or en passant rights are not covered")
+        white_king = board.king(chess.WHITE)
+        black_king = board.king(chess.BLACK)
+        rooks = list(board.pieces(chess.ROOK, chess.WHITE))
+        # Solo se admiten Rey Blanco + 0, 1 o 2 Torres Blancas contra Rey Negro solo.
+        if (white_king is None or black_king is None or len(rooks) > 2 or
+                chess.popcount(board.occupied) != 2 + len(rooks)):
+            raise KeyError("material is not KRRK, KRK or KK")
+        if not rooks:
+            return None # Rey contra Rey: siempre tablas
+
+        # Se transforma la posición para que el Rey Blanco quede en el triángulo a1-d1-d4.
+        t = CANONICAL_TRANSFORM[white_king]
+        squares = TRANSFORMS[t]
+        index = TRIANGLE_INDEX[squares[white_king]] * 64 + squares[black_king]
+        if len(rooks) == 1:
+            base = KRK_OFFSET + (0 if board.turn == chess.WHITE else KRK_SIZE)
+            return base + index * 64 + squares[rooks[0]]
+        r1, r2 = sorted((squares[rooks[0]], squares[rooks[1]]))
+        base = KRRK_OFFSET + (0 if board.turn == chess.WHITE else KRRK_SIZE)
+        return base + index * ROOK_PAIRS + _pair_index(r1, r2)
+
+    def probe(self, board):
+        """
+        Consulta la distancia al mate de una posición.
+
+        Args:
+            board (chess.Board): Posición KRRK, KRK o KK.
+
+        Returns:
+            int o None: Número de medias jugadas hasta que las Blancas dan mate con juego
+                        perfecto de ambos bandos, o None si la posición es tablas.
+
+        Raises:
+            KeyError: Si la posición no está cubierta por la tabla (otro material o posición ilegal).
+        """
+        offset = self._offset(board)
+        if offset is None:
+            return None
+        value = self._data[offset]
+        if value == ILLEGAL_BYTE:
+            raise KeyError("illegal position")
+        if value == DRAW_BYTE:
+            return None
+        return value - 1
+
+    def best_move(self, board):
+        """
+        Devuelve el movimiento perfecto según la tabla.
+
+        Con Blancas al turno, el movimiento que da mate más rápido; con Negras al turno,
+        el que más lo retrasa (o uno que lleve a tablas si existe).
+
+        Args:
+            board (chess.Board): Posición KRRK o KRK.
+
+        Returns:
+            chess.Move o None: El mejor movimiento, o None si la posición no está cubierta,
+                               es tablas para las Blancas o no hay movimientos legales.
+        """
+        best_move, best_dtm = None, None
+        try:
+            self._offset(board) # Comprueba que el material esté cubierto antes de generar movimientos
+            for move in board.legal_moves:
+                board.push(move)
+                try:
+                    dtm = self.probe(board) # Distancia al mate tras el movimiento
+                finally:
+                    board.pop()
+                if board.turn == chess.WHITE:
+                    # Blancas: el mate más corto
+                    if dtm is not None and (best_dtm is None or dtm < best_dtm):
+                        best_move, best_dtm = move, dtm
+                else:
+                    # Negras: cualquier movimiento que lleve a tablas, si no el mate más lejano
+                    if dtm is None:
+                        return move
+                    if best_dtm is None or dtm > best_dtm:
+                        best_move, best_dtm = move, dtm
+        except KeyError:
+            return None
+        return best_move
+
+
+_default_tablebase = None # Instancia compartida de la tabla por defecto (se abre una sola vez)
+_default_checked = False # Indica si ya se intentó abrir la tabla por defecto
+
+def get_tablebase():
+    """
+    Devuelve la tabla por defecto (DEFAULT_PATH), abriéndola la primera vez.
+
+    Returns:
+        Tablebase o None: La tabla, o None si el archivo no existe o no es válido.
+    """
+    global _default_tablebase, _default_checked
+    if not _default_checked:
+        _default_checked = True
+        try:
+            _default_tablebase = Tablebase(DEFAULT_PATH)
+        except (OSError, ValueError):
+            _default_tablebase = None # Sin tabla: la búsqueda Minimax se encarga de todo
+    return _default_tablebase
+
+
+# --- Generador (Análisis Retrógrado) ---
+
+def _solve(np, num_rooks, sub_wtm, log):
+    """
+    Resuelve el final Rey + num_rooks Torres contra Rey por análisis retrógrado.
+
+    Las posiciones se guardan en arreglos de forma (10, 64, 64[, 64]) indexados por
+    (Rey Blanco en el triángulo, Rey Negro, Torre 1[, Torre 2]). Cada valor es la distancia
+    al mate en medias jugadas, -1 si es tablas y -2 si la posición es ilegal.
+
+    Args:
+        np (module): El módulo NumPy.
+        num_rooks (int): Número de torres blancas (1 o 2).
+        sub_wtm (numpy.ndarray o None): Resultado (Blancas al turno) del final con una torre
+                                        menos, necesario cuando el Rey Negro captura una torre.
+        log (callable): Función para informar del progreso.
+
+    Returns:
+        tuple: (valores con Blancas al turno, valores con Negras al turno).
+    """
+    shape = (10, 64) + (64,) * num_rooks
+    size = int(np.prod(shape))
+
+    # --- Tablas Precalculadas de Geometría ---
+    transforms = np.array(TRANSFORMS, dtype=np.int64) # (8, 64)
+    canonical = np.array(CANONICAL_TRANSFORM, dtype=np.int64) # (64,)
+    triangle_index = np.full(64, -1, dtype=np.int64)
+    for sq, i in TRIANGLE_INDEX.items():
+        triangle_index[sq] = i
+    files = np.arange(64) % 8
+    ranks = np.arange(64) // 8
+    distance = np.maximum(abs(files[:, None] - files[None, :]), abs(ranks[:, None] - ranks[None, :]))
+    adjacent = distance == 1 # Casillas a distancia de rey
+    line = ((files[:, None] == files[None, :]) | (ranks[:, None] == ranks[None, :])) & (distance > 0)
+    between = np.zeros((64, 64, 64), dtype=bool) # between[a, b, c]: c está estrictamente entre a y b
+    for a in chess.SQUARES:
+        for b in chess.SQUARES:
+            if line[a, b]:
+                for c in chess.SquareSet(chess.between(a, b)):
+                    between[a, b, c] = True
+    king_steps = np.full((64, 8), -1, dtype=np.int64) # Destinos del rey en las 8 direcciones
+    rook_rays = np.full((64, 4, 7), -1, dtype=np.int64) # Destinos de la torre por dirección y distancia
+    king_dirs = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+    for sq in chess.SQUARES:
+        f, r = chess.square_file(sq), chess.square_rank(sq)
+        for d, (df, dr) in enumerate(king_dirs):
+            if 0 <= f + df < 8 and 0 <= r + dr < 8:
+                king_steps[sq, d] = chess.square(f + df, r + dr)
+            if d < 4:
+                for k in range(7):
+                    nf, nr = f + df * (k + 1), r + dr * (k + 1)
+                    if 0 <= nf < 8 and 0 <= nr < 8:
+                        rook_rays[sq, d, k] = chess.square(nf, nr)
+
+    def index_of(wk, bk, rooks):
+        # Índice canónico (en este final) de posiciones dadas con casillas reales
+        t = canonical[wk]
+        idx = triangle_index[transforms[t, wk]] * 64 + transforms[t, bk]
+        for r in rooks:
+            idx = idx * 64 + transforms[t, r]
+        return idx
+
+    def attacked(square, rooks, wk):
+        # True donde alguna torre ataca 'square' (bloqueadas por el Rey Blanco y las demás torres)
+        result = np.zeros(len(square), dtype=bool)
+        for i, r in enumerate(rooks):
+            hit = line[r, square] & ~between[r, square, wk]
+            for j, other in enumerate(rooks):
+                if j != i:
+                    hit &= ~between[r, square, other]
+            result |= hit
+        return result
+
+    # --- Coordenadas de Todas las Posiciones ---
+    coords = np.unravel_index(np.arange(size, dtype=np.int64), shape)
+    wk = np.array(TRIANGLE, dtype=np.int64)[coords[0]]
+    bk = coords[1].astype(np.int64)
+    rooks = [c.astype(np.int64) for c in coords[2:]]
+
+    pieces = [wk, bk] + rooks
+    valid = ~adjacent[wk, bk]
+    for i in range(len(pieces)):
+        for j in range(i + 1, len(pieces)):
+            valid &= pieces[i] != pieces[j]
+    in_check = valid & attacked(bk, rooks, wk)
+    wtm_legal = valid & ~in_check # Con Blancas al turno, el Rey Negro no puede estar en jaque
+    btm_legal = valid
+
+    # --- Movimientos de las Negras (se precalculan una sola vez) ---
+    # Para cada dirección: índice del sucesor en este final (-1 si no aplica) y, si es captura,
+    # el valor fijo del sucesor en el final con una torre menos (-3 si no es captura).
+    black_succ, black_capture = [], []
+    black_moves = np.zeros(size, dtype=np.int64)
+    escapes = np.zeros(size, dtype=bool) # Las Negras pueden capturar y llegar a tablas
+    for d in range(8):
+        target = king_steps[bk, d]
+        ok = btm_legal & (target >= 0)
+        target = np.where(target >= 0, target, 0)
+        ok &= ~adjacent[wk, target] & (target != wk)
+        captures = [target == r for r in rooks]
+        any_capture = np.logical_or.reduce(captures)
+        quiet = ok & ~any_capture & ~attacked(target, rooks, wk)
+        succ = np.where(quiet, index_of(wk, target, rooks), -1)
+        capture_value = np.full(size, -3, dtype=np.int64)
+        for i, cap in enumerate(captures):
+            others = rooks[:i] + rooks[i + 1:]
+            legal_capture = ok & cap & ~attacked(target, others, wk)
+            if sub_wtm is None:
+                value = np.full(size, -1, dtype=np.int64) # Rey contra Rey: tablas
+            else:
+                value = sub_wtm.reshape(-1)[np.where(legal_capture, index_of(wk, target, others), 0)]
+            capture_value = np.where(legal_capture, value, capture_value)
+            escapes |= legal_capture & (value == -1)
+            quiet |= legal_capture
+        black_moves += quiet
+        black_succ.append(succ.astype(np.int32))
+        black_capture.append(capture_value.astype(np.int16))
+
+    wtm = np.where(wtm_legal, -1, -2).astype(np.int16)
+    btm = np.where(btm_legal, -1, -2).astype(np.int16)
+    btm[btm_legal & in_check & (black_moves == 0)] = 0 # Jaque mate
+    log(f"  {num_rooks} rook(s): {int(wtm_legal.sum())} + {int(btm_legal.sum())} legal positions, "
+        f"{int((btm == 0).sum())} mates")
+
+    # --- Bucle Retrógrado por Número de Medias Jugadas ---
+    max_sub = int(sub_wtm.max()) if sub_wtm is not None else 0
+    ply, idle = 1, 0
+    while ply < ILLEGAL_BYTE - 1:
+        if ply % 2 == 1:
+            # Blancas ganan en 'ply' si algún movimiento lleva a un mate de Negras en 'ply - 1'.
+            todo = np.nonzero(wtm.reshape(-1) == -1)[0]
+            w, b, rs = wk[todo], bk[todo], [r[todo] for r in rooks]
+            found = np.zeros(len(todo), dtype=bool)
+            btm_flat = btm.reshape(-1)
+            for d in range(8): # Movimientos del Rey Blanco
+                target = king_steps[w, d]
+                ok = target >= 0
+                target = np.where(ok, target, 0)
+                ok &= ~adjacent[target, b] & (target != b)
+                for r in rs:
+                    ok &= target != r
+                found |= ok & (btm_flat[index_of(target, b, rs)] == ply - 1)
+            for i, r in enumerate(rs): # Movimientos de cada torre
+                for d in range(4):
+                    open_ray = np.ones(len(todo), dtype=bool)
+                    for k in range(7):
+                        target = rook_rays[r, d, k]
+                        open_ray &= target >= 0
+                        target = np.where(open_ray, target, 0)
+                        open_ray &= (target != w) & (target != b)
+                        for j, other in enumerate(rs):
+                            if j != i:
+                                open_ray &= target != other
+                        moved = rs[:i] + [target] + rs[i + 1:]
+                        found |= open_ray & (btm_flat[index_of(w, b, moved)] == ply - 1)
+            changed = todo[found]
+            wtm.reshape(-1)[changed] = ply
+        else:
+            # Negras pierden en 'ply' si todos sus movimientos llevan a mates ya resueltos.
+            todo = np.nonzero((btm.reshape(-1) == -1) & ~escapes & (black_moves > 0))[0]
+            done = np.ones(len(todo), dtype=bool)
+            wtm_flat = wtm.reshape(-1)
+            for d in range(8):
+                succ = black_succ[d][todo]
+                cap = black_capture[d][todo]
+                quiet_done = (succ < 0) | (wtm_flat[np.maximum(succ, 0)] >= 0)
+                capture_done = (cap == -3) | ((cap >= 0) & (cap <= ply - 1))
+                done &= np.where(cap == -3, quiet_done, capture_done)
+            changed = todo[done]
+            btm.reshape(-1)[changed] = ply
+        log(f"  ply {ply}: {len(changed)} positions")
+        idle = idle + 1 if len(changed) == 0 else 0
+        if idle >= 2 and ply > max_sub + 2:
+            break # Ya no puede resolverse ninguna posición más
+        ply += 1
+    return wtm.reshape(shape), btm.reshape(shape)
+
+
+def _encode(np, values):
+    """
+    Convierte los valores del generador a un byte por posición.
+    """
+    encoded = np.where(values >= 0, values + 1, DRAW_BYTE)
+    encoded = np.where(values == -2, ILLEGAL_BYTE, encoded)
+    return encoded.astype(np.uint8)
+
+def generate(path=DEFAULT_PATH, log=print):
+    """
+    Genera el archivo de la tabla de finales KRK + KRRK.
+
+    Args:
+        path (str): Ruta del archivo de salida.
+        log (callable): Función para informar del progreso.
+    """
+    import numpy as np # NumPy solo es necesario para generar la tabla, no para consultarla
+
+    start = time.time()
+    log("Solving KRK...")
+    krk_wtm, krk_btm = _solve(np, 1, None, log)
+    log("Solving KRRK...")
+    krrk_wtm, krrk_btm = _solve(np, 2, krk_wtm, log)
+
+    # Las dos torres son intercambiables: solo se guarda el par (r1 < r2).
+    r1, r2 = np.triu_indices(64, 1)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_encode(np, krk_wtm).tobytes())
+        f.write(_encode(np, krk_btm).tobytes())
+        f.write(_encode(np, krrk_wtm[:, :, r1, r2]).tobytes())
+        f.write(_encode(np, krrk_btm[:, :, r1, r2]).tobytes())
+    os.replace(tmp_path, path) # Reemplazo atómico: los lectores nunca ven un archivo a medias
+    log(f"Wrote {path} ({FILE_SIZE} bytes) in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    generate(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
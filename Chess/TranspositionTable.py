@@ -0,0 +1,309 @@
+import chess.polyglot # Importa el módulo polyglot de python-chess para calcular el hash Zobrist de una posición
+from Tablebase import TRANSFORMS # Importa las 8 simetrías del tablero (reflejos y rotaciones)
+from Heuristic import MATE_THRESHOLD # Importa el umbral a partir del cual una puntuación es de mate
+
+# --- Tipos de Cota (Bound Types) ---
+# Indican cómo debe interpretarse la puntuación guardada en una entrada de la tabla.
+EXACT = 0 # La puntuación es el valor exacto de la posición (quedó dentro de la ventana alpha-beta)
+LOWER = 1 # La puntuación es una cota inferior (hubo un corte beta: el valor real es >= puntuación)
+UPPER = 2 # La puntuación es una cota superior (ningún movimiento superó alpha: el valor real es <= puntuación)
+
+# Tamaño aproximado en bytes que ocupa una entrada en memoria (tupla de Python + referencia en la lista).
+# Se usa para convertir el presupuesto de memoria (en MB) en un número de ranuras.
+ENTRY_SIZE = 128
+
+
+def position_key(board):
+    """
+    Calcula la clave de una posición para la tabla de transposición.
+
+    Args:
+        board (chess.Board o KRRKBoard): El objeto del tablero de ajedrez en su estado actual.
+
+    Returns:
+        int: El hash Zobrist (64 bits) de la posición.
+    """
+    if isinstance(board, chess.Board):
+        return chess.polyglot.zobrist_hash(board) # Hash Zobrist estándar de Polyglot
+    return board.zobrist_hash() # Tablero compacto: mantiene la misma clave de forma incremental
+
+# Índices de la tabla de números aleatorios de Polyglot
+_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+_TURN = 780 # Número que se suma (XOR) cuando mueven Blancas
+
+
+def next_position_key(board, move, key):
+    """
+    Calcula de forma incremental la clave de la posición que resulta de un movimiento,
+    a partir de la clave de la posición actual (sin recorrer el tablero entero).
+
+    Solo cubre los movimientos simples: si hay derechos de enroque o captura al paso en
+    juego, o el movimiento es de peón (puede crear una casilla de captura al paso o
+    coronar), devuelve None y hay que usar position_key() tras el movimiento.
+
+    Args:
+        board (chess.Board): El tablero ANTES de realizar el movimiento.
+        move (chess.Move): El movimiento que se va a realizar.
+        key (int): La clave de la posición actual.
+
+    Returns:
+        int o None: La clave de la posición tras el movimiento, o None si no es un movimiento simple.
+    """
+    if not isinstance(board, chess.Board):
+        return None # El tablero compacto ya calcula su clave de forma incremental al mover
+    if board.castling_rights or board.ep_square is not None:
+        return None
+    piece_type = board.piece_type_at(move.from_square)
+    if piece_type == chess.PAWN:
+        return None
+    color = board.turn
+    base = 64 * ((piece_type - 1) * 2 + color) # Bloque de la pieza que se mueve
+    key ^= _RANDOM[base + move.from_square] ^ _RANDOM[base + move.to_square] ^ _RANDOM[_TURN]
+    captured = board.piece_type_at(move.to_square)
+    if captured:
+        key ^= _RANDOM[64 * ((captured - 1) * 2 + (not color)) + move.to_square] # Pieza capturada
+    return key
+
+
+def _score_to_tt(score, ply):
+    # Las puntuaciones de mate se cuentan desde la raíz; en la tabla se guardan contadas desde
+    # la propia posición, que puede volver a aparecer a otra distancia de la raíz.
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    # Operación inversa de _score_to_tt: vuelve a contar el mate desde la raíz actual
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+# --- Claves Canónicas por Simetría ---
+# Sin peones ni derechos de enroque, una posición equivale a sus 8 reflejos y rotaciones
+# (ver Tablebase.TRANSFORMS); con peones, solo al reflejo de columnas (transformación 1).
+# La clave canónica es la menor de las claves de todas las variantes equivalentes, así que
+# las 8 variantes comparten una sola entrada en las cachés de resultados.
+ALL_TRANSFORMS = tuple(range(8))
+PAWN_TRANSFORMS = (0, 1)
+# INVERSE_TRANSFORMS[t]: transformación que deshace t.
+INVERSE_TRANSFORMS = [next(u for u in range(8) if all(TRANSFORMS[u][TRANSFORMS[t][sq]] == sq for sq in chess.SQUARES))
+                      for t in range(8)]
+
+
+def canonical_key(board):
+    """
+    Calcula la clave canónica de una posición: la misma para todas sus variantes simétricas.
+
+    Args:
+        board (chess.Board o KRRKBoard): El objeto del tablero de ajedrez en su estado actual.
+
+    Returns:
+        tuple: (clave, transformación): la clave Zobrist de la variante canónica (la que
+               devolvería position_key() sobre el tablero transformado) y la transformación
+               que lleva la posición original a esa variante.
+    """
+    if board.castling_rights or board.ep_square is not None:
+        return position_key(board), 0 # El enroque y la captura al paso rompen la simetría
+    transforms = PAWN_TRANSFORMS if board.pawns else ALL_TRANSFORMS
+    pieces = [(64 * ((piece.piece_type - 1) * 2 + piece.color), square) for square, piece in board.piece_map().items()]
+    turn = _RANDOM[_TURN] if board.turn == chess.WHITE else 0
+    best_key, best_transform = None, 0
+    for t in transforms:
+        squares = TRANSFORMS[t]
+        key = turn
+        for base, square in pieces:
+            key ^= _RANDOM[base + squares[square]]
+        if best_key is None or key < best_key:
+            best_key, best_transform = key, t
+    return best_key, best_transform
+
+
+def transform_move(move, t):
+    """
+    Aplica una transformación de simetría a un movimiento (por ejemplo, para pasar un
+    movimiento guardado con la clave canónica a la posición original, con INVERSE_TRANSFORMS[t]).
+
+    Args:
+        move (chess.Move): El movimiento.
+        t (int): Índice de la transformación (0-7).
+
+    Returns:
+        chess.Move: El movimiento equivalente en la posición transformada.
+    """
+    if t == 0:
+        return move
+    squares = TRANSFORMS[t]
+    return chess.Move(squares[move.from_square], squares[move.to_square], move.promotion)
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo indexada por hash Zobrist.
+
+    Cada ranura guarda una tupla (clave, profundidad, puntuación, tipo de cota,
+    mejor movimiento, generación). La política de reemplazo prefiere conservar
+    las entradas más profundas de la búsqueda actual y descarta siempre las
+    entradas de búsquedas anteriores (generaciones viejas).
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        Args:
+            size_mb (float): Presupuesto de memoria aproximado para la tabla, en megabytes.
+        """
+        self.size = max(1, int(size_mb * 1024 * 1024) // ENTRY_SIZE) # Número de ranuras de la tabla
+        self.slots = [None] * self.size # Lista de ranuras (None = vacía)
+        self.generation = 0 # Generación actual (se incrementa en cada nueva búsqueda)
+        self.reset_stats() # Inicializa los contadores de estadísticas
+
+    def reset_stats(self):
+        """
+        Pone a cero los contadores de estadísticas de la tabla.
+        """
+        self.probes = 0 # Número de consultas a la tabla
+        self.hits = 0 # Consultas que encontraron la posición guardada
+        self.cutoffs = 0 # Consultas cuya puntuación permitió cortar la búsqueda sin explorar
+        self.stores = 0 # Número de entradas escritas
+        self.replacements = 0 # Escrituras que sobrescribieron una posición distinta
+
+    def new_search(self):
+        """
+        Marca el inicio de una nueva búsqueda (un nuevo movimiento de la partida).
+        Las entradas anteriores se conservan, pero pasan a ser reemplazables.
+        """
+        self.generation += 1
+
+    def clear(self):
+        """
+        Vacía la tabla por completo (por ejemplo, al empezar una partida nueva).
+        """
+        self.slots = [None] * self.size
+        self.generation = 0
+        self.reset_stats()
+
+    def lookup(self, key, depth, alpha, beta, ply=0):
+        """
+        Consulta la tabla para una posición.
+
+        Args:
+            key (int): Hash Zobrist de la posición.
+            depth (int): Profundidad restante que se va a buscar.
+            alpha (float): Valor alpha actual.
+            beta (float): Valor beta actual.
+            ply (int): Distancia de la posición a la raíz (para ajustar las puntuaciones de mate).
+
+        Returns:
+            tuple: Una tupla que contiene:
+                   - score (float o None): La puntuación guardada si permite un corte
+                     (entrada suficientemente profunda y cota compatible con la ventana), o None.
+                   - move (chess.Move o None): El mejor movimiento guardado, útil para ordenar movimientos.
+        """
+        self.probes += 1
+        entry = self.slots[key % self.size] # Ranura donde debería estar la posición
+        if entry is None or entry[0] != key: # Ranura vacía u ocupada por otra posición
+            return None, None
+        self.hits += 1
+
+        _, entry_depth, score, flag, move, _ = entry
+        score = _score_from_tt(score, ply)
+        # Solo se puede usar la puntuación si se buscó al menos a la misma profundidad
+        if entry_depth >= depth:
+            if (flag == EXACT or
+                    (flag == LOWER and score >= beta) or # La cota inferior ya supera beta
+                    (flag == UPPER and score <= alpha)): # La cota superior ya está por debajo de alpha
+                self.cutoffs += 1
+                return score, move
+        return None, move
+
+    def entry(self, key):
+        """
+        Devuelve la entrada guardada para una posición, sin contar la consulta en las
+        estadísticas (se usa fuera de la búsqueda, por ejemplo para reconstruir la
+        variante principal).
+
+        Args:
+            key (int): Hash Zobrist de la posición.
+
+        Returns:
+            tuple o None: (clave, profundidad, puntuación, tipo de cota, mejor movimiento, generación),
+                          o None si la posición no está.
+        """
+        entry = self.slots[key % self.size]
+        if entry is None or entry[0] != key:
+            return None
+        return entry
+
+    def best_move(self, key):
+        """
+        Devuelve el mejor movimiento guardado para una posición (o None si no está).
+        """
+        entry = self.entry(key)
+        return entry[4] if entry is not None else None
+
+    def store(self, key, depth, score, alpha, beta, move, ply=0):
+        """
+        Guarda el resultado de una búsqueda en la tabla.
+
+        El tipo de cota se deduce comparando la puntuación con la ventana (alpha, beta)
+        con la que se buscó la posición.
+
+        Args:
+            key (int): Hash Zobrist de la posición.
+            depth (int): Profundidad a la que se buscó la posición.
+            score (float): Puntuación obtenida.
+            alpha (float): Valor alpha original con el que se empezó a buscar la posición.
+            beta (float): Valor beta original con el que se empezó a buscar la posición.
+            move (chess.Move): El mejor movimiento encontrado (o None).
+            ply (int): Distancia de la posición a la raíz (para ajustar las puntuaciones de mate).
+        """
+        if score <= alpha:
+            flag = UPPER # Ningún movimiento superó alpha
+        elif score >= beta:
+            flag = LOWER # Hubo un corte beta
+        else:
+            flag = EXACT # La puntuación quedó dentro de la ventana
+
+        index = key % self.size # Ranura asignada a la posición
+        entry = self.slots[index]
+        if entry is not None and entry[0] != key:
+            # --- Política de Reemplazo ---
+            # Se conserva la entrada existente si es de la búsqueda actual y es más profunda.
+            if entry[5] == self.generation and entry[1] > depth:
+                return
+            self.replacements += 1
+        elif entry is not None and move is None:
+            move = entry[4] # Conserva el mejor movimiento anterior de la misma posición
+
+        self.slots[index] = (key, depth, _score_to_tt(score, ply), flag, move, self.generation)
+        self.stores += 1
+
+    def stats(self):
+        """
+        Devuelve las estadísticas de uso de la tabla.
+
+        Returns:
+            dict: Contadores de consultas, aciertos, cortes, escrituras y reemplazos,
+                  junto con la tasa de aciertos.
+        """
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "cutoffs": self.cutoffs,
+            "stores": self.stores,
+            "replacements": self.replacements,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+        }
+
+    def __str__(self):
+        """
+        Resumen legible de las estadísticas (para imprimir en consola).
+        """
+        s = self.stats()
+        return (f"TT: {s['hits']}/{s['probes']} hits ({s['hit_rate']:.1%}), "
+                f"{s['cutoffs']} cutoffs, {s['stores']} stores, {s['replacements']} replacements")
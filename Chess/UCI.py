@@ -0,0 +1,242 @@
+import math # Importa el módulo math para usar 'inf' (infinito)
+import sys # Importa sys para leer órdenes de la entrada estándar y responder por la salida estándar
+import threading # Importa threading para buscar en segundo plano mientras se siguen leyendo órdenes
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from Heuristic import is_mate_score, mate_in_plies # Importa la conversión de puntuaciones de mate
+from Minimax import find_best_move, principal_variation, SearchContext, SearchTimeout, MAX_ITERATIVE_DEPTH # Importa la búsqueda
+from TranspositionTable import TranspositionTable, position_key # Importa la tabla de transposición que se conserva entre movimientos
+
+# --- Interfaz UCI (Universal Chess Interface) ---
+# Permite usar el motor desde cualquier programa que hable UCI (gestores de torneos como
+# cutechess-cli, interfaces gráficas o scripts de pruebas de carga), sin Pygame:
+#     python UCI.py
+# La búsqueda corre en un hilo aparte, así que las órdenes se siguen leyendo mientras piensa:
+# 'stop' la interrumpe y se responde con el mejor movimiento de la última profundidad completada.
+
+ENGINE_NAME = "Two Rooks Minimax"
+ENGINE_AUTHOR = "Chess project"
+DEFAULT_HASH_MB = 64 # Tamaño por defecto de la tabla de transposición (opción Hash)
+MAX_HASH_MB = 4096
+DEFAULT_MOVES_TO_GO = 30 # Movimientos restantes que se suponen si el reloj no indica 'movestogo'
+MOVE_OVERHEAD = 0.05 # Margen (en segundos) para la comunicación con el gestor en cada movimiento
+
+
+def time_for_move(remaining, increment=0.0, moves_to_go=None):
+    """
+    Reparte el tiempo del reloj: el tiempo restante entre los movimientos que quedan,
+    más la mayor parte del incremento.
+
+    Args:
+        remaining (float): Tiempo que le queda al motor en el reloj, en segundos.
+        increment (float): Incremento por movimiento, en segundos.
+        moves_to_go (int, opcional): Movimientos hasta el próximo control de tiempo.
+
+    Returns:
+        float: Tiempo máximo de búsqueda para este movimiento, en segundos.
+    """
+    budget = remaining / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment * 0.75
+    # Nunca más de la mitad de lo que queda, para no perder por tiempo.
+    return max(0.01, min(budget, remaining / 2) - MOVE_OVERHEAD)
+
+
+def format_score(score):
+    """
+    Convierte una puntuación de la búsqueda (jugador al turno) al formato UCI.
+    """
+    if is_mate_score(score):
+        plies = mate_in_plies(score)
+        # UCI cuenta el mate en movimientos (no medias jugadas); negativo si el motor recibe el mate.
+        return f"mate {(plies + 1) // 2 if plies > 0 else plies // 2}"
+    return f"cp {int(round(score))}"
+
+
+class UCIEngine:
+    """
+    Estado del motor UCI: la posición actual, la tabla de transposición y la búsqueda en curso.
+    """
+
+    def __init__(self, output=sys.stdout):
+        """
+        Args:
+            output (archivo): Destino de las respuestas (por defecto, la salida estándar).
+        """
+        self.output = output
+        self.output_lock = threading.Lock() # El hilo de búsqueda y el principal escriben en la misma salida
+        self.board = chess.Board()
+        self.tt = TranspositionTable(DEFAULT_HASH_MB)
+        self.search_thread = None # Hilo de la búsqueda en curso (o None)
+        self.stop_event = None # Evento que detiene la búsqueda en curso
+
+    def send(self, line):
+        """
+        Escribe una línea de respuesta y la envía de inmediato.
+        """
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def handle(self, line):
+        """
+        Procesa una orden UCI.
+
+        Args:
+            line (str): La línea recibida.
+
+        Returns:
+            bool: False si la orden fue 'quit' (hay que terminar), True en otro caso.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok") # Se responde aunque haya una búsqueda en curso
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.stop()
+            self.tt.clear()
+        elif command == "position":
+            self.stop()
+            self.set_position(args)
+        elif command == "go":
+            self.go(args)
+        elif command == "stop":
+            self.stop()
+        elif command == "quit":
+            self.stop()
+            return False
+        # Las órdenes desconocidas se ignoran, como pide el protocolo.
+        return True
+
+    def set_option(self, args):
+        # setoption name <nombre> value <valor>
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1:args.index("value")])
+        value = " ".join(args[args.index("value") + 1:])
+        if name.lower() == "hash":
+            try:
+                size = int(value)
+            except ValueError:
+                self.send(f"info string invalid value for Hash: {value}")
+                return
+            self.stop()
+            self.tt = TranspositionTable(min(MAX_HASH_MB, max(1, size)))
+
+    def set_position(self, args):
+        # position startpos | fen <FEN> [moves <m1> <m2> ...]
+        moves = args.index("moves") if "moves" in args else len(args)
+        try:
+            if args and args[0] == "fen":
+                board = chess.Board(" ".join(args[1:moves]))
+            else:
+                board = chess.Board()
+            for uci in args[moves + 1:]:
+                board.push_uci(uci)
+        except ValueError as e:
+            self.send(f"info string invalid position: {e}")
+            return
+        self.board = board
+
+    def go(self, args):
+        """
+        Lanza la búsqueda en segundo plano (go depth / movetime / wtime ... / infinite).
+        """
+        self.stop()
+        params = {}
+        for index, token in enumerate(args):
+            if token not in ("depth", "movetime", "wtime", "btime", "winc", "binc", "movestogo"):
+                continue
+            # Un valor ausente o que no es un número se ignora (avisando al gestor), como el resto
+            # de órdenes mal formadas: la búsqueda se lanza igualmente y termina con 'bestmove'.
+            if index + 1 >= len(args):
+                self.send(f"info string missing value for {token}")
+                continue
+            try:
+                value = int(args[index + 1])
+            except ValueError:
+                self.send(f"info string invalid value for {token}: {args[index + 1]}")
+                continue
+            if token == "depth" and value < 1:
+                self.send(f"info string invalid value for depth: {value}")
+                continue
+            params[token] = value
+        infinite = "infinite" in args
+
+        depth = params.get("depth", MAX_ITERATIVE_DEPTH)
+        if "movetime" in params:
+            time_limit = params["movetime"] / 1000
+        elif not infinite and ("wtime" in params or "btime" in params):
+            side = "w" if self.board.turn == chess.WHITE else "b"
+            time_limit = time_for_move(params.get(side + "time", 0) / 1000, params.get(side + "inc", 0) / 1000,
+                                       params.get("movestogo"))
+        else:
+            # Solo profundidad (o infinite): sin tiempo límite, pero con profundización
+            # iterativa para que 'stop' pueda devolver la última profundidad completada.
+            time_limit = math.inf
+
+        self.stop_event = threading.Event()
+        self.search_thread = threading.Thread(target=self._search, daemon=True,
+                                              args=(self.board.copy(), depth, time_limit, self.stop_event, infinite))
+        self.search_thread.start()
+
+    def _search(self, board, depth, time_limit, stop_event, infinite=False):
+        # Cuerpo de la búsqueda, en su propio hilo: termina siempre con 'bestmove'
+        context = SearchContext(self.tt, stop_event=stop_event)
+        try:
+            move = find_best_move(board, depth, time_limit=time_limit, context=context, compact=True)
+        except SearchTimeout:
+            move = None # Detenida antes de completar la primera profundidad
+        except Exception as e:
+            # Un error de la búsqueda no puede dejar al gestor esperando 'bestmove' para siempre.
+            self.send(f"info string search error: {e!r}")
+            move = None
+        if move is None:
+            # Sin profundidad completada: el movimiento de la tabla (de una búsqueda anterior) o,
+            # si no lo hay, cualquier movimiento legal antes que ninguno.
+            move = self.tt.best_move(position_key(board))
+            if move is None or not board.is_legal(move):
+                move = next(iter(board.legal_moves), None)
+
+        # Informe final: profundidad y puntuación de la raíz (guardadas en la tabla) y variante principal.
+        entry = self.tt.entry(position_key(board))
+        if entry is not None and entry[4] == move:
+            pv = principal_variation(board, self.tt, entry[1]) or [move]
+            self.send(f"info depth {entry[1]} score {format_score(entry[2])} nodes {context.nodes} "
+                      f"pv {' '.join(m.uci() for m in pv)}")
+        if infinite:
+            # UCI no permite terminar una búsqueda 'infinite' antes de 'stop', aunque ya se haya
+            # demostrado un mate (o la posición se resuelva sin buscar): se espera la orden.
+            stop_event.wait()
+        self.send(f"bestmove {move.uci() if move else '0000'}")
+
+    def stop(self):
+        """
+        Detiene la búsqueda en curso (si la hay) y espera a que responda con 'bestmove'.
+        """
+        if self.search_thread is not None:
+            self.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+
+
+def main(stream=sys.stdin):
+    """
+    Bucle principal: lee órdenes UCI línea a línea hasta 'quit' o el fin de la entrada.
+    La lectura nunca espera a la búsqueda, que corre en su propio hilo.
+    """
+    engine = UCIEngine()
+    for line in stream:
+        if not engine.handle(line):
+            break
+    engine.stop()
+
+
+if __name__ == "__main__":
+    main()
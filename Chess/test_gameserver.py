@@ -0,0 +1,31 @@
+import asyncio # Importa asyncio para lanzar peticiones concurrentes
+from GameServer import GameServer # Importa el servidor que se comprueba
+
+BLACK_TO_MOVE = "8/8/8/4k3/8/8/R7/R3K3 b - - 0 1" # Sin jugada de la IA al crear la partida
+
+
+async def _concurrent_requests(requests):
+    # Crea una partida y envía las peticiones mientras otra tiene el turno de la partida, de
+    # modo que todas esperan al mismo lock; devuelve sus respuestas en orden
+    server = GameServer(1)
+    try:
+        game_id = (await server.handle_request({"op": "new", "fen": BLACK_TO_MOVE}))["game"]
+        game = server.games[game_id]
+        async with game.lock:
+            tasks = [asyncio.ensure_future(server.handle_request({**request, "game": game_id})) for request in requests]
+            await asyncio.sleep(0) # Todas llegan a esperar el lock
+        return await asyncio.gather(*tasks), server.games
+    finally:
+        server.close()
+
+
+def test_concurrent_close_answers_unknown_game():
+    responses, games = asyncio.run(_concurrent_requests([{"op": "close"}, {"op": "close"}]))
+    assert responses[0]["ok"]
+    assert responses[1] == {"ok": False, "error": "unknown game"}
+    assert games == {}
+
+
+def test_request_queued_behind_close_answers_unknown_game():
+    responses, _ = asyncio.run(_concurrent_requests([{"op": "close"}, {"op": "move", "move": "e5e6"}]))
+    assert responses[1] == {"ok": False, "error": "unknown game"}
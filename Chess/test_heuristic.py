@@ -0,0 +1,82 @@
+import random # Importa random para jugar partidas aleatorias
+import chess # Importa la librería python-chess para la lógica del ajedrez
+import pytest # Importa pytest para parametrizar las pruebas
+from Heuristic import (static_evaluation, evaluate_board, evaluate_batch, classify_terminal, EvaluationState,
+                       CHECKMATE_SCORE, STALEMATE_SCORE, NOT_TERMINAL) # Importa la evaluación que se comprueba
+from KRRKBoard import KRRKBoard # Importa el tablero compacto (también se evalúa en lote)
+
+# Finales KRRK con las dos manos (incluidas capturas de torre por el Rey Negro), una posición
+# con enroques, captura al paso y coronaciones (actualizaciones que recalculan desde cero) y
+# una sin Rey Negro (posición de prueba).
+FENS = [
+    "8/8/8/4k3/8/8/R7/R3K3 w - - 0 1",
+    "8/8/3k4/3R4/8/8/8/4K2R b - - 0 1",
+    "r3k2r/1P4P1/8/3pP3/8/8/1p4p1/R3K2R w KQkq d6 0 1",
+    "8/8/8/8/8/8/R7/R3K3 w - - 0 1",
+]
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_incremental_evaluation_matches_static(fen):
+    rng = random.Random(2)
+    for _ in range(20):
+        board = chess.Board(fen)
+        state = EvaluationState(board)
+        scores = [state.score]
+        for _ in range(30):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            state.push(board, move)
+            board.push(move)
+            assert state.score == pytest.approx(static_evaluation(board)), board.fen()
+            scores.append(state.score)
+        # Deshacer devuelve exactamente los valores anteriores
+        while board.move_stack:
+            board.pop()
+            state.pop()
+            scores.pop()
+            assert state.score == scores[-1]
+
+
+def test_terminal_scores():
+    assert evaluate_board(chess.Board("R5k1/8/6K1/8/8/8/8/R7 b - - 0 1")) == CHECKMATE_SCORE
+    assert evaluate_board(chess.Board("k7/1R6/2K5/8/8/8/8/8 b - - 0 1")) == STALEMATE_SCORE
+
+
+def test_batch_matches_evaluate_board():
+    rng = random.Random(3)
+    boards = []
+    for fen in FENS[:2]:
+        board = chess.Board(fen)
+        for _ in range(40):
+            boards.append(board.copy(stack=False))
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+    boards.append(chess.Board("R5k1/8/6K1/8/8/8/8/R7 b - - 0 1")) # Mate
+    boards.append(chess.Board("k7/1R6/2K5/8/8/8/8/8 b - - 0 1")) # Ahogado
+    expected = [evaluate_board(board) for board in boards]
+    assert list(evaluate_batch(boards)) == pytest.approx(expected)
+    # Con las puntuaciones estáticas ya calculadas (como en la frontera de la búsqueda)
+    static = [static_evaluation(board) for board in boards]
+    terminals = [classify_terminal(board) for board in boards]
+    assert list(evaluate_batch(static, terminals)) == pytest.approx(expected)
+
+
+def test_batch_of_boards_matches_static_evaluation():
+    # Todas las posiciones de prueba, incluidas las que no tienen Rey Blanco o Negro
+    rng = random.Random(4)
+    boards = [chess.Board(fen) for fen in FENS]
+    boards += [chess.Board("8/8/8/4k3/8/8/R7/R7 w - - 0 1"), chess.Board("8/8/8/8/8/8/R7/R3K3 b - - 0 1")]
+    for fen in FENS[:2]:
+        board = chess.Board(fen)
+        for _ in range(20):
+            board.push(rng.choice(list(board.legal_moves)))
+            boards.append(board.copy(stack=False))
+            boards.append(KRRKBoard.from_board(board.copy(stack=False)))
+    terminals = [NOT_TERMINAL] * len(boards) # Solo la parte posicional
+    expected = [static_evaluation(board) for board in boards]
+    assert list(evaluate_batch(boards, terminals)) == pytest.approx(expected)
@@ -0,0 +1,102 @@
+import random # Importa random para generar las posiciones de la comprobación diferencial
+import chess # Importa la librería python-chess (tablero de referencia)
+import chess.polyglot # Importa polyglot para comparar las claves Zobrist
+import pytest # Importa pytest para parametrizar las pruebas
+from KRRKBoard import KRRKBoard # Importa el tablero compacto que se comprueba
+from Minimax import SearchContext, find_best_move # Importa la búsqueda para comparar ambos tableros
+from SearchStats import SearchStats # Importa las estadísticas para leer la puntuación de la raíz
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición de cada búsqueda
+from Benchmark import krrk_corpus # Importa el corpus reproducible de posiciones KRRK
+
+# --- Comprobación Diferencial contra python-chess ---
+# El tablero compacto debe comportarse igual que chess.Board: mismos movimientos legales
+# (y en el mismo orden), jaques, claves Zobrist, FEN y repeticiones, tanto en posiciones
+# aleatorias como a lo largo de partidas aleatorias con push() y pop().
+
+GAMES = 200 # Partidas aleatorias (cada una desde una posición aleatoria)
+PLIES = 30 # Medias jugadas máximas de cada partida
+
+
+def _random_position(rng, num_rooks, turn):
+    # Posición aleatoria válida (según python-chess) con el número de torres indicado
+    while True:
+        squares = rng.sample(chess.SQUARES, 2 + num_rooks)
+        board = chess.Board(None)
+        board.set_piece_at(squares[0], chess.Piece(chess.KING, chess.WHITE))
+        board.set_piece_at(squares[1], chess.Piece(chess.KING, chess.BLACK))
+        for square in squares[2:]:
+            board.set_piece_at(square, chess.Piece(chess.ROOK, chess.WHITE))
+        board.turn = turn
+        if board.is_valid():
+            return board
+
+
+def _compare(board, compact):
+    # Lista de diferencias entre el tablero de referencia y el compacto (vacía si coinciden)
+    errors = []
+    if set(board.legal_moves) != set(compact.legal_moves):
+        errors.append("legal moves")
+    if list(board.legal_moves) != compact.legal_moves:
+        errors.append("move order")
+    if board.is_check() != compact.is_check():
+        errors.append("check")
+    if chess.polyglot.zobrist_hash(board) != compact.zobrist_hash():
+        errors.append("zobrist key")
+    if board.fen() != compact.fen():
+        errors.append("fen")
+    if board.is_repetition() != compact.is_repetition():
+        errors.append("repetition")
+    return errors
+
+
+def test_random_games_match_python_chess():
+    rng = random.Random(0)
+    mismatches = []
+    for index in range(GAMES):
+        board = _random_position(rng, index % 3, rng.choice(chess.COLORS))
+        compact = KRRKBoard.from_board(board)
+        for _ in range(PLIES):
+            errors = _compare(board, compact)
+            if errors:
+                mismatches.append((board.fen(), errors))
+                break
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board.push(move)
+            compact.push(move)
+        # Deshace toda la partida y comprueba que se vuelve a la posición inicial
+        while board.move_stack:
+            board.pop()
+            compact.pop()
+        if _compare(board, compact):
+            mismatches.append((board.fen(), ["pop"]))
+    assert mismatches == []
+
+
+def test_from_board_keeps_game_history():
+    # Una partida que vuelve a la posición inicial: el tablero compacto debe ver la repetición
+    board = chess.Board("8/8/8/4k3/8/8/R7/R3K3 w - - 0 1")
+    for uci in ("a2b2", "e5e6", "b2a2", "e6e5"):
+        board.push_uci(uci)
+    compact = KRRKBoard.from_board(board)
+    assert len(compact.move_stack) == len(board.move_stack)
+    assert compact.is_repetition(2) and board.is_repetition(2)
+
+
+# --- Búsqueda con el Tablero Compacto ---
+
+def _search(board, depth, compact):
+    # Mejor movimiento y puntuación de la raíz con una tabla de transposición nueva
+    stats = SearchStats()
+    context = SearchContext(TranspositionTable(8), stats=stats)
+    move = find_best_move(board, depth, context=context, use_tablebase=False, compact=compact)
+    return move, stats.iterations[-1]["score"]
+
+
+@pytest.mark.parametrize("fen", krrk_corpus(6, seed=3))
+def test_compact_search_matches_full_board(fen):
+    board = chess.Board(fen)
+    assert _search(board, 3, compact=True) == _search(board, 3, compact=False)
+    assert board.fen() == fen and not board.move_stack # El tablero del llamador no cambia
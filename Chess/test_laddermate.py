@@ -0,0 +1,54 @@
+import random # Importa random para la defensa aleatoria de las Negras
+import chess # Importa la librería python-chess para la lógica del ajedrez
+import pytest # Importa pytest para parametrizar las pruebas
+from LadderMate import applies, ladder_move # Importa la regla que se comprueba
+from Minimax import find_best_move # Importa la búsqueda (cuando la regla no se puede aplicar, y para defender)
+from Benchmark import krrk_corpus # Importa el corpus reproducible de posiciones KRRK
+
+MAX_PLIES = 80 # Medias jugadas en las que la partida debe terminar en mate
+
+
+def _play(fen, defend):
+    # Juega la partida con la regla (o la búsqueda si no se aplica) y devuelve el tablero final
+    # y los movimientos servidos por la regla
+    board = chess.Board(fen)
+    ladder_moves = 0
+    while not board.is_game_over() and len(board.move_stack) < MAX_PLIES:
+        if board.turn == chess.WHITE:
+            move = ladder_move(board)
+            if move is None:
+                move = find_best_move(board, 2, use_tablebase=False)
+            else:
+                ladder_moves += 1
+                assert move in board.legal_moves
+                board.push(move)
+                # Tras la regla: ninguna torre colgada y sin ahogado
+                assert not board.is_stalemate(), board.fen()
+                assert not any(board.is_legal(chess.Move(board.king(chess.BLACK), rook))
+                               for rook in board.pieces(chess.ROOK, chess.WHITE)), board.fen()
+                continue
+        else:
+            move = defend(board)
+        board.push(move)
+    return board, ladder_moves
+
+
+@pytest.mark.parametrize("fen", krrk_corpus(15, seed=5))
+def test_ladder_mates_random_defence(fen):
+    rng = random.Random(fen)
+    board, ladder_moves = _play(fen, lambda board: rng.choice(list(board.legal_moves)))
+    assert board.is_checkmate(), board.fen()
+    assert ladder_moves > 0
+
+
+@pytest.mark.parametrize("fen", krrk_corpus(4, seed=6))
+def test_ladder_mates_searching_defence(fen):
+    board, _ = _play(fen, lambda board: find_best_move(board, 2, use_tablebase=False))
+    assert board.is_checkmate(), board.fen()
+
+
+def test_ladder_only_applies_to_krrk_with_white_to_move():
+    assert ladder_move(chess.Board()) is None
+    assert not applies(chess.Board("8/8/8/4k3/8/8/R7/R3K3 b - - 0 1"))
+    assert not applies(chess.Board("8/8/8/4k3/8/8/8/R3K3 w - - 0 1"))
+    assert applies(chess.Board("8/8/8/4k3/8/8/R7/R3K3 w - - 0 1"))
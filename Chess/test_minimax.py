@@ -0,0 +1,58 @@
+import threading # Importa threading para la señal de parada
+import time # Importa time para el instante límite de la búsqueda
+import chess # Importa la librería python-chess para la lógica del ajedrez
+import pytest # Importa pytest para comprobar las excepciones
+from Minimax import SearchContext, SearchTimeout, find_best_move # Importa la búsqueda que se comprueba
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición de la búsqueda
+
+KRRK = "8/8/8/4k3/8/8/R7/R3K3 w - - 0 1"
+MIDDLEGAME = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"
+
+
+def _stopped_context():
+    # Contexto con la señal de parada ya activada (como tras 'stop' en UCI)
+    stop_event = threading.Event()
+    stop_event.set()
+    return SearchContext(TranspositionTable(1), stop_event=stop_event)
+
+
+def test_depth_or_time_limit_is_required():
+    with pytest.raises(ValueError):
+        find_best_move(chess.Board(KRRK))
+
+
+def test_mate_in_one():
+    board = chess.Board("6k1/8/6K1/8/8/8/8/R6R w - - 0 1")
+    board.push(find_best_move(board, 3, use_tablebase=False))
+    assert board.is_checkmate()
+
+
+def test_interrupted_fixed_depth_search_restores_board():
+    board = chess.Board(MIDDLEGAME)
+    board.push_uci("e1g1")
+    # Parada desde otro hilo en mitad del árbol
+    stop_event = threading.Event()
+    threading.Timer(0.05, stop_event.set).start()
+    with pytest.raises(SearchTimeout):
+        find_best_move(board, 8, use_tablebase=False, context=SearchContext(TranspositionTable(1), stop_event=stop_event))
+    assert board.move_stack == [chess.Move.from_uci("e1g1")]
+    # Tiempo agotado en mitad del árbol
+    context = SearchContext(TranspositionTable(1), deadline=time.monotonic() + 0.05)
+    with pytest.raises(SearchTimeout):
+        find_best_move(board, 8, use_tablebase=False, context=context)
+    assert board.move_stack == [chess.Move.from_uci("e1g1")]
+
+
+@pytest.mark.parametrize("fen", [KRRK, MIDDLEGAME])
+def test_stop_before_depth_one_still_returns_a_move(fen):
+    board = chess.Board(fen)
+    move = find_best_move(board, 6, time_limit=10, use_tablebase=False, context=_stopped_context())
+    assert move in board.legal_moves
+    assert board.fen() == fen and not board.move_stack
+
+
+def test_timed_search_restores_board():
+    board = chess.Board(MIDDLEGAME)
+    move = find_best_move(board, time_limit=0.05, use_tablebase=False)
+    assert move in board.legal_moves
+    assert board.fen() == MIDDLEGAME and not board.move_stack
@@ -0,0 +1,33 @@
+import math # Importa math para la ventana inicial de la búsqueda
+import multiprocessing # Importa multiprocessing para la cota alpha compartida
+import chess # Importa la librería python-chess para la lógica del ajedrez
+import ParallelSearch # Importa el módulo para comprobar el estado de un proceso trabajador
+from ParallelSearch import ParallelSearcher # Importa la búsqueda en paralelo que se comprueba
+from Minimax import negamax # Importa la búsqueda en serie de referencia
+from Benchmark import krrk_corpus # Importa el corpus reproducible de posiciones KRRK
+
+MIDDLEGAME = "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQ1RK1 b kq - 5 4"
+
+
+def test_root_move_leaves_worker_context_at_root():
+    # El trabajador se inicializa en este mismo proceso
+    ParallelSearch._init_worker(multiprocessing.Value("d", -math.inf))
+    context = ParallelSearch._worker_context
+    board = chess.Board(MIDDLEGAME)
+    move = next(iter(board.legal_moves))
+    ParallelSearch._search_root_move(board, move, 2)
+    assert board.fen() == MIDDLEGAME and not board.move_stack
+    assert context.evaluation.stack == [] # Sin movimientos pendientes de deshacer
+    assert sum(context.repetitions.values()) == 1 # Solo la raíz
+
+
+def test_parallel_search_matches_serial_score():
+    searcher = ParallelSearcher(2)
+    try:
+        for fen in krrk_corpus(3, seed=11) + [MIDDLEGAME]:
+            board = chess.Board(fen)
+            score, move = searcher.search(board, 3)
+            assert score == negamax(board, 3, -math.inf, math.inf)[0], fen
+            assert move in board.legal_moves
+    finally:
+        searcher.close()
@@ -0,0 +1,134 @@
+import sqlite3 # Importa sqlite3 para simular un archivo de otra versión
+import chess # Importa la librería python-chess para la lógica del ajedrez
+import SearchCache as search_cache # Importa el módulo para reducir el intervalo de descarte
+from SearchCache import SearchCache, FORMAT_VERSION # Importa la caché que se comprueba
+from Minimax import SearchContext, find_best_move, MAX_ITERATIVE_DEPTH # Importa la búsqueda que usa la caché
+from Tablebase import TRANSFORMS # Importa las 8 simetrías del tablero
+from TranspositionTable import TranspositionTable, transform_move # Importa la tabla y la transformación de movimientos
+
+FEN = "8/8/8/4k3/8/8/R7/R3K3 w - - 0 1"
+
+
+def _transformed(board, t):
+    # Copia del tablero con la simetría t aplicada a todas las piezas
+    result = chess.Board(None)
+    for square, piece in board.piece_map().items():
+        result.set_piece_at(TRANSFORMS[t][square], piece)
+    result.turn = board.turn
+    return result
+
+
+def test_lookup_requires_stored_depth():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    move = chess.Move.from_uci("a2a4")
+    cache.store(board, 3, move, 12.5)
+    assert cache.lookup(board, 3) == (move, 12.5, 3)
+    assert cache.lookup(board, 4) is None
+    # Un resultado menos profundo no sustituye al guardado
+    cache.store(board, 2, chess.Move.from_uci("a1b1"), 1.0)
+    assert cache.lookup(board, 1) == (move, 12.5, 3)
+
+
+def test_symmetric_positions_share_entry():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    move = chess.Move.from_uci("a2a4")
+    cache.store(board, 3, move, 12.5)
+    for t in range(8):
+        assert cache.lookup(_transformed(board, t), 3)[0] == transform_move(move, t)
+
+
+def test_illegal_stored_move_is_a_miss():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    cache.store(board, 3, chess.Move.from_uci("a2h8"), 0.0) # Movimiento imposible (colisión simulada)
+    assert cache.lookup(board, 1) is None
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(search_cache, "EVICTION_INTERVAL", 1)
+    cache = SearchCache(":memory:", max_entries=2)
+    boards = [chess.Board(fen) for fen in ("8/8/8/4k3/8/8/R7/R3K3 w - - 0 1", "8/8/8/3k4/8/8/R7/R3K3 w - - 0 1",
+                                           "8/8/8/2k5/8/8/R7/R3K3 w - - 0 1")]
+    move = chess.Move.from_uci("a2a4")
+    cache.store(boards[0], 1, move, 0.0)
+    cache.store(boards[1], 1, move, 0.0)
+    cache.lookup(boards[0], 1) # La primera pasa a ser la más reciente
+    cache.store(boards[2], 1, move, 0.0)
+    assert len(cache) == 2
+    assert cache.lookup(boards[1], 1) is None
+    assert cache.lookup(boards[0], 1) is not None
+
+
+def test_other_format_version_is_discarded(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SearchCache(path)
+    cache.store(chess.Board(FEN), 3, chess.Move.from_uci("a2a4"), 0.0)
+    cache.close()
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA user_version={FORMAT_VERSION - 1}")
+    connection.close()
+    assert len(SearchCache(path)) == 0
+
+
+def test_find_best_move_reuses_cached_result():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    move = find_best_move(board, 3, use_tablebase=False, cache=cache)
+    context = SearchContext(TranspositionTable(1))
+    assert find_best_move(board, 3, use_tablebase=False, cache=cache, context=context) == move
+    assert context.nodes == 0 # Respondido desde la caché, sin buscar
+    assert find_best_move(board, 4, use_tablebase=False, cache=cache, context=context) is not None
+    assert context.nodes > 0 # Más profundidad de la guardada: hay que buscar
+
+
+def test_expected_depth_is_median_of_recent_searches(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SearchCache(path)
+    assert cache.expected_depth(2.0) is None
+    for depth in (3, 9, 4, 5, 4):
+        cache.record_reached_depth(2.0, depth)
+    assert cache.expected_depth(2.0) == 4
+    assert cache.expected_depth(1.0) is None # Otro tiempo límite
+    for _ in range(search_cache.REACHED_DEPTH_SAMPLES):
+        cache.record_reached_depth(2.0, 7) # Las antiguas dejan de contar
+    cache.close()
+    assert SearchCache(path).expected_depth(2.0) == 7 # Se conserva entre sesiones
+
+
+def test_proven_mate_is_stored_as_solved():
+    cache = SearchCache(":memory:")
+    board = chess.Board("6k1/8/6K1/8/8/8/8/R6R w - - 0 1")
+    move = find_best_move(board, 3, use_tablebase=False, cache=cache)
+    assert cache.lookup(board, MAX_ITERATIVE_DEPTH)[0] == move
+
+
+def test_timed_search_hits_at_usual_depth():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    # Sin ninguna búsqueda medida con este tiempo, se busca (y se anota la profundidad)
+    context = SearchContext(TranspositionTable(1))
+    move = find_best_move(board, 3, time_limit=60, use_tablebase=False, cache=cache, context=context)
+    assert context.nodes > 0 and cache.expected_depth(60) == 3
+    context = SearchContext(TranspositionTable(1))
+    assert find_best_move(board, 3, time_limit=60, use_tablebase=False, cache=cache, context=context) == move
+    assert context.nodes == 0
+
+
+def test_timed_search_ignores_shallow_result():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    cache.store(board, 1, chess.Move.from_uci("a2a4"), 0.0) # Búsqueda interrumpida en la profundidad 1
+    cache.record_reached_depth(60, 3)
+    context = SearchContext(TranspositionTable(1))
+    find_best_move(board, 3, time_limit=60, use_tablebase=False, cache=cache, context=context)
+    assert context.nodes > 0
+
+
+def test_ladder_is_checked_before_cache():
+    cache = SearchCache(":memory:")
+    board = chess.Board(FEN)
+    cache.store(board, MAX_ITERATIVE_DEPTH, chess.Move.from_uci("e1d2"), 0.0)
+    assert find_best_move(board, 3, use_tablebase=False, cache=cache, use_ladder=True) != chess.Move.from_uci("e1d2")
+    assert cache.hits == 0
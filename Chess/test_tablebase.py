@@ -0,0 +1,62 @@
+import math # Importa math para la ventana inicial de la búsqueda
+import random # Importa random para elegir posiciones del corpus
+import chess # Importa la librería python-chess para la lógica del ajedrez
+import pytest # Importa pytest para omitir las pruebas si la tabla no está generada
+from Heuristic import mate_score # Importa la puntuación de mate (contada desde la raíz)
+from Minimax import negamax, SearchContext # Importa la búsqueda con la que se contrasta la tabla
+from Tablebase import get_tablebase, TRANSFORMS # Importa la tabla que se comprueba y las simetrías
+from TranspositionTable import TranspositionTable # Importa la tabla de transposición de la búsqueda
+from Benchmark import krrk_corpus # Importa el corpus reproducible de posiciones KRRK
+
+# La tabla se genera aparte (python Tablebase.py, unos 20 segundos): sin el archivo, se omiten.
+tablebase = get_tablebase()
+pytestmark = pytest.mark.skipif(tablebase is None, reason="KRRK tablebase not generated (run python Tablebase.py)")
+
+
+def _transformed(board, t):
+    # Copia del tablero con la simetría t aplicada a todas las piezas
+    result = chess.Board(None)
+    for square, piece in board.piece_map().items():
+        result.set_piece_at(TRANSFORMS[t][square], piece)
+    result.turn = board.turn
+    return result
+
+
+def test_known_positions():
+    assert tablebase.probe(chess.Board("6k1/8/6K1/8/8/8/8/R6R w - - 0 1")) == 1 # Mate en una
+    assert tablebase.probe(chess.Board("R5k1/8/6K1/8/8/8/8/R7 b - - 0 1")) == 0 # Ya es mate
+    assert tablebase.probe(chess.Board("k7/1R6/2K5/8/8/8/8/8 b - - 0 1")) is None # Ahogado
+    assert tablebase.probe(chess.Board("8/8/8/4k3/8/8/8/4K3 w - - 0 1")) is None # Rey contra Rey
+    with pytest.raises(KeyError):
+        tablebase.probe(chess.Board())
+    assert tablebase.best_move(chess.Board()) is None
+
+
+def test_symmetric_positions_have_same_distance():
+    for fen in krrk_corpus(20, seed=7):
+        board = chess.Board(fen)
+        distance = tablebase.probe(board)
+        for t in range(8):
+            assert tablebase.probe(_transformed(board, t)) == distance
+
+
+def test_distance_matches_search():
+    # Posiciones con mate en pocas medias jugadas: la búsqueda a esa profundidad encuentra el mismo mate
+    rng = random.Random(8)
+    short = [fen for fen in krrk_corpus(400, seed=8) if (tablebase.probe(chess.Board(fen)) or 99) <= 5]
+    assert short
+    for fen in rng.sample(short, min(5, len(short))):
+        board = chess.Board(fen)
+        distance = tablebase.probe(board)
+        score, _ = negamax(board, distance, -math.inf, math.inf, SearchContext(TranspositionTable(4)))
+        assert score == mate_score(distance), fen
+
+
+def test_best_move_follows_distance():
+    board = chess.Board(krrk_corpus(1, seed=9)[0])
+    distance = tablebase.probe(board)
+    while not board.is_game_over():
+        board.push(tablebase.best_move(board))
+        distance -= 1
+        assert tablebase.probe(board) == distance
+    assert board.is_checkmate() and distance == 0
@@ -0,0 +1,82 @@
+import random # Importa random para jugar partidas aleatorias
+import chess # Importa la librería python-chess para la lógica del ajedrez
+from Heuristic import mate_score # Importa la puntuación de mate (contada desde la raíz)
+from KRRKBoard import KRRKBoard # Importa el tablero compacto (mantiene su clave de forma incremental)
+from Tablebase import TRANSFORMS # Importa las 8 simetrías del tablero
+from TranspositionTable import (position_key, next_position_key, canonical_key, transform_move, INVERSE_TRANSFORMS,
+                                TranspositionTable, EXACT) # Importa las claves y la tabla que se comprueban
+
+# Posiciones sin enroques ni captura al paso (la clave incremental cubre todos sus movimientos),
+# con capturas posibles y, en la última, peones.
+FENS = [
+    "8/8/8/4k3/8/8/R7/R3K3 w - - 0 1",
+    "8/8/3k4/8/2R5/8/8/4K2R b - - 0 1",
+    "r3k3/1p3p2/8/3n4/2B5/8/1P3P2/R3K3 w - - 0 1",
+]
+
+
+def _transformed(board, t):
+    # Copia del tablero con la simetría t aplicada a todas las piezas
+    result = chess.Board(None)
+    for square, piece in board.piece_map().items():
+        result.set_piece_at(TRANSFORMS[t][square], piece)
+    result.turn = board.turn
+    return result
+
+
+def test_incremental_key_matches_full_hash():
+    rng = random.Random(1)
+    for fen in FENS:
+        board = chess.Board(fen)
+        key = position_key(board)
+        for _ in range(40):
+            moves = [move for move in board.legal_moves if board.piece_type_at(move.from_square) != chess.PAWN]
+            if not moves:
+                break
+            move = rng.choice(moves)
+            key = next_position_key(board, move, key)
+            board.push(move)
+            assert key == position_key(board), board.fen()
+
+
+def test_incremental_key_skips_castling_and_pawns():
+    board = chess.Board()
+    assert next_position_key(board, chess.Move.from_uci("g1f3"), position_key(board)) is None # Derechos de enroque
+    board = chess.Board(FENS[2])
+    assert next_position_key(board, chess.Move.from_uci("b2b4"), position_key(board)) is None # Peón
+
+
+def test_compact_board_key_matches_polyglot():
+    board = chess.Board(FENS[0])
+    assert position_key(KRRKBoard.from_board(board)) == position_key(board)
+
+
+def test_canonical_key_is_shared_by_symmetric_positions():
+    board = chess.Board(FENS[0])
+    key, transform = canonical_key(board)
+    assert key == position_key(_transformed(board, transform)) # Clave de la variante canónica
+    for t in range(8):
+        assert canonical_key(_transformed(board, t))[0] == key
+
+
+def test_canonical_key_with_pawns_only_uses_file_mirror():
+    board = chess.Board(FENS[2])
+    key = canonical_key(board)[0]
+    assert canonical_key(_transformed(board, 1))[0] == key
+    assert canonical_key(_transformed(board, 2))[0] != key # Reflejo de filas: los peones cambian de sentido
+
+
+def test_transform_move_round_trip():
+    move = chess.Move.from_uci("a2h2")
+    for t in range(8):
+        assert transform_move(transform_move(move, t), INVERSE_TRANSFORMS[t]) == move
+
+
+def test_mate_scores_are_stored_relative_to_the_position():
+    tt = TranspositionTable(1)
+    key = position_key(chess.Board(FENS[0]))
+    # Mate a 5 medias jugadas de la raíz, encontrado a distancia 2: la posición está a 3 del mate.
+    tt.store(key, 4, mate_score(5), -1e9, 1e9, None, ply=2)
+    assert tt.entry(key)[3] == EXACT
+    # La misma posición alcanzada a distancia 4 de otra raíz: el mate queda a 7 medias jugadas.
+    assert tt.lookup(key, 4, -1e9, 1e9, ply=4)[0] == mate_score(7)
@@ -0,0 +1,42 @@
+import io # Importa io para recoger las respuestas del motor
+import pytest # Importa pytest para parametrizar las pruebas
+from UCI import UCIEngine, DEFAULT_HASH_MB # Importa el motor UCI que se comprueba
+from TranspositionTable import TranspositionTable # Importa la tabla para comparar tamaños
+
+
+def _run(*lines):
+    # Envía las órdenes, detiene la búsqueda (si la hay) y devuelve las líneas de respuesta
+    output = io.StringIO()
+    engine = UCIEngine(output)
+    for line in lines:
+        engine.handle(line)
+    engine.stop()
+    return engine, output.getvalue().splitlines()
+
+
+def test_go_depth_returns_bestmove():
+    _, lines = _run("position fen 6k1/8/6K1/8/8/8/8/R6R w - - 0 1", "go depth 3")
+    assert lines[-1] in ("bestmove a1a8", "bestmove h1h8") # Mate en una
+
+
+@pytest.mark.parametrize("go, message", [
+    ("go depth x", "info string invalid value for depth: x"),
+    ("go depth 0", "info string invalid value for depth: 0"),
+    ("go movetime", "info string missing value for movetime"),
+    ("go wtime abc btime 1000", "info string invalid value for wtime: abc"),
+])
+def test_malformed_go_is_reported_and_still_answers(go, message):
+    _, lines = _run("position startpos", go)
+    assert message in lines
+    assert lines[-1].startswith("bestmove ") and lines[-1] != "bestmove 0000"
+
+
+def test_malformed_hash_option_keeps_table():
+    engine, lines = _run("setoption name Hash value abc")
+    assert lines == ["info string invalid value for Hash: abc"]
+    assert engine.tt.size == TranspositionTable(DEFAULT_HASH_MB).size
+
+
+def test_hash_option_resizes_table():
+    engine, _ = _run("setoption name Hash value 1")
+    assert engine.tt.size == TranspositionTable(1).size